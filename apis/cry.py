@@ -1,15 +1,28 @@
 # apis/cry.py
-from fastapi import APIRouter, Depends, Query, UploadFile, File
+from fastapi import APIRouter, Depends, Query, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.status import HTTP_202_ACCEPTED
 from datetime import datetime
+from typing import Optional, Union
 
 from auth.auth_bearer import JWTBearer
 from services.cry import cry_service
+from services.cry_job import cry_job_service
+from services.cry_export import EXPORT_FORMATS, cry_export_service
+from services.cry_job_worker import cry_job_workers
 from schemas.cry import *
-from db import get_db_session
+from db import get_async_db_session, get_db_session
 from error.exceptions import *
 from error.handler import handle_http_exceptions
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# CRY_ARCHIVE_AGE_DAYS로 보관 파일로 옮긴 울음은 id로 다룰 수 없다. (services/cry_archive.py)
+ARCHIVED_CRY_NOTE = ("(archived cries, older than CRY_ARCHIVE_AGE_DAYS when archiving is enabled, are read-only: "
+                     "they are returned only by the list, search, stream and export endpoints and answer 404 here)")
+ARCHIVED_CRY_LIST_NOTE = "Includes archived cries, which are read-only and cannot be fetched, updated or deleted by id"
+
 router = APIRouter(
     prefix="/cry",
     tags=["cry"],
@@ -21,13 +34,28 @@ router = APIRouter(
 @handle_http_exceptions
 async def create_cry_endpoint(
         create_cry_input: CreateCryInput,
-        db: Session = Depends(get_db_session),
+        db: AsyncSession = Depends(get_async_db_session),
         user_id: str = Depends(JWTBearer())) -> CreateCryOutput:
-    cry = await cry_service.create_cry(db, create_cry_input, user_id).to_korean()
+    cry = (await cry_service.create_cry_async(db, create_cry_input, user_id)).to_korean()
     return CreateCryOutput(cry=cry, success=True, message="Cry created successfully")
 
 
-@router.get("/cry/{cry_id}", dependencies=[Depends(JWTBearer())], response_model=GetCryOutput)
+@router.post("/bulk", dependencies=[Depends(JWTBearer())], response_model=CreateCriesOutput)
+@handle_http_exceptions
+async def create_cries_endpoint(
+        create_cries_input: CreateCriesInput,
+        db: AsyncSession = Depends(get_async_db_session),
+        user_id: str = Depends(JWTBearer())) -> CreateCriesOutput:
+    results = await cry_service.create_cries_async(db, create_cries_input.cries, user_id)
+    for result in results:
+        if result.cry:
+            result.cry = result.cry.to_korean()
+    created = sum(result.success for result in results)
+    return CreateCriesOutput(created=created, results=results, success=True,
+                             message=f"{created} of {len(results)} cries created")
+
+
+@router.get("/cry/{cry_id}", description=f"Get a cry by id {ARCHIVED_CRY_NOTE}", dependencies=[Depends(JWTBearer())], response_model=GetCryOutput)
 @handle_http_exceptions
 def get_cry_endpoint(
         cry_id: int,
@@ -37,72 +65,174 @@ def get_cry_endpoint(
     return GetCryOutput(cry=cry, success=True, message="Cry fetched successfully")
 
 
-@router.get("/pet/{pet_id}", dependencies=[Depends(JWTBearer())], response_model=GetPetCriesOutput)
+@router.get("/pet/{pet_id}", description=ARCHIVED_CRY_LIST_NOTE, dependencies=[Depends(JWTBearer())], response_model=GetPetCriesOutput)
 @handle_http_exceptions
 def get_pet_cries_endpoint(
         pet_id: int,
+        stream: bool = Query(
+            False, description="Stream cries as NDJSON (one cry per line)"),
+        limit: Optional[int] = Query(
+            None, ge=1, description="Page size (server default when omitted, capped by the server). Use stream=true to fetch every cry"),
+        cursor: Optional[str] = Query(
+            None, description="next_cursor of the previous page"),
+        order: str = Query(
+            "asc", description="Order by time: asc or desc (latest first)"),
         db: Session = Depends(get_db_session),
         user_id: str = Depends(JWTBearer())) -> GetPetCriesOutput:
-    cries = cry_service.get_all_cries_by_pet(db, pet_id, user_id)
+    if stream:
+        return StreamingResponse(cry_service.stream_cries(
+            cry_service.pet_cries_query(db, pet_id, user_id), cursor, order), media_type=NDJSON_MEDIA_TYPE)
+    cries, next_cursor = cry_service.get_all_cries_by_pet(
+        db, pet_id, user_id, limit, cursor, order)
     for i in range(len(cries)):
         cries[i] = cries[i].to_korean()
-    return GetPetCriesOutput(cries=cries, success=True, message="Cries fetched successfully")
+    return GetPetCriesOutput(cries=cries, next_cursor=next_cursor, success=True, message="Cries fetched successfully")
 
 
-@router.get("/search/state", dependencies=[Depends(JWTBearer())], response_model=GetCriesWithStateOutput)
+@router.get("/search/state", description=ARCHIVED_CRY_LIST_NOTE, dependencies=[Depends(JWTBearer())], response_model=GetCriesWithStateOutput)
 @handle_http_exceptions
 def get_pets_with_state_endpoint(
         pet_id: int = Query(..., description="ID of the pet"),
         query_state: str = Query(..., description="State to filter cries"),
+        stream: bool = Query(
+            False, description="Stream cries as NDJSON (one cry per line)"),
+        limit: Optional[int] = Query(
+            None, ge=1, description="Page size (server default when omitted, capped by the server). Use stream=true to fetch every cry"),
+        cursor: Optional[str] = Query(
+            None, description="next_cursor of the previous page"),
+        order: str = Query(
+            "asc", description="Order by time: asc or desc (latest first)"),
         db: Session = Depends(get_db_session),
         user_id: str = Depends(JWTBearer())) -> GetCriesWithStateOutput:
-    cries = cry_service.get_pets_with_state(
-        db, pet_id, query_state, user_id)
+    if stream:
+        return StreamingResponse(cry_service.stream_cries(
+            cry_service.pets_with_state_query(db, pet_id, query_state, user_id), cursor, order),
+            media_type=NDJSON_MEDIA_TYPE)
+    cries, next_cursor = cry_service.get_pets_with_state(
+        db, pet_id, query_state, user_id, limit, cursor, order)
     for i in range(len(cries)):
         cries[i] = cries[i].to_korean()
-    return GetCriesWithStateOutput(cries=cries, success=True, message="Cries fetched successfully")
+    return GetCriesWithStateOutput(cries=cries, next_cursor=next_cursor, success=True, message="Cries fetched successfully")
 
 
-@router.get("/search/time", dependencies=[Depends(JWTBearer())], response_model=GetCriesBetweenTimeOutput)
+@router.get("/search/time", description=ARCHIVED_CRY_LIST_NOTE, dependencies=[Depends(JWTBearer())], response_model=GetCriesBetweenTimeOutput)
 @handle_http_exceptions
 def get_pets_between_time_endpoint(
         pet_id: int = Query(..., description="ID of the pet"),
         start_time: datetime = Query(...,
                                      description="Start time in ISO format"),
         end_time: datetime = Query(..., description="End time in ISO format"),
+        stream: bool = Query(
+            False, description="Stream cries as NDJSON (one cry per line)"),
+        limit: Optional[int] = Query(
+            None, ge=1, description="Page size (server default when omitted, capped by the server). Use stream=true to fetch every cry"),
+        cursor: Optional[str] = Query(
+            None, description="next_cursor of the previous page"),
+        order: str = Query(
+            "asc", description="Order by time: asc or desc (latest first)"),
         db: Session = Depends(get_db_session),
         user_id: str = Depends(JWTBearer())) -> GetCriesBetweenTimeOutput:
-    cries = cry_service.get_pets_between_time(
-        db, pet_id, start_time, end_time, user_id)
+    if stream:
+        return StreamingResponse(cry_service.stream_cries(
+            cry_service.pets_between_time_query(db, pet_id, start_time, end_time, user_id), cursor, order),
+            media_type=NDJSON_MEDIA_TYPE)
+    cries, next_cursor = cry_service.get_pets_between_time(
+        db, pet_id, start_time, end_time, user_id, limit, cursor, order)
     for i in range(len(cries)):
         cries[i] = cries[i].to_korean()
-    return GetCriesBetweenTimeOutput(cries=cries, success=True, message="Cries fetched successfully")
+    return GetCriesBetweenTimeOutput(cries=cries, next_cursor=next_cursor, success=True, message="Cries fetched successfully")
 
 
 @router.get("/inspect", dependencies=[Depends(JWTBearer())])
 @handle_http_exceptions
 def inspect_cry_endpoint(
         pet_id: int = Query(..., description="ID of the pet"),
+        window: str = Query(
+            "30d", description="Analysis window: 24h, 7d, 30d, 90d, 365d or custom"),
+        start_time: Optional[datetime] = Query(
+            None, description="Start time of a custom window in ISO format"),
+        end_time: Optional[datetime] = Query(
+            None, description="End time of a custom window in ISO format (default: now)"),
+        resolution: Optional[str] = Query(
+            None, description="Bucket size of cry_freq_date: hour, day or week (default: by window length)"),
         db: Session = Depends(get_db_session),
         user_id: str = Depends(JWTBearer())):
-    inspect_result = cry_service.inspect_cry(db, pet_id, user_id)
+    inspect_result = cry_service.inspect_cry(
+        db, pet_id, user_id, window, start_time, end_time, resolution)
     return {"success": True, "message": "Cry inspected successfully", "result": inspect_result}
 
 
+@router.get("/inspect/all", dependencies=[Depends(JWTBearer())])
+@handle_http_exceptions
+def inspect_all_cries_endpoint(
+        window: str = Query(
+            "30d", description="Analysis window: 24h, 7d, 30d, 90d, 365d or custom"),
+        start_time: Optional[datetime] = Query(
+            None, description="Start time of a custom window in ISO format"),
+        end_time: Optional[datetime] = Query(
+            None, description="End time of a custom window in ISO format (default: now)"),
+        resolution: Optional[str] = Query(
+            None, description="Bucket size of cry_freq_date: hour, day or week (default: by window length)"),
+        db: Session = Depends(get_db_session),
+        user_id: str = Depends(JWTBearer())):
+    inspect_results = cry_service.inspect_all_cries(
+        db, user_id, window, start_time, end_time, resolution)
+    return {"success": True, "message": "Cries of all pets inspected successfully", "result": inspect_results}
+
+
+@router.get("/export", dependencies=[Depends(JWTBearer())])
+@handle_http_exceptions
+def export_cries_endpoint(
+        export_format: str = Query(
+            "parquet", alias="format", description="Export format: parquet or arrow (IPC stream)"),
+        pet_id: Optional[int] = Query(
+            None, description="ID of the pet (default: all pets of the user)"),
+        start_time: Optional[datetime] = Query(
+            None, description="Start time in ISO format"),
+        end_time: Optional[datetime] = Query(
+            None, description="End time in ISO format"),
+        db: Session = Depends(get_db_session),
+        user_id: str = Depends(JWTBearer())):
+    pet_ids = cry_export_service.get_export_pet_ids(db, user_id, pet_id)
+    chunks = cry_export_service.stream(
+        pet_ids, export_format, start_time, end_time)
+    media_type, extension = EXPORT_FORMATS[export_format]
+    return StreamingResponse(chunks, media_type=media_type, headers={
+        "Content-Disposition": f'attachment; filename="cries.{extension}"'})
+
+
 @router.post("/predict", dependencies=[Depends(JWTBearer())])
 @handle_http_exceptions
 async def predict_cry_endpoint(
+        response: Response,
         file: UploadFile = File(...),
         pet_id: int = Query(..., description="ID of the pet"),
-        db: Session = Depends(get_db_session),
-        user_id: str = Depends(JWTBearer())) -> PredictCryOutput:
+        async_job: bool = Query(
+            False, description="Return 202 with a job id and predict in the background"),
+        db: AsyncSession = Depends(get_async_db_session),
+        user_id: str = Depends(JWTBearer())) -> Union[PredictCryOutput, PredictCryJobOutput]:
     if file == None or not file.filename.endswith(".wav"):
         raise WavFileNotFoundError("Wav file not found")
+    if async_job:
+        job = await cry_service.enqueue_prediction(db, file, pet_id, user_id)
+        cry_job_workers.notify()
+        response.status_code = HTTP_202_ACCEPTED
+        return PredictCryJobOutput(job=job, success=True, message="Cry prediction job accepted")
     cry = await cry_service.predict_cry(db, file, pet_id, user_id)
     return PredictCryOutput(cry=cry, success=True, message="Cry predicted successfully")
 
 
-@router.put("/{cry_id}", dependencies=[Depends(JWTBearer())], response_model=UpdateCryOutput)
+@router.get("/predict/jobs/{job_id}", dependencies=[Depends(JWTBearer())], response_model=GetCryJobOutput)
+@handle_http_exceptions
+def get_predict_job_endpoint(
+        job_id: str,
+        db: Session = Depends(get_db_session),
+        user_id: str = Depends(JWTBearer())) -> GetCryJobOutput:
+    job = cry_job_service.get_job(db, job_id, user_id)
+    return GetCryJobOutput(job=job, success=True, message="Cry prediction job fetched successfully")
+
+
+@router.put("/{cry_id}", description=f"Update a cry by id {ARCHIVED_CRY_NOTE}", dependencies=[Depends(JWTBearer())], response_model=UpdateCryOutput)
 @handle_http_exceptions
 def update_cry_endpoint(
         cry_id: int,
@@ -114,7 +244,7 @@ def update_cry_endpoint(
     return UpdateCryOutput(cry=cry, success=True, message="Cry updated successfully")
 
 
-@router.delete("/{cry_id}", dependencies=[Depends(JWTBearer())], response_model=DeleteCryOutput)
+@router.delete("/{cry_id}", description=f"Delete a cry by id {ARCHIVED_CRY_NOTE}", dependencies=[Depends(JWTBearer())], response_model=DeleteCryOutput)
 @handle_http_exceptions
 def delete_cry_endpoint(
         cry_id: int,
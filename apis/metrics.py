@@ -0,0 +1,44 @@
+# apis/metrics.py
+from fastapi import APIRouter, Depends, Query
+
+from auth.auth_bearer import JWTBearer
+from services.cry_predict import cry_predict
+from services.cry_batcher import cry_predict_batcher
+from services.cry_predict_cache import cry_predict_cache
+from services.cry_inspect_cache import cry_inspect_cache
+from services.cry_inspect_precompute import cry_inspect_precomputer
+from services.sql_metrics import sql_metrics
+from services.cry_archive import cry_archive_service
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.get("/predict", dependencies=[Depends(JWTBearer())])
+def get_predict_metrics_endpoint():
+    return {"success": True, "message": "Predict metrics fetched successfully",
+            "result": {"routing": cry_predict.stats(),
+                       "batcher": cry_predict_batcher.stats(),
+                       "cache": cry_predict_cache.stats()}}
+
+
+@router.get("/inspect", dependencies=[Depends(JWTBearer())])
+def get_inspect_metrics_endpoint():
+    return {"success": True, "message": "Inspect metrics fetched successfully",
+            "result": {"cache": cry_inspect_cache.stats(),
+                       "precompute": cry_inspect_precomputer.stats()}}
+
+
+@router.get("/archive", dependencies=[Depends(JWTBearer())])
+def get_archive_metrics_endpoint():
+    return {"success": True, "message": "Archive metrics fetched successfully",
+            "result": cry_archive_service.stats()}
+
+
+@router.get("/sql", dependencies=[Depends(JWTBearer())])
+def get_sql_metrics_endpoint(limit: int = Query(20, ge=1, le=200)):
+    return {"success": True, "message": "SQL metrics fetched successfully",
+            "result": sql_metrics.stats(limit)}
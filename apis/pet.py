@@ -1,5 +1,6 @@
 # apis/pet.py
 from fastapi import APIRouter, Depends, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi.responses import FileResponse
 import os
@@ -7,7 +8,7 @@ import os
 from auth.auth_bearer import JWTBearer
 from services.pet import pet_service
 from schemas.pet import *
-from db import get_db_session
+from db import get_async_db_session, get_db_session
 from error.exceptions import *
 from error.handler import handle_http_exceptions
 from constants.path import PET_PROFILE_DIR, ASSET_DIR
@@ -68,9 +69,9 @@ async def read_file(file_id: str):
 async def upload_profile_image(
         pet_id: int,
         file: UploadFile = File(...),
-        db: Session = Depends(get_db_session),
+        db: AsyncSession = Depends(get_async_db_session),
         user_id: str = Depends(JWTBearer())) -> BaseOutput:
-    success = pet_service.uploadProfileImage(file, db, pet_id, user_id)
+    success = await pet_service.upload_profile_image_async(file, db, pet_id, user_id)
     return BaseOutput(success=success, message="Profile image uploaded successfully" if success else "Profile image upload failed")
 
 
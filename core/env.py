@@ -9,8 +9,8 @@ class Env:
     def __init__(self):
         load_dotenv(os.path.join(PROJECT_DIR, ".env"))
 
-    def get(self, key: str) -> Optional[str]:
-        return os.environ.get(key)
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return os.environ.get(key, default)
 
 
 env = Env()
@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+
+from core.env import env
+from db import init_db
+from services.cry_predict import cry_predict
+from services.cry_batcher import cry_predict_batcher
+from services.cry_job_worker import CryJobWorkerPool
+
+
+async def run(workers: int):
+    init_db()
+    pool = CryJobWorkerPool(workers)
+    await cry_predict.startup()
+    await pool.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await pool.stop()
+        await cry_predict_batcher.shutdown()
+        await cry_predict.shutdown()
+
+
+if __name__ == "__main__":
+    # 웹 서버와 별도로 울음 분석 작업만 처리하는 워커 프로세스
+    # 이 경우 웹 서버는 CRY_JOB_WORKERS=0 으로 실행한다.
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int,
+                        default=int(env.get("CRY_JOB_WORKERS", 4)))
+    args = parser.parse_args()
+    asyncio.run(run(args.workers))
+# python cry_worker.py --workers 4
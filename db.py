@@ -1,37 +1,67 @@
 # db/__init__.py
 import os
+import functools
 from log import logger
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-# from core.env import env
+from core.env import env
 from constants.path import PROJECT_DIR
 from db_base import DB_Base
+from db_migration import migrate
 from model import *
+from services.sql_metrics import sql_metrics
 
 
-# 2. 데이터베이스 URL 설정 using absolute path
-DB_PATH = os.path.join(PROJECT_DIR, "Database.db")
+# 2. 데이터베이스 URL 설정 using absolute path (테스트 등에서는 DB_PATH로 다른 파일을 쓴다)
+DB_PATH = env.get("DB_PATH", os.path.join(PROJECT_DIR, "Database.db"))
 DB_URL = f'sqlite:///{DB_PATH}'
+ASYNC_DB_URL = f'sqlite+aiosqlite:///{DB_PATH}'
 
 engine = create_engine(DB_URL, connect_args={
                        "check_same_thread": False}, echo=False)
+# async 엔드포인트와 워커에서 이벤트 루프를 막지 않고 DB I/O를 기다리기 위한 엔진 (aiosqlite)
+async_engine = create_async_engine(ASYNC_DB_URL, echo=False)
 
 
 @event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
     cursor.close()
 
 
-# 4. 테이블 생성
-try:
-    DB_Base.metadata.create_all(engine)
-    logger.info("테이블 생성 성공")
-    logger.info(f"Database path: {DB_PATH}")
-except Exception as e:
-    logger.error(f"테이블 생성 실패: {e}")
+_instrumented = False
+
+
+def init_db() -> None:
+    """
+    SQL 기록을 켜고 테이블 생성과 migration을 적용한다. 웹 서버와 워커가 시작할 때 호출한다.
+    import만으로 DB 파일이 바뀌지 않도록 모듈을 불러올 때는 실행하지 않는다. (여러 번 호출해도 된다)
+    """
+    global _instrumented
+    # 요청별/route별 SQL 개수와 실행 시간 기록 (/metrics/sql)
+    if not _instrumented:
+        sql_metrics.instrument(engine)
+        sql_metrics.instrument(async_engine.sync_engine)
+        _instrumented = True
+
+    # 4. 테이블 생성
+    try:
+        DB_Base.metadata.create_all(engine)
+        logger.info("테이블 생성 성공")
+        logger.info(f"Database path: {DB_PATH}")
+    except Exception as e:
+        logger.error(f"테이블 생성 실패: {e}")
+
+    # 트리거 등 create_all 이후의 스키마 변경 적용
+    try:
+        migrate(engine)
+    except Exception as e:
+        logger.error(f"마이그레이션 실패: {e}")
+
 
 # 5. 세션 생성기 설정
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -49,3 +79,29 @@ def get_db_session():
         yield db
     finally:
         db.close()
+
+
+# 7. async 세션 생성기와 의존성
+# commit 후에도 응답을 만들 때 객체 속성을 다시 읽지 않도록 만료시키지 않는다.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db_session():
+    """
+    Dependency
+    async 엔드포인트용 세션. 요청이 끝나면 async with 블록이 세션을 닫는다.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def async_variant(method):
+    """
+    동기 Session을 받는 서비스 메서드를 AsyncSession을 받는 코루틴 메서드로 감싼다.
+    쿼리 로직은 그대로 AsyncSession.run_sync 안에서 실행되고, DB I/O만 aiosqlite로 기다린다.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(lambda session: method(self, session, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,205 @@
+# db_migration.py
+"""
+create_all로 만들 수 없는 스키마 변경(트리거, 기존 데이터 백필 등)을 적용한다.
+적용한 마지막 migration 번호를 PRAGMA user_version에 기록하므로 각 migration은 한 번만 실행된다.
+새 migration은 MIGRATIONS 끝에 추가한다. (순서를 바꾸거나 중간에 끼워 넣지 않는다)
+"""
+from sqlalchemy.engine import Connection, Engine
+
+from model.cry import CryTable, PREDICT_COLUMNS
+from model.pet import PetTable
+from log import logger
+
+
+# ---------------------------------------------------------------------------
+# cry 트리거 (롤업, 버전)
+# ---------------------------------------------------------------------------
+
+def _day_of(time: str) -> str:
+    return f"date({time})"
+
+
+def _week_of(time: str) -> str:
+    # 월요일 날짜 (weekday 0: 다음 일요일, 당일이 일요일이면 그대로)
+    return f"date({time}, 'weekday 0', '-6 days')"
+
+
+def _hour_of(time: str) -> str:
+    return f"CAST(strftime('%H', {time}) AS INTEGER)"
+
+
+def _rollup_add(table: str, period: str, period_of):
+    def add(row: str) -> str:
+        return f"""
+    INSERT INTO {table} (pet_id, {period}, hour, state, count, duration_sum, duration_count)
+    VALUES ({row}.pet_id, {period_of(f'{row}.time')}, {_hour_of(f'{row}.time')}, {row}.state,
+            1, COALESCE({row}.duration, 0), {row}.duration IS NOT NULL)
+    ON CONFLICT (pet_id, {period}, hour, state) DO UPDATE SET
+        count = count + excluded.count,
+        duration_sum = duration_sum + excluded.duration_sum,
+        duration_count = duration_count + excluded.duration_count;
+    """
+    return add
+
+
+def _rollup_remove(table: str, period: str, period_of):
+    def remove(row: str) -> str:
+        where = f"""pet_id = {row}.pet_id AND {period} = {period_of(f'{row}.time')}
+        AND hour = {_hour_of(f'{row}.time')} AND state = {row}.state"""
+        return f"""
+    UPDATE {table} SET
+        count = count - 1,
+        duration_sum = duration_sum - COALESCE({row}.duration, 0),
+        duration_count = duration_count - ({row}.duration IS NOT NULL)
+    WHERE {where};
+    DELETE FROM {table} WHERE {where} AND count <= 0;
+    """
+    return remove
+
+
+def _create_cry_triggers(connection: Connection, prefix: str, add, remove) -> None:
+    """cry insert/update/delete 때 remove(OLD), add(NEW) 순으로 실행되는 트리거 3개를 만든다."""
+    connection.exec_driver_sql(f"""
+    CREATE TRIGGER IF NOT EXISTS {prefix}_insert AFTER INSERT ON cry
+    BEGIN {add('NEW')} END
+    """)
+    connection.exec_driver_sql(f"""
+    CREATE TRIGGER IF NOT EXISTS {prefix}_update AFTER UPDATE OF pet_id, time, state, duration ON cry
+    BEGIN {remove('OLD')} {add('NEW')} END
+    """)
+    connection.exec_driver_sql(f"""
+    CREATE TRIGGER IF NOT EXISTS {prefix}_delete AFTER DELETE ON cry
+    BEGIN {remove('OLD')} END
+    """)
+
+
+def _add_cry_rollup(connection: Connection, table: str, period: str, period_of) -> None:
+    """롤업 테이블을 cry 테이블로부터 다시 채우고 갱신 트리거를 만든다."""
+    connection.exec_driver_sql(f"DELETE FROM {table}")
+    connection.exec_driver_sql(f"""
+    INSERT INTO {table} (pet_id, {period}, hour, state, count, duration_sum, duration_count)
+    SELECT pet_id, {period_of('time')}, {_hour_of('time')}, state,
+           COUNT(*), COALESCE(SUM(duration), 0), COUNT(duration)
+    FROM cry
+    GROUP BY 1, 2, 3, 4
+    """)
+    _create_cry_triggers(connection, table,
+                         _rollup_add(table, period, period_of),
+                         _rollup_remove(table, period, period_of))
+
+
+def _add_cry_rollup_hourly(connection: Connection) -> None:
+    _add_cry_rollup(connection, 'cry_rollup_hourly', 'day', _day_of)
+
+
+def _cry_version_bump(row: str) -> str:
+    return f"""
+    INSERT INTO cry_version (pet_id, version) VALUES ({row}.pet_id, 1)
+    ON CONFLICT (pet_id) DO UPDATE SET version = version + 1;
+    """
+
+
+def _add_cry_version(connection: Connection) -> None:
+    _create_cry_triggers(
+        connection, 'cry_version', _cry_version_bump, _cry_version_bump)
+
+
+def _add_cry_rollup_weekly(connection: Connection) -> None:
+    _add_cry_rollup(connection, 'cry_rollup_weekly', 'week', _week_of)
+
+
+def _split_cry_predict_map(connection: Connection) -> None:
+    """
+    cry.predictMap(JSON)을 울음 원인별 p_<state> 컬럼으로 옮기고 JSON 컬럼을 삭제한다.
+    컬럼으로 옮기지 못하는 값이 있는 행은 삭제 전에 cry_predict_map_backup 테이블에 원본 JSON을 남긴다.
+    """
+    columns = {row[1] for row in connection.exec_driver_sql("PRAGMA table_info(cry)")}
+    for column in PREDICT_COLUMNS.values():
+        if column not in columns:
+            connection.exec_driver_sql(f"ALTER TABLE cry ADD COLUMN {column} FLOAT")
+
+    # create_all로 새로 만든 DB에는 predictMap 컬럼이 없다.
+    if 'predictMap' not in columns:
+        return
+    assignments = ', '.join(f"{column} = json_extract(predictMap, '$.{state}')"
+                            for state, column in PREDICT_COLUMNS.items())
+    connection.exec_driver_sql(f"UPDATE cry SET {assignments}")
+
+    # 컬럼으로 옮길 수 없는 값(알 수 없는 울음 원인, 숫자가 아닌 확률)이 있는 행은 JSON을 그대로 백업해 둔다.
+    states = ', '.join(f"'{state}'" for state in PREDICT_COLUMNS)
+    connection.exec_driver_sql("""
+    CREATE TABLE IF NOT EXISTS cry_predict_map_backup (
+        cry_id INTEGER PRIMARY KEY,
+        predictMap TEXT NOT NULL
+    )""")
+    backed_up = connection.exec_driver_sql(f"""
+    INSERT OR REPLACE INTO cry_predict_map_backup (cry_id, predictMap)
+    SELECT id, predictMap FROM cry
+    WHERE json_type(predictMap) IS NOT 'object' OR EXISTS (
+        SELECT 1 FROM json_each(cry.predictMap)
+        WHERE key NOT IN ({states}) OR type NOT IN ('integer', 'real', 'null'))
+    """).rowcount
+    if backed_up:
+        logger.warning(
+            f"{backed_up} cries have predictMap values without a p_<state> column; "
+            "their JSON is kept in cry_predict_map_backup")
+    connection.exec_driver_sql("ALTER TABLE cry DROP COLUMN predictMap")
+
+
+def _normalize_cry_time(connection: Connection) -> None:
+    """
+    SQL로 직접 넣은 'YYYY-MM-DD HH:MM:SS' 형식의 time을 SQLAlchemy가 쓰는 마이크로초 형식으로 맞춘다.
+    time은 문자열로 비교되므로 형식이 섞여 있으면 같은 시각의 (time, id) 비교가 어긋난다.
+    """
+    connection.exec_driver_sql(
+        "UPDATE cry SET time = time || '.000000' WHERE length(time) = 19")
+
+
+def _add_query_indexes(connection: Connection) -> None:
+    """create_all은 이미 있는 테이블에 인덱스를 추가하지 않으므로 모델에 선언된 인덱스를 만든다."""
+    for table in (CryTable.__table__, PetTable.__table__):
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def _guard_cry_delete_triggers(connection: Connection) -> None:
+    """
+    보관 작업(services/cry_archive.py)이 cry에서 지운 울음은 롤업과 버전에 그대로 남겨 둔다.
+    보관 중인 반려동물/월(cry_archive.archiving)의 행을 지울 때는 삭제 트리거를 실행하지 않는다.
+    """
+    guard = """NOT EXISTS (
+        SELECT 1 FROM cry_archive
+        WHERE pet_id = OLD.pet_id AND month = strftime('%Y-%m', OLD.time) AND archiving)"""
+    for prefix, remove in (
+            ('cry_rollup_hourly', _rollup_remove('cry_rollup_hourly', 'day', _day_of)),
+            ('cry_rollup_weekly', _rollup_remove('cry_rollup_weekly', 'week', _week_of)),
+            ('cry_version', _cry_version_bump)):
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {prefix}_delete")
+        connection.exec_driver_sql(f"""
+    CREATE TRIGGER {prefix}_delete AFTER DELETE ON cry
+    WHEN {guard}
+    BEGIN {remove('OLD')} END
+    """)
+
+
+MIGRATIONS = [
+    _add_cry_rollup_hourly,
+    _add_cry_version,
+    _add_cry_rollup_weekly,
+    _split_cry_predict_map,
+    _normalize_cry_time,
+    _add_query_indexes,
+    _guard_cry_delete_triggers,
+]
+
+
+def migrate(engine: Engine) -> None:
+    with engine.connect() as connection:
+        # 여러 프로세스(웹 서버, 워커)가 동시에 시작해도 한 곳에서만 적용되도록 쓰기 잠금을 먼저 잡는다.
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+        version = connection.exec_driver_sql("PRAGMA user_version").scalar()
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            migration(connection)
+            connection.exec_driver_sql(f"PRAGMA user_version = {number}")
+            logger.info(f"Applied migration {number}: {migration.__name__}")
+        connection.commit()
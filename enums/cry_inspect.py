@@ -0,0 +1,30 @@
+# enums/cry_inspect.py
+from datetime import timedelta
+from enum import Enum
+
+
+class CryInspectWindowEnum(str, Enum):
+    DAY = '24h'
+    WEEK = '7d'
+    MONTH = '30d'
+    QUARTER = '90d'
+    YEAR = '365d'
+    CUSTOM = 'custom'
+
+
+class CryInspectResolutionEnum(str, Enum):
+    HOUR = 'hour'
+    DAY = 'day'
+    WEEK = 'week'
+
+
+CRY_INSPECT_WINDOW_DELTAS = {
+    '24h': timedelta(hours=24),
+    '7d': timedelta(days=7),
+    '30d': timedelta(days=30),
+    '90d': timedelta(days=90),
+    '365d': timedelta(days=365),
+}
+
+allowed_cry_inspect_window = tuple(e.value for e in CryInspectWindowEnum)
+allowed_cry_inspect_resolution = tuple(e.value for e in CryInspectResolutionEnum)
@@ -0,0 +1,12 @@
+# enums/cry_job_status.py
+from enum import Enum
+
+
+class CryJobStatusEnum(str, Enum):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+
+allowed_cry_job_status = tuple(e.value for e in CryJobStatusEnum)
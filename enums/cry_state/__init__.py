@@ -11,6 +11,10 @@ allowed_cry_state_en = tuple(
 allowed_cry_state_kr = tuple(
     set(allowed_dog_cry_state_kr + allowed_cat_cry_state_kr))
 
+# 강아지, 고양이 순으로 중복 없이 나열한 울음 원인 (컬럼 순서처럼 순서가 고정되어야 할 때 사용)
+ordered_cry_state_en = tuple(
+    dict.fromkeys(allowed_dog_cry_state_en + allowed_cat_cry_state_en))
+
 
 def check_right_cry_state(species: str, state: str) -> Optional[str]:
     if species == 'dog' and state not in allowed_dog_cry_state_en:
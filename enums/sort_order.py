@@ -0,0 +1,10 @@
+# enums/sort_order.py
+from enum import Enum
+
+
+class SortOrderEnum(str, Enum):
+    ASC = 'asc'
+    DESC = 'desc'
+
+
+allowed_sort_order = tuple(e.value for e in SortOrderEnum)
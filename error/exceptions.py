@@ -14,6 +14,21 @@ class InvalidSpeciesError(ValidationError):
     pass
 
 
+class InvalidWavFileError(ValidationError):
+    """Raised when an uploaded wav file cannot be parsed."""
+    pass
+
+
+class InvalidInspectWindowError(ValidationError):
+    """Raised when the inspect window or resolution is invalid."""
+    pass
+
+
+class InvalidCursorError(ValidationError):
+    """Raised when a pagination cursor or order is invalid."""
+    pass
+
+
 class PetNotFoundError(Exception):
     """Raised when a pet is not found."""
     pass
@@ -39,6 +54,11 @@ class CryNotFoundError(Exception):
     pass
 
 
+class CryJobNotFoundError(Exception):
+    """Raised when a cry prediction job is not found."""
+    pass
+
+
 class UserNotFoundError(Exception):
     """Raised when a user is not found."""
     pass
@@ -57,3 +77,8 @@ class DuplicateEmailError(Exception):
 class DuplicateUidError(Exception):
     """Raised when attempting to create a user with an uid that already exists."""
     pass
+
+
+class AiServerError(Exception):
+    """Raised when the AI prediction server fails to respond properly."""
+    pass
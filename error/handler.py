@@ -7,7 +7,8 @@ from starlette.status import (
     HTTP_400_BAD_REQUEST,
     HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
-    HTTP_500_INTERNAL_SERVER_ERROR
+    HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_502_BAD_GATEWAY
 )
 
 from error.exceptions import *
@@ -34,10 +35,14 @@ def handle_http_exceptions(func: Callable) -> Callable:
         except (UnauthorizedError, WrongFileTypeError) as ue:
             logger.error(f"403 Forbidden: {str(ue)}", exc_info=True)
             raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail=str(ue))
-        except (PetNotFoundError, CryNotFoundError, UserNotFoundError) as pnfe:
+        except (PetNotFoundError, CryNotFoundError, CryJobNotFoundError, UserNotFoundError) as pnfe:
             logger.error(f"404 Not Found: {str(pnfe)}", exc_info=True)
             raise HTTPException(
                 status_code=HTTP_404_NOT_FOUND, detail=str(pnfe))
+        except AiServerError as ae:
+            logger.error(f"502 Bad Gateway: {str(ae)}", exc_info=True)
+            raise HTTPException(
+                status_code=HTTP_502_BAD_GATEWAY, detail=str(ae))
         except Exception as e:
             logger.error(f"500 Internal Server Error: {e}", exc_info=True)
             raise HTTPException(
@@ -61,10 +66,14 @@ def handle_http_exceptions(func: Callable) -> Callable:
         except (UnauthorizedError, WrongFileTypeError) as ue:
             logger.error(f"403 Forbidden: {str(ue)}", exc_info=True)
             raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail=str(ue))
-        except (PetNotFoundError, CryNotFoundError, UserNotFoundError) as pnfe:
+        except (PetNotFoundError, CryNotFoundError, CryJobNotFoundError, UserNotFoundError) as pnfe:
             logger.error(f"404 Not Found: {str(pnfe)}", exc_info=True)
             raise HTTPException(
                 status_code=HTTP_404_NOT_FOUND, detail=str(pnfe))
+        except AiServerError as ae:
+            logger.error(f"502 Bad Gateway: {str(ae)}", exc_info=True)
+            raise HTTPException(
+                status_code=HTTP_502_BAD_GATEWAY, detail=str(ae))
         except Exception as e:
             logger.error(f"500 Internal Server Error: {e}", exc_info=True)
             raise HTTPException(
@@ -1,17 +1,51 @@
+import asyncio
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from apis import router as main_router
 from apis.user import router as user_router
 from apis.cry import router as cry_router
 from apis.pet import router as pet_router
+from apis.metrics import router as metrics_router
+from services.cry_predict import cry_predict
+from services.cry_batcher import cry_predict_batcher
+from services.cry_predict_cache import cry_predict_cache
+from services.cry_inspect_cache import cry_inspect_cache
+from services.cry_inspect_precompute import cry_inspect_precomputer
+from services.cry_job_worker import cry_job_workers
+from services.cry_archive import cry_archive_service
+from services.sql_metrics import SqlMetricsMiddleware
+from db import init_db
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 테이블 생성과 migration은 import가 아니라 앱이 시작할 때 적용한다.
+    await asyncio.to_thread(init_db)
+    # AI 서버 커넥션 풀은 앱 수명과 함께 관리한다.
+    await cry_predict.startup()
+    await asyncio.to_thread(cry_predict_cache.evict_expired)
+    await asyncio.to_thread(cry_inspect_cache.evict)
+    await cry_job_workers.start()
+    await cry_inspect_precomputer.start()
+    await cry_archive_service.start()
+    yield
+    await cry_archive_service.stop()
+    await cry_inspect_precomputer.stop()
+    await cry_job_workers.stop()
+    await cry_predict_batcher.shutdown()
+    await cry_predict.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(SqlMetricsMiddleware)
 
 app.include_router(main_router)
 app.include_router(user_router)
 app.include_router(cry_router)
 app.include_router(pet_router)
+app.include_router(metrics_router)
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=7701)
@@ -2,5 +2,13 @@
 from .user import UserTable
 from .pet import PetTable
 from .cry import CryTable
+from .cry_job import CryJobTable
+from .cry_audio import CryAudioTable
+from .cry_rollup import CryRollupHourlyTable, CryRollupWeeklyTable
+from .cry_version import CryVersionTable
+from .cry_archive import CryArchiveTable
+from .scheduler_run import SchedulerRunTable
 
-__all__ = ["UserTable", "PetTable", "CryTable"]
+__all__ = ["UserTable", "PetTable", "CryTable", "CryJobTable", "CryAudioTable",
+           "CryRollupHourlyTable", "CryRollupWeeklyTable", "CryVersionTable", "CryArchiveTable",
+           "SchedulerRunTable"]
@@ -1,14 +1,14 @@
 # model/cry.py
 from __future__ import annotations
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, JSON, Float
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Float, Index
 from sqlalchemy.orm import relationship, declarative_base
 from pydantic import BaseModel
 import uuid
 
 from db_base import DB_Base
-from enums.cry_state import CRY_STATE_KR_TO_EN
+from enums.cry_state import CRY_STATE_KR_TO_EN, ordered_cry_state_en
 from enums.cry_intensity import CRY_INTENSITY_KR_TO_EN
 
 
@@ -19,13 +19,26 @@ class CryTable(DB_Base):
     time = Column(DateTime, nullable=False)
     state = Column(String, nullable=False)
     audioId = Column(String, nullable=False)
-    predictMap = Column(JSON, nullable=False)
     intensity = Column(String, default='medium')
     duration = Column(Float, default=2.0)
 
+    # 울음 원인별 예측 확률. 예측 결과에 없는 원인은 NULL (PREDICT_COLUMNS 참고)
+    p_anger = Column(Float, nullable=True)
+    p_play = Column(Float, nullable=True)
+    p_happy = Column(Float, nullable=True)
+    p_sad = Column(Float, nullable=True)
+    p_hunger = Column(Float, nullable=True)
+    p_lonely = Column(Float, nullable=True)
+
     # Relationship to PetTable
     pet = relationship("PetTable", back_populates="cries")
 
+    # 반려동물별 울음 목록/기간 조회와 (time, id) 정렬, 원인별 조회에 사용 (id는 rowid라 인덱스에 포함된다)
+    __table_args__ = (
+        Index('ix_cry_pet_id_time', 'pet_id', 'time'),
+        Index('ix_cry_pet_id_state_time', 'pet_id', 'state', 'time'),
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -44,6 +57,35 @@ class CryTable(DB_Base):
             "duration": self.duration
         }
 
+    @property
+    def predictMap(self) -> Dict[str, float]:
+        return {state: getattr(self, column) for state, column in PREDICT_COLUMNS.items()
+                if getattr(self, column) is not None}
+
+    @predictMap.setter
+    def predictMap(self, predict_map: Optional[Dict[str, float]]) -> None:
+        for column, value in self.predict_values(predict_map).items():
+            setattr(self, column, value)
+
+    @staticmethod
+    def predict_values(predict_map: Optional[Dict[str, float]]) -> Dict[str, Optional[float]]:
+        """
+        predictMap을 p_<state> 컬럼 값으로 바꾼다. (bulk insert 등 Core 쿼리용)
+        컬럼이 없는 울음 원인은 저장할 곳이 없으므로 버리지 않고 ValueError를 낸다.
+        """
+        predict_map = predict_map or {}
+        unknown = set(predict_map) - PREDICT_COLUMNS.keys()
+        if unknown:
+            raise ValueError(
+                f"predictMap has unknown states {sorted(unknown)}; allowed: {list(PREDICT_COLUMNS)}")
+        return {column: float(predict_map[state]) if predict_map.get(state) is not None else None
+                for state, column in PREDICT_COLUMNS.items()}
+
+    @classmethod
+    def predict_column(cls, state: str):
+        """SQL에서 확률로 필터링/집계할 때 사용할 울음 원인의 컬럼"""
+        return getattr(cls, PREDICT_COLUMNS[state])
+
     def update(self, **kwargs):
         for key, value in kwargs.items():
             setattr(self, key, value)
@@ -56,3 +98,7 @@ class CryTable(DB_Base):
         if 'intensity' in data and data['intensity'] in CRY_INTENSITY_KR_TO_EN:
             data['intensity'] = CRY_INTENSITY_KR_TO_EN[data['intensity']]
         return cls(**data)
+
+
+# 울음 원인 -> 예측 확률 컬럼 이름. 새 원인을 enum에 추가하면 컬럼과 migration도 함께 추가해야 한다.
+PREDICT_COLUMNS = {state: f"p_{state}" for state in ordered_cry_state_en}
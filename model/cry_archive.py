@@ -0,0 +1,39 @@
+# model/cry_archive.py
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import Boolean, Column, DateTime, Integer, String
+
+from db_base import DB_Base
+
+
+class CryArchiveTable(DB_Base):
+    """
+    반려동물/월별로 cry 테이블에서 보관 파일(Parquet)로 옮긴 울음 기록의 목록.
+    archiving은 보관 작업의 트랜잭션 안에서만 참이며, 그동안 cry 삭제 트리거가 롤업과 버전을 바꾸지 않는다.
+    """
+    __tablename__ = 'cry_archive'
+    pet_id = Column(Integer, primary_key=True)
+    # 'YYYY-MM'
+    month = Column(String, primary_key=True)
+    # CRY_ARCHIVE_DIR 기준 상대 경로. 다시 보관할 때마다 새 파일을 쓰고 경로를 바꾼다.
+    path = Column(String, nullable=False)
+    rows = Column(Integer, nullable=False, default=0)
+    size = Column(Integer, nullable=False, default=0)
+    archiving = Column(Boolean, nullable=False, default=False)
+    archived_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CryArchive(pet_id={self.pet_id}, month={self.month}, path={self.path}, rows={self.rows})>"
+
+    def to_dict(self):
+        return {
+            "pet_id": self.pet_id,
+            "month": self.month,
+            "path": self.path,
+            "rows": self.rows,
+            "size": self.size,
+            "archived_at": self.archived_at
+        }
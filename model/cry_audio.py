@@ -0,0 +1,35 @@
+# model/cry_audio.py
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime
+
+from db_base import DB_Base
+
+
+class CryAudioTable(DB_Base):
+    """audioId -> 저장된 울음 오디오 파일 위치 인덱스"""
+    __tablename__ = 'cry_audio'
+    audioId = Column(String, primary_key=True)
+    pet_id = Column(Integer, nullable=False)
+    path = Column(String, nullable=False)
+    codec = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    sha256 = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CryAudio(audioId={self.audioId}, pet_id={self.pet_id}, path={self.path}, codec={self.codec}, size={self.size})>"
+
+    def to_dict(self):
+        return {
+            "audioId": self.audioId,
+            "pet_id": self.pet_id,
+            "path": self.path,
+            "codec": self.codec,
+            "size": self.size,
+            "sha256": self.sha256,
+            "created_at": self.created_at
+        }
@@ -0,0 +1,55 @@
+# model/cry_job.py
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Index
+
+from db_base import DB_Base
+from enums.cry_job_status import CryJobStatusEnum
+
+
+class CryJobTable(DB_Base):
+    __tablename__ = 'cry_job'
+    id = Column(String, primary_key=True)
+    pet_id = Column(Integer, nullable=False)
+    user_id = Column(String, nullable=False)
+    status = Column(String, nullable=False,
+                    default=CryJobStatusEnum.PENDING.value)
+    time = Column(DateTime, nullable=False)
+    audioId = Column(String, nullable=False)
+    digest = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    cry_id = Column(Integer, nullable=True)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    # 워커가 대기 중인 작업을 오래된 순으로 가져갈 때 사용
+    __table_args__ = (
+        Index('ix_cry_job_status_created_at', 'status', 'created_at'),
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CryJob(id={self.id}, pet_id={self.pet_id}, status={self.status}, audioId={self.audioId}, attempts={self.attempts}, cry_id={self.cry_id})>"
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "pet_id": self.pet_id,
+            "user_id": self.user_id,
+            "status": self.status,
+            "time": self.time,
+            "audioId": self.audioId,
+            "attempts": self.attempts,
+            "cry_id": self.cry_id,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+    def update(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+        return self
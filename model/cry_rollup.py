@@ -0,0 +1,70 @@
+# model/cry_rollup.py
+from __future__ import annotations
+from sqlalchemy import Column, String, Integer, Date, Float
+
+from db_base import DB_Base
+
+
+class CryRollupHourlyTable(DB_Base):
+    """
+    반려동물/날짜/시간대/울음 원인별 울음 수와 지속시간 합계.
+    cry 테이블의 트리거(db_migration.py)가 insert/update/delete 때마다 갱신한다.
+    """
+    __tablename__ = 'cry_rollup_hourly'
+    pet_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    hour = Column(Integer, primary_key=True)
+    state = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    # duration이 NULL인 울음은 duration_count에서 빠진다.
+    duration_sum = Column(Float, nullable=False, default=0.0)
+    duration_count = Column(Integer, nullable=False, default=0)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CryRollupHourly(pet_id={self.pet_id}, day={self.day}, hour={self.hour}, state={self.state}, count={self.count}, duration_sum={self.duration_sum})>"
+
+    def to_dict(self):
+        return {
+            "pet_id": self.pet_id,
+            "day": self.day,
+            "hour": self.hour,
+            "state": self.state,
+            "count": self.count,
+            "duration_sum": self.duration_sum,
+            "duration_count": self.duration_count
+        }
+
+
+class CryRollupWeeklyTable(DB_Base):
+    """
+    반려동물/주(월요일 날짜)/시간대/울음 원인별 울음 수와 지속시간 합계.
+    긴 기간을 분석할 때 cry_rollup_hourly 대신 사용한다. (트리거는 db_migration.py)
+    """
+    __tablename__ = 'cry_rollup_weekly'
+    pet_id = Column(Integer, primary_key=True)
+    week = Column(Date, primary_key=True)
+    hour = Column(Integer, primary_key=True)
+    state = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    duration_sum = Column(Float, nullable=False, default=0.0)
+    duration_count = Column(Integer, nullable=False, default=0)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CryRollupWeekly(pet_id={self.pet_id}, week={self.week}, hour={self.hour}, state={self.state}, count={self.count}, duration_sum={self.duration_sum})>"
+
+    def to_dict(self):
+        return {
+            "pet_id": self.pet_id,
+            "week": self.week,
+            "hour": self.hour,
+            "state": self.state,
+            "count": self.count,
+            "duration_sum": self.duration_sum,
+            "duration_count": self.duration_count
+        }
@@ -0,0 +1,27 @@
+# model/cry_version.py
+from __future__ import annotations
+from sqlalchemy import Column, Integer
+
+from db_base import DB_Base
+
+
+class CryVersionTable(DB_Base):
+    """
+    반려동물별 울음 데이터 버전.
+    cry 테이블의 트리거(db_migration.py)가 insert/update/delete 때마다 1씩 올리며, 분석 결과 캐시의 무효화에 사용한다.
+    """
+    __tablename__ = 'cry_version'
+    pet_id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CryVersion(pet_id={self.pet_id}, version={self.version})>"
+
+    def to_dict(self):
+        return {
+            "pet_id": self.pet_id,
+            "version": self.version
+        }
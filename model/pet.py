@@ -1,6 +1,6 @@
 # model/pet.py
 from __future__ import annotations
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from db_base import DB_Base
@@ -27,6 +27,11 @@ class PetTable(DB_Base):
     cries = relationship("CryTable", back_populates="pet",
                          cascade="all, delete-orphan", lazy='noload')
 
+    # 유저의 반려동물 조회와 소유권 확인에 사용
+    __table_args__ = (
+        Index('ix_pet_user_id_id', 'user_id', 'id'),
+    )
+
     def __init__(self, **kwargs):
         species = kwargs.get('species')
         if species in SPECIES_KR_TO_EN:
@@ -35,10 +40,15 @@ class PetTable(DB_Base):
 
     @classmethod
     def create(cls, user_id: str, data: dict) -> PetTable:
+        return cls(**cls.create_values(user_id, data))
+
+    @staticmethod
+    def create_values(user_id: str, data: dict) -> dict:
+        """create와 같은 변환을 거친 컬럼 값. (INSERT ... RETURNING 등 Core 쿼리용)"""
         data['user_id'] = user_id
         if 'species' in data and data['species'] in SPECIES_KR_TO_EN:
             data['species'] = SPECIES_KR_TO_EN[data['species']]
-        return cls(**data)
+        return data
 
     def __repr__(self):
         return (f"<Pet(id={self.id}, name={self.name}, gender={self.gender}, "
@@ -57,10 +67,15 @@ class PetTable(DB_Base):
         }
 
     def update(self, **kwargs):
-        if 'species' in kwargs:
-            species = kwargs['species']
-            if species in SPECIES_KR_TO_EN:
-                kwargs['species'] = SPECIES_KR_TO_EN[species]
-        for key, value in kwargs.items():
+        for key, value in self.update_values(kwargs).items():
             setattr(self, key, value)
         return self
+
+    @staticmethod
+    def update_values(data: dict) -> dict:
+        """update와 같은 변환을 거친 컬럼 값. (UPDATE ... RETURNING 등 Core 쿼리용)"""
+        if 'species' in data:
+            species = data['species']
+            if species in SPECIES_KR_TO_EN:
+                data['species'] = SPECIES_KR_TO_EN[species]
+        return data
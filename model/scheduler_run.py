@@ -0,0 +1,34 @@
+# model/scheduler_run.py
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import Column, DateTime, String
+
+from db_base import DB_Base
+
+
+class SchedulerRunTable(DB_Base):
+    """
+    예약 작업(분석 결과 사전 계산, 울음 보관)의 실행 기록.
+    uvicorn 워커마다 스케줄러가 돌기 때문에 (작업 이름, 예약 시각) 행을 먼저 넣은 프로세스만 작업을 실행한다.
+    """
+    __tablename__ = 'scheduler_run'
+    name = Column(String, primary_key=True)
+    # 예약된 실행 시각 (모든 프로세스가 같은 값을 계산한다)
+    slot = Column(DateTime, primary_key=True)
+    # 실행한 프로세스 (host:pid)
+    owner = Column(String, nullable=False)
+    started_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<SchedulerRun(name={self.name}, slot={self.slot}, owner={self.owner})>"
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "slot": self.slot,
+            "owner": self.owner,
+            "started_at": self.started_at
+        }
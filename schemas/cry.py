@@ -5,7 +5,7 @@ from datetime import datetime
 
 from enums.cry_state import CRY_STATE_EN_TO_KR, CRY_STATE_KR_TO_EN
 from enums.cry_intensity import CRY_INTENSITY_EN_TO_KR, CRY_INTENSITY_KR_TO_EN
-from validator.cry import validate_state, validate_intensity, validate_duration, validate_time
+from validator.cry import validate_state, validate_predict_map, validate_intensity, validate_duration, validate_time
 from schemas.common import BaseOutput
 
 
@@ -52,6 +52,7 @@ class CreateCryInput(BaseModel):
     duration: Optional[float] = 2.0
 
     _validate_state = field_validator('state')(validate_state)
+    _validate_predict_map = field_validator('predictMap')(validate_predict_map)
     _validate_intensity = field_validator('intensity')(validate_intensity)
     _validate_duration = field_validator('duration')(validate_duration)
     _validate_time = field_validator('time')(validate_time)
@@ -61,12 +62,35 @@ class CreateCryOutput(BaseOutput):
     cry: Optional[Cry] = None
 
 
+# 한 번의 /cry/bulk 요청으로 저장할 수 있는 최대 울음 수
+CRY_BULK_MAX_ITEMS = 1000
+
+
+class CreateCriesInput(BaseModel):
+    cries: List[CreateCryInput] = Field(..., min_length=1, max_length=CRY_BULK_MAX_ITEMS)
+
+
+class CreateCryResult(BaseModel):
+    # 요청의 cries 배열에서의 위치
+    index: int
+    success: bool
+    cry: Optional[Cry] = None
+    error: Optional[str] = None
+
+
+class CreateCriesOutput(BaseOutput):
+    created: int = 0
+    results: Optional[List[CreateCryResult]] = None
+
+
 class GetCryOutput(BaseOutput):
     cry: Optional[Cry] = None
 
 
 class GetPetCriesOutput(BaseOutput):
     cries: Optional[List[Cry]] = None
+    # 다음 페이지가 있으면 다음 요청의 cursor로 전달한다.
+    next_cursor: Optional[str] = None
 
 
 class UpdateCryInput(BaseModel):
@@ -79,6 +103,8 @@ class UpdateCryInput(BaseModel):
 
     _validate_state = field_validator('state')(
         lambda cls, v: validate_state(v) if v is not None else v)
+    _validate_predict_map = field_validator('predictMap')(
+        lambda cls, v: validate_predict_map(v) if v is not None else v)
     _validate_intensity = field_validator('intensity')(
         lambda cls, v: validate_intensity(v) if v is not None else v)
     _validate_duration = field_validator('duration')(
@@ -97,11 +123,35 @@ class DeleteCryOutput(BaseOutput):
 
 class GetCriesWithStateOutput(BaseOutput):
     cries: Optional[List[Cry]] = None
+    # 다음 페이지가 있으면 다음 요청의 cursor로 전달한다.
+    next_cursor: Optional[str] = None
 
 
 class GetCriesBetweenTimeOutput(BaseOutput):
     cries: Optional[List[Cry]] = None
+    # 다음 페이지가 있으면 다음 요청의 cursor로 전달한다.
+    next_cursor: Optional[str] = None
 
 
 class PredictCryOutput(BaseOutput):
     cry: Optional[Cry] = None
+
+
+class CryJob(BaseModel):
+    id: str
+    pet_id: int
+    status: str
+    audioId: str
+    attempts: int
+    cry: Optional[Cry] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class PredictCryJobOutput(BaseOutput):
+    job: Optional[CryJob] = None
+
+
+class GetCryJobOutput(BaseOutput):
+    job: Optional[CryJob] = None
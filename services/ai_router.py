@@ -0,0 +1,138 @@
+# services/ai_router.py
+import random
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from core.env import env
+from log import logger
+
+
+class Replica:
+    """AI 서버 인스턴스 하나의 상태: 처리 중인 요청 수와 연속 실패 횟수"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def is_healthy(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def __repr__(self):
+        return f"<Replica(url={self.url}, outstanding={self.outstanding}, failures={self.consecutive_failures})>"
+
+
+class ReplicaRouter:
+    """
+    여러 AI 서버 중 처리 중인 요청이 가장 적은 곳으로 요청을 보낸다.
+    연속으로 실패한 서버는 일정 시간 동안 제외하고, 응답 시간 분포를 기록해 hedge 지연을 정한다.
+    """
+
+    def __init__(self, urls: Iterable[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self.eject_failures = int(env.get("AI_SERVER_EJECT_FAILURES", 3))
+        self.eject_seconds = float(env.get("AI_SERVER_EJECT_SECONDS", 30))
+        # 0이면 hedge 요청을 보내지 않는다.
+        self.hedge_percentile = float(env.get("AI_SERVER_HEDGE_PERCENTILE", 95))
+        self.hedge_min_delay = float(env.get("AI_SERVER_HEDGE_MIN_MS", 50)) / 1000
+        self.hedge_min_samples = int(env.get("AI_SERVER_HEDGE_MIN_SAMPLES", 20))
+        self._latencies = deque(maxlen=int(env.get("AI_SERVER_LATENCY_WINDOW", 500)))
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def pick(self, exclude: Iterable[Replica] = ()) -> Optional[Replica]:
+        now = time.monotonic()
+        candidates = [replica for replica in self.replicas if replica not in exclude]
+        if not candidates:
+            return None
+
+        healthy = [replica for replica in candidates if replica.is_healthy(now)]
+        if not healthy:
+            # 모두 제외된 상태라면 가장 먼저 복귀할 서버로 보낸다.
+            return min(candidates, key=lambda replica: replica.ejected_until)
+
+        # 처리 중인 요청 수가 같으면 최근 실패가 적은 서버를 고른다.
+        def load(replica: Replica):
+            return replica.outstanding, replica.consecutive_failures
+
+        least = min(load(replica) for replica in healthy)
+        return random.choice([replica for replica in healthy if load(replica) == least])
+
+    def hedge_delay(self) -> Optional[float]:
+        """hedge 요청을 보내기 전 기다릴 시간(초). 보낼 수 없으면 None"""
+        if self.hedge_percentile <= 0 or len(self.replicas) < 2:
+            return None
+        if len(self._latencies) < self.hedge_min_samples:
+            return None
+
+        latencies = sorted(self._latencies)
+        index = min(int(len(latencies) * self.hedge_percentile / 100), len(latencies) - 1)
+        return max(latencies[index], self.hedge_min_delay)
+
+    def record_success(self, replica: Replica, latency: float) -> None:
+        replica.requests += 1
+        replica.consecutive_failures = 0
+        self._latencies.append(latency)
+
+    def record_failure(self, replica: Replica) -> None:
+        replica.requests += 1
+        replica.failures += 1
+        replica.consecutive_failures += 1
+        if replica.consecutive_failures >= self.eject_failures:
+            replica.ejected_until = time.monotonic() + self.eject_seconds
+            replica.consecutive_failures = 0
+            logger.warning(
+                f"AI server {replica.url} ejected for {self.eject_seconds:.0f}s")
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        delay = self.hedge_delay()
+        return {
+            "replicas": [{"url": replica.url,
+                          "healthy": replica.is_healthy(now),
+                          "outstanding": replica.outstanding,
+                          "requests": replica.requests,
+                          "failures": replica.failures} for replica in self.replicas],
+            "hedge_delay_ms": round(delay * 1000, 1) if delay is not None else None,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+def parse_urls(value: Optional[str]) -> List[str]:
+    """쉼표로 구분된 URL 목록을 리스트로 바꾼다."""
+    if not value:
+        return []
+    return [url.strip() for url in value.split(',') if url.strip()]
+
+
+class ReplicaRouterRegistry:
+    """
+    env 키와 종(species)별 라우터 모음.
+    {KEY}_{SPECIES}(예: AI_SERVER_API_DOG)가 있으면 그 목록을, 없으면 {KEY}의 목록을 사용한다.
+    """
+
+    def __init__(self):
+        self._routers: Dict[tuple, ReplicaRouter] = {}
+
+    def get(self, key: str, species: str) -> Optional[ReplicaRouter]:
+        urls = parse_urls(env.get(f"{key}_{species.upper()}")) or parse_urls(env.get(key))
+        if not urls:
+            return None
+
+        router_key = (key, tuple(urls))
+        router = self._routers.get(router_key)
+        if router is None:
+            router = self._routers[router_key] = ReplicaRouter(urls)
+        return router
+
+    def stats(self) -> List[dict]:
+        return [{"key": key, **router.stats()}
+                for (key, _), router in self._routers.items()]
+
+
+ai_routers = ReplicaRouterRegistry()
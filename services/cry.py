@@ -1,33 +1,92 @@
 # services/cry.py
+from sqlalchemy import Select, insert, literal, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from pydantic import BaseModel
+from typing import Dict, Iterable, Iterator, List, Tuple
 from datetime import datetime, timedelta
 from typing import Optional
+from dataclasses import dataclass
+from itertools import islice
 import os
-import json
-import pandas as pd
-from sqlalchemy.dialects import sqlite
+import math
+import heapq
+import asyncio
 from fastapi import UploadFile
 
+from db import SessionLocal, async_variant
 from schemas.cry import *
 from model.cry import CryTable
 from model.pet import PetTable
+from model.cry_version import CryVersionTable
 from error.exceptions import (
-    CryNotFoundError, UnauthorizedError, WrongCryOfSpeciesError)
+    CryNotFoundError, InvalidCursorError, InvalidInspectWindowError, UnauthorizedError, WrongCryOfSpeciesError)
 from utils.converters import cry_table_to_schema
+from utils.cursor import decode_cursor, encode_cursor
+from utils.upload import spool_upload
+from utils.audio import (
+    WavFeatures, extract_wav_features, needs_forward_conversion, read_wav_info, write_forward_wav)
 from enums.cry_state import check_right_cry_state
-from constants.path import CRY_INSPECT_LOG_DIR, CRY_DATASET_DIR
-from services.cry_predict import cry_predict
+from enums.sort_order import SortOrderEnum, allowed_sort_order
+from enums.cry_inspect import (
+    CRY_INSPECT_WINDOW_DELTAS, CryInspectResolutionEnum, CryInspectWindowEnum,
+    allowed_cry_inspect_resolution, allowed_cry_inspect_window)
+from services.cry_batcher import cry_predict_batcher
+from services.cry_predict_cache import cry_predict_cache
+from services.cry_job import cry_job_service
+from services.cry_rollup import (
+    DAY_RESOLUTION_MAX_SPAN, CrySummary, cry_rollup_service, select_resolution)
+from services.cry_inspect_cache import cry_inspect_cache
+from services.cry_storage import cry_audio_storage
+from services.cry_archive import CryArchiveRange, cry_archive_service
+from services.pet_ownership import PetOwner, pet_ownership_cache
+from core.env import env
+from log import logger
+
+# AI 서버로 보내기 전 리샘플링할 샘플레이트 (0이면 원본 샘플레이트 유지)
+CRY_FORWARD_SAMPLE_RATE = int(env.get("CRY_FORWARD_SAMPLE_RATE", 16000))
+# 울음 목록을 스트리밍할 때 한 번에 읽어 변환하는 행 수
+CRY_STREAM_BATCH_ROWS = int(env.get("CRY_STREAM_BATCH_ROWS", 500))
+# 울음 목록 페이지 크기 (limit가 없을 때의 기본값과 상한)
+CRY_PAGE_DEFAULT_LIMIT = int(env.get("CRY_PAGE_DEFAULT_LIMIT", 100))
+CRY_PAGE_MAX_LIMIT = int(env.get("CRY_PAGE_MAX_LIMIT", 500))
+
+
+def _to_local_naive(value: datetime) -> datetime:
+    # DB에는 로컬 시각이 timezone 없이 저장된다.
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+def _format_bucket(bucket) -> str:
+    if isinstance(bucket, datetime):
+        return bucket.strftime('%Y-%m-%d %H:00')
+    return str(bucket)
+
+
+@dataclass
+class CryListQuery:
+    """울음 목록 조회 조건: cry 테이블(hot)을 읽는 쿼리와 같은 조건으로 보관 파일(cold)에서 읽을 범위"""
+    hot: Select
+    cold: Optional[CryArchiveRange] = None
 
 
 class CryService:
-    def _get_user_pet(self, db: Session, pet_id: int, user_id: str) -> Optional[PetTable]:
-        return db.query(PetTable).filter(
-            PetTable.id == pet_id,
-            PetTable.user_id == user_id
-        ).first()
-
-    async def create_cry(self, db: Session, create_cry_input: CreateCryInput, user_id: str) -> Cry:
+    def _get_user_pet(self, db: Session, pet_id: int, user_id: str) -> Optional[PetOwner]:
+        # 소유권 캐시에 있으면 DB를 조회하지 않는다. 캐시는 다른 프로세스의 변경을 늦게 반영하므로
+        # 빠른 거부와 종 확인에만 쓰고, 권한은 각 쿼리의 SQL 조건(_owned_pet_ids)으로 다시 확인한다.
+        return pet_ownership_cache.get_user_pet(db, pet_id, user_id)
+
+    def _owned_pet_ids(self, user_id: str) -> Select:
+        return select(PetTable.id).where(PetTable.user_id == user_id)
+
+    def _cry_values(self, cry_input: BaseModel, exclude_unset: bool = False) -> dict:
+        # predictMap은 컬럼이 아니므로 p_<state> 컬럼 값으로 바꿔 INSERT/UPDATE에 넘긴다.
+        values = cry_input.model_dump(exclude_unset=exclude_unset)
+        if 'predictMap' in values:
+            values.update(CryTable.predict_values(values.pop('predictMap')))
+        return values
+
+    def create_cry(self, db: Session, create_cry_input: CreateCryInput, user_id: str) -> Cry:
         pet = self._get_user_pet(db, create_cry_input.pet_id, user_id)
         if not pet:
             raise UnauthorizedError(
@@ -38,12 +97,66 @@ class CryService:
         if notRightSpeciesError:
             raise WrongCryOfSpeciesError(notRightSpeciesError)
 
-        cry_table = CryTable(**create_cry_input.model_dump())
-        db.add(cry_table)
+        # INSERT ... SELECT ... WHERE <소유권> RETURNING 한 문장으로 소유권을 DB에서 확인하며 저장된 행을 바로 받는다.
+        values = self._cry_values(create_cry_input)
+        cry_table = db.scalar(
+            insert(CryTable).from_select(
+                list(values),
+                select(*[literal(value, CryTable.__table__.c[column].type) for column, value in values.items()])
+                .where(literal(create_cry_input.pet_id).in_(self._owned_pet_ids(user_id))))
+            .returning(CryTable))
+        if not cry_table:
+            # 다른 프로세스에서 삭제되었거나 다른 유저에게 옮겨진 반려동물
+            pet_ownership_cache.invalidate(create_cry_input.pet_id)
+            raise UnauthorizedError(
+                "You are not authorized to create a cry for this pet")
+        cry = cry_table_to_schema(cry_table)
         db.commit()
-        db.refresh(cry_table)
 
-        return cry_table_to_schema(cry_table)
+        return cry
+
+    def create_cries(self, db: Session, create_cry_inputs: List[CreateCryInput], user_id: str) -> List[CreateCryResult]:
+        """
+        여러 반려동물의 울음을 한 트랜잭션에서 한 번의 executemany로 저장하고 항목별 결과를 반환한다.
+        소유권과 종은 반려동물 목록을 한 번 조회해 확인하며, 저장할 수 없는 항목은 건너뛰고 오류를 남긴다.
+        """
+        # 소유권 캐시 대신 pet 테이블에서 직접 확인한다. (반려동물 수와 관계없이 쿼리 한 번)
+        pet_ids = {create_cry_input.pet_id for create_cry_input in create_cry_inputs}
+        owners = [PetOwner(*row) for row in db.execute(
+            select(PetTable.id, PetTable.user_id, PetTable.species)
+            .where(PetTable.id.in_(pet_ids), PetTable.user_id == user_id))]
+        for owner in owners:
+            pet_ownership_cache.remember(owner)
+        pets = {pet_id: None for pet_id in pet_ids}
+        pets.update({owner.id: owner for owner in owners})
+
+        results: List[Optional[CreateCryResult]] = [None] * len(create_cry_inputs)
+        rows, indexes = [], []
+        for index, create_cry_input in enumerate(create_cry_inputs):
+            pet = pets[create_cry_input.pet_id]
+            if not pet:
+                results[index] = CreateCryResult(
+                    index=index, success=False, error="You are not authorized to create a cry for this pet")
+                continue
+            notRightSpeciesError = check_right_cry_state(
+                pet.species, create_cry_input.state)
+            if notRightSpeciesError:
+                results[index] = CreateCryResult(
+                    index=index, success=False, error=notRightSpeciesError)
+                continue
+
+            rows.append(self._cry_values(create_cry_input))
+            indexes.append(index)
+
+        if rows:
+            # SQLite는 RETURNING 순서를 보장하지 않는다. 새 id는 항상 기존 최댓값보다 크게 입력 순서대로
+            # 할당되므로, 정렬하면 rows 순서와 같다. (sort_by_parameter_order는 한 행씩 INSERT하게 된다)
+            cry_ids = sorted(db.scalars(insert(CryTable).returning(CryTable.id), rows).all())
+            db.commit()
+            for index, cry_id in zip(indexes, cry_ids):
+                results[index] = CreateCryResult(
+                    index=index, success=True, cry=Cry(id=cry_id, **create_cry_inputs[index].model_dump()))
+        return results
 
     def get_cry_by_id(self, db: Session, cry_id: int, user_id: str) -> Cry:
         cry_table = db.query(CryTable).join(PetTable).filter(
@@ -54,38 +167,50 @@ class CryService:
             raise CryNotFoundError(f"Cry with id {cry_id} not found")
         return cry_table_to_schema(cry_table)
 
-    def get_all_cries_by_pet(self, db: Session, pet_id: int, user_id: str) -> List[Cry]:
+    def pet_cries_query(self, db: Session, pet_id: int, user_id: str) -> CryListQuery:
         pet = self._get_user_pet(db, pet_id, user_id)
         if not pet:
             raise UnauthorizedError(
                 "You are not authorized to view cries for this pet")
 
-        cry_tables = db.query(CryTable).filter(CryTable.pet_id == pet_id).all()
-        return [cry_table_to_schema(cry) for cry in cry_tables]
+        return CryListQuery(
+            hot=select(CryTable).join(PetTable).where(
+                CryTable.pet_id == pet_id,
+                PetTable.user_id == user_id
+            ),
+            cold=CryArchiveRange(pet_id, user_id=user_id))
+
+    def get_all_cries_by_pet(self, db: Session, pet_id: int, user_id: str, limit: Optional[int] = None,
+                             cursor: Optional[str] = None, order: str = SortOrderEnum.ASC.value) -> Tuple[List[Cry], Optional[str]]:
+        return self._list_cries(db, self.pet_cries_query(db, pet_id, user_id), limit, cursor, order)
 
     def update_cry(self, db: Session, cry_id: int, update_cry_input: UpdateCryInput, user_id: str) -> Cry:
-        cry_table = db.query(CryTable).join(PetTable).filter(
-            CryTable.id == cry_id,
-            PetTable.user_id == user_id
-        ).first()
+        values = self._cry_values(update_cry_input, exclude_unset=True)
+        if not values:
+            return self.get_cry_by_id(db, cry_id, user_id)
+
+        # 소유권 확인과 수정을 UPDATE ... RETURNING 한 문장으로 처리한다.
+        cry_table = db.scalar(
+            update(CryTable).where(
+                CryTable.id == cry_id,
+                CryTable.pet_id.in_(select(PetTable.id).where(PetTable.user_id == user_id))
+            ).values(**values).returning(CryTable))
         if not cry_table:
             raise CryNotFoundError(f"Cry with id {cry_id} not found")
 
-        pet = self._get_user_pet(db, cry_table.pet_id, user_id)
-        if not pet:
-            raise UnauthorizedError(
-                "You are not authorized to view cries for this pet")
-
-        notRightSpeciesError = check_right_cry_state(
-            pet.species, update_cry_input.state)
-        if notRightSpeciesError:
-            raise WrongCryOfSpeciesError(notRightSpeciesError)
+        # 울음 원인이 바뀔 때만 종을 확인한다. (종은 소유권 캐시에서 가져오므로 보통 조회가 없다)
+        if 'state' in values:
+            pet = self._get_user_pet(db, cry_table.pet_id, user_id)
+            notRightSpeciesError = check_right_cry_state(
+                pet.species, values['state'])
+            if notRightSpeciesError:
+                db.rollback()
+                raise WrongCryOfSpeciesError(notRightSpeciesError)
 
-        cry_table.update(**update_cry_input.model_dump(exclude_unset=True))
+        cry = cry_table_to_schema(cry_table)
         db.commit()
-        db.refresh(cry_table)
 
-        return cry_table_to_schema(cry_table)
+        return cry
 
     def delete_cry(self, db: Session, cry_id: int, user_id: str) -> None:
         cry_table = db.query(CryTable).join(PetTable).filter(
@@ -98,7 +223,7 @@ class CryService:
         db.delete(cry_table)
         db.commit()
 
-    def get_pets_with_state(self, db: Session, pet_id: int, query_state: str, user_id: str) -> List[Cry]:
+    def pets_with_state_query(self, db: Session, pet_id: int, query_state: str, user_id: str) -> CryListQuery:
         pet = self._get_user_pet(db, pet_id, user_id)
         if not pet:
             raise UnauthorizedError(
@@ -110,132 +235,365 @@ class CryService:
         if notRightSpeciesError:
             raise WrongCryOfSpeciesError(notRightSpeciesError)
 
-        cry_tables = db.query(CryTable).filter(
-            CryTable.pet_id == pet_id,
-            CryTable.state == standardized_state,
-        ).all()
-        return [cry_table_to_schema(cry) for cry in cry_tables]
-
-    def get_pets_between_time(self, db: Session, pet_id: int, start_time: datetime, end_time: datetime, user_id: str) -> List[Cry]:
-        cry_tables = db.query(CryTable).join(PetTable).filter(
-            CryTable.pet_id == pet_id,
-            CryTable.time >= start_time,
-            CryTable.time <= end_time + timedelta(days=1),
-            PetTable.user_id == user_id
-        ).all()
-        return [cry_table_to_schema(cry) for cry in cry_tables]
-
-    def inspect_cry(self, db: Session, pet_id: int, user_id: str):
-        # 유저의 반려동물인지 확인
-        pet = self._get_user_pet(db, pet_id, user_id)
-        if not pet:
+        return CryListQuery(
+            hot=select(CryTable).join(PetTable).where(
+                CryTable.pet_id == pet_id,
+                CryTable.state == standardized_state,
+                PetTable.user_id == user_id
+            ),
+            cold=CryArchiveRange(pet_id, state=standardized_state, user_id=user_id))
+
+    def get_pets_with_state(self, db: Session, pet_id: int, query_state: str, user_id: str, limit: Optional[int] = None,
+                            cursor: Optional[str] = None, order: str = SortOrderEnum.ASC.value) -> Tuple[List[Cry], Optional[str]]:
+        return self._list_cries(db, self.pets_with_state_query(db, pet_id, query_state, user_id), limit, cursor, order)
+
+    def pets_between_time_query(self, db: Session, pet_id: int, start_time: datetime, end_time: datetime,
+                                user_id: str) -> CryListQuery:
+        end_time = end_time + timedelta(days=1)
+        return CryListQuery(
+            hot=select(CryTable).join(PetTable).where(
+                CryTable.pet_id == pet_id,
+                CryTable.time >= start_time,
+                CryTable.time <= end_time,
+                PetTable.user_id == user_id
+            ),
+            cold=CryArchiveRange(pet_id, start=start_time, end=end_time, user_id=user_id))
+
+    def get_pets_between_time(self, db: Session, pet_id: int, start_time: datetime, end_time: datetime, user_id: str,
+                              limit: Optional[int] = None, cursor: Optional[str] = None,
+                              order: str = SortOrderEnum.ASC.value) -> Tuple[List[Cry], Optional[str]]:
+        return self._list_cries(db, self.pets_between_time_query(db, pet_id, start_time, end_time, user_id), limit, cursor, order)
+
+    def _order_cries(self, query: Select, cursor: Optional[str], order: str) -> Select:
+        """
+        (time, id) 순으로 정렬하고 cursor가 가리키는 행 다음부터 읽는다.
+        offset 대신 마지막 행의 키로 범위를 좁히므로 뒤쪽 페이지도 첫 페이지와 비용이 같다.
+        """
+        if order not in allowed_sort_order:
+            raise InvalidCursorError(
+                f"order must be one of {', '.join(allowed_sort_order)}")
+        descending = order == SortOrderEnum.DESC.value
+        if cursor is not None:
+            key = tuple_(CryTable.time, CryTable.id)
+            last_key = decode_cursor(cursor, order)
+            query = query.where(key < last_key if descending else key > last_key)
+        if descending:
+            return query.order_by(CryTable.time.desc(), CryTable.id.desc())
+        return query.order_by(CryTable.time, CryTable.id)
+
+    def _merge_archived(self, db: Session, query: CryListQuery, cries: Iterable[Cry], cursor: Optional[str],
+                        order: str, archive_paths: Optional[List[str]] = None) -> Iterable[Cry]:
+        """
+        (time, id) 순서인 cry 테이블의 울음과 보관된 울음을 같은 순서로 합친다.
+        archive_paths(읽을 보관 파일 목록)가 없으면 보관 목록을 따로 조회한다.
+        """
+        if query.cold is None:
+            return cries
+        descending = order == SortOrderEnum.DESC.value
+        archived = cry_archive_service.iter_cries(
+            db, query.cold, decode_cursor(cursor, order) if cursor is not None else None, descending, archive_paths)
+        return heapq.merge(cries, archived, key=lambda cry: (cry.time, cry.id), reverse=descending)
+
+    def _list_cries(self, db: Session, query: CryListQuery, limit: Optional[int] = None, cursor: Optional[str] = None,
+                   order: str = SortOrderEnum.ASC.value) -> Tuple[List[Cry], Optional[str]]:
+        """
+        query의 울음 기록(보관된 울음 포함) 한 페이지와 다음 페이지 cursor를 반환한다.
+        limit가 없으면 CRY_PAGE_DEFAULT_LIMIT개씩, 많아도 CRY_PAGE_MAX_LIMIT개씩 나눈다.
+        (전체 목록은 stream_cries로 내보낸다)
+        """
+        hot_query = self._order_cries(query.hot, cursor, order)
+        limit = min(limit or CRY_PAGE_DEFAULT_LIMIT, CRY_PAGE_MAX_LIMIT)
+        # 한 행을 더 읽어 다음 페이지가 있는지 확인한다.
+        hot_query = hot_query.limit(limit + 1)
+        archive_paths = None
+        if query.cold is None:
+            cries = [cry_table_to_schema(cry) for cry in db.scalars(hot_query)]
+        else:
+            # 읽을 보관 파일 목록을 컬럼으로 붙여 같은 쿼리로 가져온다. (페이지가 비었을 때만 따로 조회된다)
+            descending = order == SortOrderEnum.DESC.value
+            rows = db.execute(hot_query.add_columns(cry_archive_service.catalog_column(
+                query.cold, decode_cursor(cursor, order) if cursor is not None else None, descending))).all()
+            cries = [cry_table_to_schema(cry) for cry, _ in rows]
+            if rows:
+                archive_paths = cry_archive_service.paths_from_catalog(rows[0][1], descending)
+        cries = list(islice(self._merge_archived(db, query, cries, cursor, order, archive_paths), limit + 1))
+        next_cursor = None
+        if len(cries) > limit:
+            cries = cries[:limit]
+            next_cursor = encode_cursor(cries[-1].time, cries[-1].id, order)
+        return cries, next_cursor
+
+    def stream_cries(self, query: CryListQuery, cursor: Optional[str] = None,
+                     order: str = SortOrderEnum.ASC.value) -> Iterator[bytes]:
+        """
+        query의 울음 기록(보관된 울음 포함)을 한국어로 변환해 한 줄에 하나씩 NDJSON으로 내보낸다.
+        서버 측 커서에서 CRY_STREAM_BATCH_ROWS 행씩 읽으므로 기록이 많아도 메모리 사용량이 일정하다.
+        응답을 스트리밍하는 동안 요청의 DB 세션은 이미 닫혀 있으므로 세션을 따로 연다.
+        """
+        hot_query = self._order_cries(query.hot, cursor, order)
+
+        def generate() -> Iterator[bytes]:
+            db = SessionLocal()
+            try:
+                result = db.scalars(hot_query.execution_options(yield_per=CRY_STREAM_BATCH_ROWS))
+                cries = (cry_table_to_schema(cry) for cry in result)
+                cries = iter(self._merge_archived(db, query, cries, cursor, order))
+                while batch := list(islice(cries, CRY_STREAM_BATCH_ROWS)):
+                    yield b''.join(
+                        cry.to_korean().model_dump_json().encode() + b'\n' for cry in batch)
+            except Exception as e:
+                logger.error(f"Cry stream failed: {e}", exc_info=True)
+                raise
+            finally:
+                db.close()
+
+        return generate()
+
+    def _get_cry_versions(self, db: Session, pet_ids: List[int], user_id: Optional[str] = None) -> Dict[int, int]:
+        """반려동물별 울음 데이터 버전. user_id가 주어지면 그 유저의 반려동물만 반환한다. (권한 확인을 겸한다)"""
+        query = select(PetTable.id, CryVersionTable.version).outerjoin(
+            CryVersionTable, CryVersionTable.pet_id == PetTable.id).where(PetTable.id.in_(pet_ids))
+        if user_id is not None:
+            query = query.where(PetTable.user_id == user_id)
+        return {pet_id: version or 0 for pet_id, version in db.execute(query)}
+
+    def _build_inspect_result(self, log_id: str, summary: CrySummary) -> dict:
+        # 1. 주로 우는 시간대 분석 (울음이 있는 시간대만 시간 순으로)
+        cry_freq_hour = [summary.hour_counts[hour]
+                         for hour in sorted(summary.hour_counts)]
+
+        # 2. 날짜별(시간/일/주 단위) 울음 빈도 분석
+        dates = sorted(summary.date_counts)
+
+        # 3. 울음 원인 빈도 분석 (적은 순)
+        type_freq = dict(sorted(summary.state_counts.items(),
+                                key=lambda item: item[1]))
+
+        # 4. 울음 원인에 따른 울음 지속시간 분석
+        duration_of_type = sorted(summary.mean_durations().items(),
+                                  key=lambda item: item[1])
+        types = [state for state, _ in duration_of_type]
+        durations = [duration for _, duration in duration_of_type]
+        if durations:
+            min_value = int(durations[0])
+            durations = [duration - min_value for duration in durations]
+        max_value = max(durations, default=0.0)
+        bar_percent = [round(duration / max_value, 3) if max_value else 0.0
+                       for duration in durations]
+
+        return {
+            'logId': log_id,
+            'cry_freq_hour': cry_freq_hour,
+            'resolution': summary.resolution,
+            'cry_freq_date': {
+                'date': [_format_bucket(bucket) for bucket in dates],
+                'freqs': [summary.date_counts[day] for day in dates]
+            },
+            'type_freq': type_freq,
+            'duration_of_type': {
+                'type': types,
+                'duration': [round(duration, 3) for duration in durations],
+                'bar_percent': bar_percent
+            }
+        }
+
+    def _resolve_inspect_window(self, window: str, start_time: Optional[datetime],
+                                end_time: Optional[datetime], resolution: Optional[str]):
+        """분석 기간과 날짜별 빈도의 단위를 정한다. resolution이 없으면 기간 길이에 따라 고른다."""
+        if start_time is not None or end_time is not None or window == CryInspectWindowEnum.CUSTOM.value:
+            if start_time is None:
+                raise InvalidInspectWindowError(
+                    "start_time is required for a custom window")
+            window = CryInspectWindowEnum.CUSTOM.value
+            start_time = _to_local_naive(start_time)
+            end_time = _to_local_naive(end_time) if end_time else datetime.now()
+        elif window in CRY_INSPECT_WINDOW_DELTAS:
+            end_time = datetime.now()
+            start_time = end_time - CRY_INSPECT_WINDOW_DELTAS[window]
+        else:
+            raise InvalidInspectWindowError(
+                f"window must be one of {', '.join(allowed_cry_inspect_window)}")
+
+        if start_time >= end_time:
+            raise InvalidInspectWindowError("start_time must be before end_time")
+        if resolution is None:
+            resolution = select_resolution(start_time, end_time)
+        elif resolution not in allowed_cry_inspect_resolution:
+            raise InvalidInspectWindowError(
+                f"resolution must be one of {', '.join(allowed_cry_inspect_resolution)}")
+        elif resolution == CryInspectResolutionEnum.HOUR.value and end_time - start_time > DAY_RESOLUTION_MAX_SPAN:
+            raise InvalidInspectWindowError(
+                f"hour resolution is only available for windows up to {DAY_RESOLUTION_MAX_SPAN.days} days")
+        return window, start_time, end_time, resolution
+
+    def _inspect_pets(self, db: Session, pet_ids: List[int], window: str, start_time: Optional[datetime],
+                      end_time: Optional[datetime], resolution: Optional[str],
+                      user_id: Optional[str] = None) -> Dict[int, Optional[dict]]:
+        """
+        반려동물별 분석 결과를 반환한다. 울음 수가 부족하면 None
+        캐시에 없는 반려동물만 모아 한 번에 집계한다.
+        user_id가 주어지면 모든 반려동물이 그 유저의 것인지 버전 조회에서 함께 확인한다.
+        """
+        # 분석 기간 설정
+        window, start_date, end_date, resolution = self._resolve_inspect_window(
+            window, start_time, end_time, resolution)
+
+        # 캐시 키: 울음 데이터 버전과 분석 기간
+        # 정해진 기간은 집계 단위로 끊어 같은 시간대/날짜의 요청이 결과를 공유하고, 임의 기간은 초 단위까지 구분한다.
+        if window == CryInspectWindowEnum.CUSTOM.value:
+            label_format = '%Y-%m-%dT%H%M%S'
+        elif resolution == CryInspectResolutionEnum.HOUR.value:
+            label_format = '%Y-%m-%dT%H'
+        else:
+            label_format = '%Y-%m-%d'
+        period = f"{start_date.strftime(label_format)}_{end_date.strftime(label_format)}"
+        cache_key = f"{period}_{resolution}"
+
+        results: Dict[int, Optional[dict]] = {}
+        versions = self._get_cry_versions(db, pet_ids, user_id)
+        if user_id is not None and len(versions) < len(set(pet_ids)):
+            for pet_id in set(pet_ids) - versions.keys():
+                pet_ownership_cache.invalidate(pet_id)
             raise UnauthorizedError(
                 "You are not authorized to view cries for this pet")
-
-        # 분석 기간 설정
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=30)
-
-        # 파일 이름 설정: 로그 파일이 있는 경우 가져오며 그렇지 않을 경우 분석을 수행
-        file_name = f"{pet.id}_{start_date.strftime('%Y-%m-%d')}_{end_date.strftime('%Y-%m-%d')}"
-        file_path = os.path.join(CRY_INSPECT_LOG_DIR, f'{file_name}.json')
-
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                res = json.loads(f.read())
-            return res
-
-        query = db.query(CryTable).filter(
-            CryTable.pet_id == pet_id,
-            CryTable.time >= start_date,
-            CryTable.time <= end_date
-        )
-        sql_query = query.statement.compile(
-            dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
-
-        df = pd.read_sql(sql_query, db.connection())
-
-        if len(df) < 100:
-            return None
-
-        try:
-            # 1. 주로 우는 시간대 분석
-            cry_freq_hour = df['time'].dt.hour.value_counts().sort_index()
-
-            # 2. 일별 울음 빈도 분석
-            cry_freq_date = df[['id']].groupby(
-                df['time'].dt.date).count().reset_index()
-            cry_freq_date['time'] = cry_freq_date['time'].astype(str)
-
-            # 3. 울음 원인 빈도 분석
-            type_freq = df['state'].value_counts()
-            type_freq.sort_values(ascending=True, inplace=True)
-
-            # 4. 울음 원인에 따른 울음 지속시간 분석
-            duration_of_type = df[['state', 'duration']
-                                  ].groupby('state').mean()
-            duration_of_type.sort_values(by='duration', inplace=True)
-
-            min_value = duration_of_type['duration'].min().astype(int)
-            duration_of_type['duration'] -= min_value
-            bar_percent = (duration_of_type['duration'] /
-                           duration_of_type['duration'].max()).round(3)
-
-            inspect_result = {
-                'logId': file_name,
-                'cry_freq_hour': cry_freq_hour.tolist(),
-                'cry_freq_date': {
-                    'date': cry_freq_date['time'].tolist(),
-                    'freqs': cry_freq_date['id'].tolist()
-                },
-                'type_freq': type_freq.to_dict(),
-                'duration_of_type': {
-                    'type': duration_of_type.index.tolist(),
-                    'duration': duration_of_type['duration'].round(3).tolist(),
-                    'bar_percent': bar_percent.tolist()
-                }
-            }
-
-            # 결과를 파일로 저장
-            with open(file_path, 'w') as f:
-                f.write(json.dumps(inspect_result, indent=4, ensure_ascii=False))
-
-            return inspect_result
-
-        except Exception as e:
-            raise Exception(f"Failed to inspect cry: {e}")
-
-    async def predict_cry(self, db: Session, file: UploadFile, pet_id: int, user_id: str) -> Cry:
+        # 그사이 삭제된 반려동물은 분석하지 않는다.
+        pet_ids = [pet_id for pet_id in pet_ids if pet_id in versions]
+        for pet_id in pet_ids:
+            results[pet_id] = cry_inspect_cache.get(pet_id, cache_key, versions[pet_id])
+        missing = [pet_id for pet_id in pet_ids if results[pet_id] is None]
+        if not missing:
+            return results
+
+        summaries = cry_rollup_service.summarize(
+            db, missing, start_date, end_date, resolution)
+
+        # 30일 기준 100개, 그보다 짧은 기간은 길이에 비례한 개수 미만이면 분석하지 않는다.
+        min_cries = min(100, math.ceil(100 * (end_date - start_date) / timedelta(days=30)))
+        for pet_id, summary in summaries.items():
+            if summary.total < min_cries:
+                continue
+            try:
+                inspect_result = self._build_inspect_result(f"{pet_id}_{period}", summary)
+            except Exception as e:
+                raise Exception(f"Failed to inspect cry: {e}")
+
+            cry_inspect_cache.set(pet_id, cache_key, versions[pet_id], inspect_result)
+            results[pet_id] = inspect_result
+        return results
+
+    def inspect_cry(self, db: Session, pet_id: int, user_id: str, window: str = CryInspectWindowEnum.MONTH.value,
+                    start_time: Optional[datetime] = None, end_time: Optional[datetime] = None,
+                    resolution: Optional[str] = None):
         # 유저의 반려동물인지 확인
         pet = self._get_user_pet(db, pet_id, user_id)
         if not pet:
             raise UnauthorizedError(
                 "You are not authorized to view cries for this pet")
 
-        # 반려동물 울음 분석
-        content = await file.read()
-        predictMap = await cry_predict(content, pet.species, user_id)
-
-        # wav 파일 저장
+        return self._inspect_pets(db, [pet.id], window, start_time, end_time, resolution, user_id)[pet.id]
+
+    def inspect_all_cries(self, db: Session, user_id: str, window: str = CryInspectWindowEnum.MONTH.value,
+                          start_time: Optional[datetime] = None, end_time: Optional[datetime] = None,
+                          resolution: Optional[str] = None) -> Dict[int, Optional[dict]]:
+        """유저의 모든 반려동물에 대한 분석 결과를 반려동물 id별로 반환한다."""
+        pet_ids = [pet_id for (pet_id,) in db.query(PetTable.id).filter(
+            PetTable.user_id == user_id).order_by(PetTable.id)]
+        return self._inspect_pets(db, pet_ids, window, start_time, end_time, resolution, user_id)
+
+    # async 엔드포인트용 (AsyncSession을 받는다)
+    create_cry_async = async_variant(create_cry)
+    create_cries_async = async_variant(create_cries)
+    get_cry_by_id_async = async_variant(get_cry_by_id)
+    get_all_cries_by_pet_async = async_variant(get_all_cries_by_pet)
+    update_cry_async = async_variant(update_cry)
+    delete_cry_async = async_variant(delete_cry)
+    get_pets_with_state_async = async_variant(get_pets_with_state)
+    get_pets_between_time_async = async_variant(get_pets_between_time)
+
+    async def _spool_cry_audio(self, file: UploadFile, pet_id: int):
+        # wav 파일을 chunk 단위로 spool 디렉토리에 저장하며 해시 계산
         curtime = datetime.now()
-        timestamp = curtime.strftime("%Y%m%d-%H%M%S")
-        file_id = f'{pet_id}_{timestamp}'
-        file_path = os.path.join(CRY_DATASET_DIR, f"{file_id}.wav")
-        with open(file_path, 'wb') as f:
-            f.write(content)
+        file_id = cry_audio_storage.new_audio_id(pet_id, curtime)
+        file_path = cry_audio_storage.spool_path(file_id)
+        digest = await spool_upload(file, file_path)
+        return curtime, file_id, file_path, digest
+
+    async def _predict_features(self, file_path: str, features: WavFeatures, species: str, user_id: str) -> dict:
+        if not needs_forward_conversion(features, CRY_FORWARD_SAMPLE_RATE):
+            return await cry_predict_batcher(file_path, species, user_id)
+
+        # 무음을 잘라내고 모노/저샘플레이트로 변환한 파일을 AI 서버에 전송
+        forward_path = f"{file_path}.forward.wav"
+        try:
+            await asyncio.to_thread(write_forward_wav, file_path, features,
+                                    forward_path, CRY_FORWARD_SAMPLE_RATE)
+            return await cry_predict_batcher(forward_path, species, user_id)
+        finally:
+            if os.path.exists(forward_path):
+                os.remove(forward_path)
+
+    async def process_prediction(self, db: AsyncSession, pet: PetOwner, curtime: datetime, file_id: str, digest: str, user_id: str) -> Cry:
+        # 파일 분석과 AI 서버 응답을 기다리는 동안 DB 커넥션을 붙잡고 있지 않도록 세션을 반납한다.
+        await db.close()
+
+        # 울음 길이, 세기, 앞뒤 무음 구간 계산
+        file_path = cry_audio_storage.spool_path(file_id)
+        features = await asyncio.to_thread(extract_wav_features, file_path)
+
+        # 반려동물 울음 분석: 저장된 파일을 디스크에서 스트리밍으로 전송
+        predictMap = cry_predict_cache.get(digest, pet.species)
+        if predictMap is None:
+            predictMap = await self._predict_features(file_path, features, pet.species, user_id)
+            cry_predict_cache.set(digest, pet.species, predictMap)
+
+        # 분석이 끝난 wav를 FLAC으로 압축해 저장소로 이동 (인덱스는 울음과 함께 commit)
+        await cry_audio_storage.store(db, file_id, pet.id, digest)
 
         # 분석 결과 DB에 저장
         create_cry_input = CreateCryInput(
-            pet_id=pet_id,
+            pet_id=pet.id,
             time=curtime,
             state=max(predictMap, key=predictMap.get),
             audioId=file_id,
             predictMap=predictMap,
+            intensity=features.intensity,
+            duration=round(features.cry_duration, 3),
         )
         print("create cry: ", create_cry_input)
-        cry = await self.create_cry(db, create_cry_input, user_id)
+        cry = await self.create_cry_async(db, create_cry_input, user_id)
 
         return cry
 
+    async def predict_cry(self, db: AsyncSession, file: UploadFile, pet_id: int, user_id: str) -> Cry:
+        # 유저의 반려동물인지 확인
+        pet = await db.run_sync(self._get_user_pet, pet_id, user_id)
+        if not pet:
+            raise UnauthorizedError(
+                "You are not authorized to view cries for this pet")
+
+        curtime, file_id, _, digest = await self._spool_cry_audio(file, pet_id)
+        try:
+            return await self.process_prediction(db, pet, curtime, file_id, digest, user_id)
+        except Exception:
+            await db.rollback()
+            cry_audio_storage.discard(file_id)
+            raise
+
+    async def enqueue_prediction(self, db: AsyncSession, file: UploadFile, pet_id: int, user_id: str) -> CryJob:
+        # 유저의 반려동물인지 확인
+        pet = await db.run_sync(self._get_user_pet, pet_id, user_id)
+        if not pet:
+            raise UnauthorizedError(
+                "You are not authorized to view cries for this pet")
+
+        # 파일만 저장하고 분석과 DB 저장은 작업 큐의 워커가 수행
+        curtime, file_id, file_path, digest = await self._spool_cry_audio(file, pet_id)
+        try:
+            read_wav_info(file_path)
+        except Exception:
+            cry_audio_storage.discard(file_id)
+            raise
+        return await db.run_sync(cry_job_service.enqueue, pet_id, user_id, curtime, file_id, digest)
+
 
 cry_service = CryService()
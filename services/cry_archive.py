@@ -0,0 +1,390 @@
+# services/cry_archive.py
+import os
+import json
+import time
+import uuid
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import Select, ScalarSelect, delete, func, select
+from sqlalchemy.orm import Session
+
+from core.env import env
+from constants.path import CRY_ARCHIVE_DIR
+from db import SessionLocal
+from log import logger
+from model.cry import CryTable, PREDICT_COLUMNS
+from model.cry_archive import CryArchiveTable
+from model.pet import PetTable
+from schemas.cry import Cry
+from services.scheduler_run import claim_scheduler_run
+from utils.converters import cry_archive_row_to_schema
+
+MONTH_FORMAT = '%Y-%m'
+
+# 보관 파일(과 내보내기 파일)의 컬럼
+CRY_ARCHIVE_SCHEMA = pa.schema(
+    [
+        ('id', pa.int64()),
+        ('pet_id', pa.int64()),
+        ('time', pa.timestamp('us')),
+        ('state', pa.string()),
+        ('audioId', pa.string()),
+        ('intensity', pa.string()),
+        ('duration', pa.float64()),
+    ] + [(column, pa.float64()) for column in PREDICT_COLUMNS.values()]
+)
+
+
+def _month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(month_start: datetime) -> datetime:
+    return _month_start(month_start + timedelta(days=32))
+
+
+@dataclass(frozen=True)
+class CryArchiveRange:
+    """
+    보관 파일에서 읽을 울음의 조건. 목록 조회의 SQL 조건과 같게 맞춘다. (start <= time <= end)
+    user_id가 주어지면 그 유저의 반려동물일 때만 읽는다.
+    """
+    pet_id: int
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    state: Optional[str] = None
+    user_id: Optional[str] = None
+
+
+class CryArchiveService:
+    """
+    CRY_ARCHIVE_AGE_DAYS보다 오래된 울음 기록을 반려동물/월별 Parquet 파일(cold tier)로 옮기고 cry 테이블에서 지운다.
+    CRY_ARCHIVE_AGE_DAYS를 설정했을 때만(기본값 0: 보관하지 않음) 매일 CRY_ARCHIVE_HOUR 시에 실행되며,
+    보관할 달이 통째로 지난 뒤에만 옮긴다. 여러 프로세스가 떠 있어도 예약 시각마다 한 프로세스만 실행한다.
+    - 파일 목록은 cry_archive 테이블이 관리하고, 다시 보관할 때는 새 파일을 쓴 뒤 같은 트랜잭션에서 경로를 바꾼다.
+      (실패하면 이전 파일이 그대로 쓰인다) 더 이상 목록에 없는 파일은 읽는 중일 수 있으므로 다음 실행 때 지운다.
+    - 지운 울음은 롤업과 버전에 남아 있으므로(db_migration._guard_cry_delete_triggers) 분석 결과는 바뀌지 않는다.
+    - 보관된 울음은 읽기 전용이다. 목록/검색/스트리밍(iter_cries)과 내보내기로만 읽을 수 있고,
+      id로 조회/수정/삭제할 수 없다.
+    """
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+        # 0 이하이면 보관하지 않는다. (기본값)
+        self.age_days = int(env.get("CRY_ARCHIVE_AGE_DAYS", 0))
+        # 음수이면 스케줄러를 실행하지 않는다.
+        self.hour = int(env.get("CRY_ARCHIVE_HOUR", 3))
+        self.compression = env.get("CRY_ARCHIVE_COMPRESSION", "zstd")
+        self._task: Optional[asyncio.Task] = None
+
+        self.runs = 0
+        self.runs_skipped = 0
+        self.running = False
+        self.next_run_at: Optional[datetime] = None
+        self.last_started_at: Optional[datetime] = None
+        self.last_duration = 0.0
+        self.months_archived = 0
+        self.months_failed = 0
+        self.rows_archived = 0
+        self.files_read = 0
+
+    def _file_path(self, path: str) -> str:
+        return os.path.join(self.archive_dir, path)
+
+    # -----------------------------------------------------------------------
+    # 보관 작업
+    # -----------------------------------------------------------------------
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """이 시각 이전의 달만 보관한다. (now - age_days가 속한 달의 1일 0시)"""
+        return _month_start((now or datetime.now()) - timedelta(days=self.age_days))
+
+    def _get_candidates(self, cutoff: datetime) -> List[Tuple[int, str]]:
+        month = func.strftime(MONTH_FORMAT, CryTable.time)
+        db = SessionLocal()
+        try:
+            return [tuple(row) for row in db.execute(
+                select(CryTable.pet_id, month).where(CryTable.time < cutoff)
+                .group_by(CryTable.pet_id, month).order_by(CryTable.pet_id, month))]
+        finally:
+            db.close()
+
+    def archive_month(self, db: Session, pet_id: int, month: str) -> int:
+        """반려동물의 한 달치 울음을 보관 파일로 옮기고 옮긴 행 수를 반환한다."""
+        start = datetime.strptime(month, MONTH_FORMAT)
+        end = _next_month(start)
+
+        archive = db.get(CryArchiveTable, (pet_id, month))
+        previous_path = archive.path if archive else None
+        if archive is None:
+            archive = CryArchiveTable(pet_id=pet_id, month=month, path='')
+            db.add(archive)
+        # 먼저 쓰기로 트랜잭션(쓰기 잠금)을 시작해 읽은 행과 지우는 행이 같도록 한다.
+        archive.archiving = True
+        db.flush()
+
+        rows = db.execute(
+            select(*[getattr(CryTable, field.name) for field in CRY_ARCHIVE_SCHEMA])
+            .where(CryTable.pet_id == pet_id, CryTable.time >= start, CryTable.time < end)
+        ).all()
+        if not rows:
+            db.rollback()
+            return 0
+
+        table = pa.Table.from_pylist([row._asdict() for row in rows], schema=CRY_ARCHIVE_SCHEMA)
+        if previous_path:
+            # 보관한 뒤에 들어온 예전 시각의 울음은 기존 파일과 합친다.
+            table = pa.concat_tables([pq.read_table(self._file_path(previous_path)), table])
+        table = table.sort_by([('time', 'ascending'), ('id', 'ascending')])
+
+        path = os.path.join(str(pet_id), f"{month}.{uuid.uuid4().hex[:8]}.parquet")
+        file_path = self._file_path(path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        try:
+            pq.write_table(table, file_path, compression=self.compression)
+
+            db.execute(delete(CryTable).where(
+                CryTable.pet_id == pet_id, CryTable.time >= start, CryTable.time < end))
+            archive.path = path
+            archive.rows = table.num_rows
+            archive.size = os.path.getsize(file_path)
+            archive.archived_at = datetime.now()
+            archive.archiving = False
+            db.commit()
+        except Exception:
+            db.rollback()
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+
+        return len(rows)
+
+    def _remove_stale_files(self, older_than: datetime) -> int:
+        """cry_archive 목록에 없는 파일(다시 보관하며 바뀐 이전 파일 등)을 지운다."""
+        db = SessionLocal()
+        try:
+            paths = set(db.scalars(select(CryArchiveTable.path)))
+        finally:
+            db.close()
+
+        removed = 0
+        for directory, _, filenames in os.walk(self.archive_dir):
+            for filename in filenames:
+                file_path = os.path.join(directory, filename)
+                if os.path.relpath(file_path, self.archive_dir) in paths:
+                    continue
+                if datetime.fromtimestamp(os.path.getmtime(file_path)) < older_than:
+                    os.remove(file_path)
+                    removed += 1
+        return removed
+
+    def _archive(self, pet_id: int, month: str) -> int:
+        db = SessionLocal()
+        try:
+            return self.archive_month(db, pet_id, month)
+        finally:
+            db.close()
+
+    async def run(self) -> None:
+        """cutoff 이전의 달을 반려동물/월 단위로 하나씩 보관한다. (쓰기 잠금을 짧게 잡도록 트랜잭션을 나눈다)"""
+        if self.running or self.age_days <= 0:
+            return
+        self.running = True
+        started = time.perf_counter()
+        self.last_started_at = datetime.now()
+        archived = 0
+        try:
+            await asyncio.to_thread(self._remove_stale_files, self.last_started_at - timedelta(hours=1))
+            candidates = await asyncio.to_thread(self._get_candidates, self.cutoff())
+            for pet_id, month in candidates:
+                try:
+                    rows = await asyncio.to_thread(self._archive, pet_id, month)
+                    archived += rows
+                    self.rows_archived += rows
+                    self.months_archived += 1
+                except Exception as e:
+                    self.months_failed += 1
+                    logger.error(f"Cry archive for pet {pet_id} {month} failed: {e}", exc_info=True)
+        finally:
+            self.running = False
+            self.runs += 1
+            self.last_duration = time.perf_counter() - started
+
+        logger.info(f"Archived {archived} cries in {self.last_duration:.1f}s")
+
+    def remove_pet(self, db: Session, pet_id: int) -> List[str]:
+        """
+        삭제할 반려동물의 보관 목록을 지우고 보관 파일 경로를 반환한다.
+        반려동물 삭제와 같은 트랜잭션에서 호출하고, commit한 뒤 remove_files로 파일을 지운다.
+        """
+        return db.scalars(delete(CryArchiveTable).where(
+            CryArchiveTable.pet_id == pet_id).returning(CryArchiveTable.path)).all()
+
+    def remove_files(self, paths: List[str]) -> None:
+        for path in paths:
+            if path and os.path.exists(self._file_path(path)):
+                os.remove(self._file_path(path))
+
+    # -----------------------------------------------------------------------
+    # 보관된 울음 읽기
+    # -----------------------------------------------------------------------
+
+    def _bounds(self, archive_range: CryArchiveRange, after: Optional[Tuple[datetime, int]],
+                descending: bool) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """after(cursor의 키)까지 반영한 읽을 시각 범위"""
+        start, end = archive_range.start, archive_range.end
+        if after is not None:
+            if descending:
+                end = after[0] if end is None else min(end, after[0])
+            else:
+                start = after[0] if start is None else max(start, after[0])
+        return start, end
+
+    def _where_months(self, query: Select, start: Optional[datetime], end: Optional[datetime]) -> Select:
+        if start is not None:
+            query = query.where(CryArchiveTable.month >= start.strftime(MONTH_FORMAT))
+        if end is not None:
+            query = query.where(CryArchiveTable.month <= end.strftime(MONTH_FORMAT))
+        return query
+
+    def catalog_query(self, archive_range: CryArchiveRange, after: Optional[Tuple[datetime, int]] = None,
+                      descending: bool = False) -> Select:
+        """
+        읽어야 할 보관 파일의 (month, path). 보관 파일에는 소유자 정보가 없으므로
+        user_id가 주어지면 pet 테이블로 그 유저의 반려동물인지 함께 확인한다.
+        """
+        query = select(CryArchiveTable.month, CryArchiveTable.path).where(
+            CryArchiveTable.pet_id == archive_range.pet_id)
+        if archive_range.user_id is not None:
+            query = query.join(PetTable, PetTable.id == CryArchiveTable.pet_id).where(
+                PetTable.user_id == archive_range.user_id)
+        return self._where_months(query, *self._bounds(archive_range, after, descending))
+
+    def catalog_column(self, archive_range: CryArchiveRange, after: Optional[Tuple[datetime, int]] = None,
+                       descending: bool = False) -> ScalarSelect:
+        """
+        catalog_query의 결과를 JSON 배열 하나로 모은 scalar subquery.
+        목록 조회 쿼리에 컬럼으로 붙이면 보관 파일 목록을 따로 조회하지 않아도 된다. (paths_from_catalog로 푼다)
+        """
+        catalog = self.catalog_query(archive_range, after, descending).subquery()
+        return select(func.json_group_array(
+            func.json_array(catalog.c.month, catalog.c.path))).scalar_subquery()
+
+    def paths_from_catalog(self, catalog: str, descending: bool = False) -> List[str]:
+        """catalog_column 값을 읽을 순서(월 순서)의 파일 경로 목록으로 바꾼다."""
+        return [path for _, path in sorted(json.loads(catalog), reverse=descending)]
+
+    def paths_by_pet(self, db: Session, pet_ids: List[int], start: Optional[datetime] = None,
+                     end: Optional[datetime] = None) -> Dict[int, List[str]]:
+        """여러 반려동물의 보관 파일 경로를 pet_id, 월 순서로 한 번에 조회한다. (보관 파일이 있는 반려동물만)"""
+        query = self._where_months(
+            select(CryArchiveTable.pet_id, CryArchiveTable.path).where(CryArchiveTable.pet_id.in_(pet_ids)),
+            start, end)
+        paths: Dict[int, List[str]] = {}
+        for pet_id, path in db.execute(query.order_by(CryArchiveTable.pet_id, CryArchiveTable.month)):
+            paths.setdefault(pet_id, []).append(path)
+        return paths
+
+    def iter_rows(self, db: Session, archive_range: CryArchiveRange,
+                  after: Optional[Tuple[datetime, int]] = None, descending: bool = False,
+                  paths: Optional[List[str]] = None) -> Iterator[dict]:
+        """
+        조건에 맞는 보관된 울음을 (time, id) 순서의 dict(CRY_ARCHIVE_SCHEMA 컬럼)로 내보낸다.
+        after가 주어지면 그 키 다음부터 읽는다. paths(읽을 파일 목록)가 없으면 catalog_query로 바로 조회하고,
+        파일은 필요한 달만 차례로 읽으므로 앞쪽 페이지만 읽으면 뒤쪽 파일은 열지 않는다.
+        """
+        start, end = self._bounds(archive_range, after, descending)
+        if paths is None:
+            catalog = self.catalog_query(archive_range, after, descending).subquery()
+            paths = db.scalars(select(catalog.c.path).order_by(
+                catalog.c.month.desc() if descending else catalog.c.month)).all()
+
+        def generate() -> Iterator[dict]:
+            for path in paths:
+                table = pq.read_table(self._file_path(path))
+                self.files_read += 1
+                mask = None
+                for condition in (
+                        pc.greater_equal(table['time'], pa.scalar(start, pa.timestamp('us'))) if start else None,
+                        pc.less_equal(table['time'], pa.scalar(end, pa.timestamp('us'))) if end else None,
+                        pc.equal(table['state'], archive_range.state) if archive_range.state else None):
+                    if condition is not None:
+                        mask = condition if mask is None else pc.and_(mask, condition)
+                if mask is not None:
+                    table = table.filter(mask)
+                rows = table.to_pylist()
+                for row in reversed(rows) if descending else rows:
+                    if after is not None:
+                        key = (row['time'], row['id'])
+                        if (key >= after) if descending else (key <= after):
+                            continue
+                    yield row
+
+        return generate()
+
+    def iter_cries(self, db: Session, archive_range: CryArchiveRange,
+                   after: Optional[Tuple[datetime, int]] = None, descending: bool = False,
+                   paths: Optional[List[str]] = None) -> Iterator[Cry]:
+        """iter_rows의 행을 Cry로 바꿔 내보낸다."""
+        return map(cry_archive_row_to_schema, self.iter_rows(db, archive_range, after, descending, paths))
+
+    # -----------------------------------------------------------------------
+    # 스케줄러
+    # -----------------------------------------------------------------------
+
+    async def start(self) -> None:
+        if self.hour < 0 or self.age_days <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._schedule())
+        logger.info(f"Scheduled cry archive at {self.hour:02d}:00 for cries older than {self.age_days} days")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def _next_run(self, now: datetime) -> datetime:
+        next_run = now.replace(hour=self.hour % 24, minute=0, second=0, microsecond=0)
+        return next_run if next_run > now else next_run + timedelta(days=1)
+
+    async def _schedule(self) -> None:
+        while True:
+            self.next_run_at = self._next_run(datetime.now())
+            await asyncio.sleep((self.next_run_at - datetime.now()).total_seconds())
+            try:
+                if not await asyncio.to_thread(claim_scheduler_run, "cry_archive", self.next_run_at):
+                    self.runs_skipped += 1
+                    continue
+                await self.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cry archive failed: {e}", exc_info=True)
+
+    def stats(self) -> dict:
+        return {
+            'age_days': self.age_days,
+            'hour': self.hour,
+            'cutoff': self.cutoff().isoformat() if self.age_days > 0 else None,
+            'runs': self.runs,
+            'runs_skipped': self.runs_skipped,
+            'running': self.running,
+            'next_run_at': self.next_run_at.isoformat() if self.next_run_at else None,
+            'last_started_at': self.last_started_at.isoformat() if self.last_started_at else None,
+            'last_duration_seconds': round(self.last_duration, 3),
+            'months_archived': self.months_archived,
+            'months_failed': self.months_failed,
+            'rows_archived': self.rows_archived,
+            'files_read': self.files_read,
+        }
+
+
+cry_archive_service = CryArchiveService(CRY_ARCHIVE_DIR)
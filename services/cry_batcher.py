@@ -0,0 +1,123 @@
+# services/cry_batcher.py
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Set
+
+from core.env import env
+from log import logger
+from services.cry_predict import CryPredictService, cry_predict
+
+
+@dataclass
+class PendingPrediction:
+    file_path: str
+    user_id: str
+    future: asyncio.Future
+
+
+class CryPredictBatcher:
+    """
+    동시에 들어온 울음 분석 요청을 종(species)별로 모아 한 번의 배치 요청으로 보낸다.
+    최대 max_batch_size 개가 모이거나 max_wait 초가 지나면 배치를 전송한다.
+    """
+
+    def __init__(self, predictor: CryPredictService):
+        self.predictor = predictor
+        self.max_batch_size = int(env.get("CRY_PREDICT_BATCH_SIZE", 8))
+        self.max_wait = float(env.get("CRY_PREDICT_BATCH_WAIT_MS", 10)) / 1000
+        self._pending: Dict[str, List[PendingPrediction]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        # 전송 중인 배치. 이벤트 루프는 task를 약하게 참조하므로 끝날 때까지 참조를 붙잡아 둔다.
+        self._tasks: Set[asyncio.Task] = set()
+
+        # 배치 크기 통계
+        self.request_count = 0
+        self.batch_count = 0
+        self.batch_sizes = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_batch_size > 1
+
+    def is_enabled(self, species: str) -> bool:
+        return self.enabled and self.predictor.has_batch_api(species)
+
+    async def __call__(self, file_path: str, species: str, user_id: str) -> Dict[str, float]:
+        self.request_count += 1
+        if not self.is_enabled(species):
+            self._record_batch(1)
+            return await self.predictor(file_path, species, user_id)
+
+        loop = asyncio.get_running_loop()
+        pending = PendingPrediction(file_path, user_id, loop.create_future())
+        queue = self._pending.setdefault(species, [])
+        queue.append(pending)
+
+        if len(queue) >= self.max_batch_size:
+            self._flush(species)
+        elif len(queue) == 1:
+            self._timers[species] = loop.call_later(
+                self.max_wait, self._flush, species)
+
+        return await pending.future
+
+    def _flush(self, species: str) -> None:
+        timer = self._timers.pop(species, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(species, [])
+        if batch:
+            task = asyncio.create_task(self._run_batch(species, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, species: str, batch: List[PendingPrediction]) -> None:
+        self._record_batch(len(batch))
+        try:
+            if len(batch) == 1:
+                results = [await self.predictor(batch[0].file_path, species, batch[0].user_id)]
+            else:
+                results = await self.predictor.predict_batch(
+                    [pending.file_path for pending in batch], species,
+                    [pending.user_id for pending in batch])
+        except asyncio.CancelledError:
+            for pending in batch:
+                pending.future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Batch prediction failed (size={len(batch)}): {e}")
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+
+        for pending, result in zip(batch, results):
+            if not pending.future.done():
+                pending.future.set_result(result)
+
+    async def shutdown(self) -> None:
+        """모으고 있던 요청을 바로 전송하고 전송 중인 배치가 끝날 때까지 기다린다. (AI 서버 클라이언트를 닫기 전에 호출)"""
+        for species in list(self._pending):
+            self._flush(species)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _record_batch(self, size: int) -> None:
+        self.batch_count += 1
+        self.batch_sizes[size] += 1
+
+    def stats(self) -> dict:
+        return {
+            'enabled': self.enabled,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'requests': self.request_count,
+            'batches': self.batch_count,
+            'avg_batch_size': round(self.request_count / self.batch_count, 3) if self.batch_count else 0.0,
+            'batch_size_histogram': dict(sorted(self.batch_sizes.items())),
+        }
+
+
+cry_predict_batcher = CryPredictBatcher(cry_predict)
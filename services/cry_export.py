@@ -0,0 +1,138 @@
+# services/cry_export.py
+from datetime import datetime
+from itertools import chain, islice
+from typing import Iterator, List, Optional
+import heapq
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from db import SessionLocal
+from model.pet import PetTable
+from model.cry import CryTable, PREDICT_COLUMNS
+from error.exceptions import UnauthorizedError, ValidationError
+from services.cry_archive import CRY_ARCHIVE_SCHEMA, CryArchiveRange, cry_archive_service
+from core.env import env
+from log import logger
+
+EXPORT_FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+}
+
+# 보관된 울음도 함께 내보내므로 보관 파일과 같은 컬럼을 쓴다.
+CRY_EXPORT_SCHEMA = CRY_ARCHIVE_SCHEMA
+
+
+class _ChunkSink:
+    """writer가 쓴 바이트를 모아 두었다가 record batch 단위로 꺼내 가는 file-like 객체"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class CryExportService:
+    def __init__(self):
+        self.batch_rows = int(env.get("CRY_EXPORT_BATCH_ROWS", 65536))
+
+    def get_export_pet_ids(self, db: Session, user_id: str, pet_id: Optional[int] = None) -> List[int]:
+        """내보낼 반려동물 id 목록. pet_id가 주어지면 유저의 반려동물인지 확인한다."""
+        query = db.query(PetTable.id).filter(PetTable.user_id == user_id)
+        if pet_id is not None:
+            query = query.filter(PetTable.id == pet_id)
+        pet_ids = [pet_id for (pet_id,) in query.order_by(PetTable.id)]
+        if pet_id is not None and not pet_ids:
+            raise UnauthorizedError(
+                "You are not authorized to export cries for this pet")
+        return pet_ids
+
+    def _to_record_batch(self, rows) -> pa.RecordBatch:
+        # 행 단위 결과를 컬럼 단위로 뒤집는다. (컬럼 순서는 CRY_EXPORT_SCHEMA와 같다)
+        columns = list(zip(*rows))
+        return pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, CRY_EXPORT_SCHEMA)],
+            schema=CRY_EXPORT_SCHEMA)
+
+    def _iter_rows(self, db: Session, query: Select, pet_ids: List[int],
+                   start_time: Optional[datetime], end_time: Optional[datetime]) -> Iterator[tuple]:
+        """cry 테이블의 행과 보관된 행을 (pet_id, time, id) 순서로 합친다. (컬럼 순서는 CRY_EXPORT_SCHEMA와 같다)"""
+        archived_paths = cry_archive_service.paths_by_pet(db, pet_ids, start_time, end_time)
+        rows = db.execute(query.execution_options(yield_per=self.batch_rows))
+        if not archived_paths:
+            return iter(rows)
+        # 반려동물별 보관 파일을 pet_id 순서로 이어 읽으면 보관된 행도 (pet_id, time, id) 순서가 된다.
+        archived = chain.from_iterable(
+            (tuple(row[field.name] for field in CRY_EXPORT_SCHEMA) for row in cry_archive_service.iter_rows(
+                db, CryArchiveRange(pet_id, start=start_time, end=end_time), paths=paths))
+            for pet_id, paths in archived_paths.items())
+        return heapq.merge(rows, archived, key=lambda row: (row[1], row[2], row[0]))
+
+    def stream(self, pet_ids: List[int], export_format: str,
+               start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> Iterator[bytes]:
+        """
+        울음 기록(보관된 울음 포함)을 Parquet 또는 Arrow IPC stream으로 batch_rows 행씩 변환해 바이트 조각으로 내보낸다.
+        응답을 스트리밍하는 동안 요청의 DB 세션은 이미 닫혀 있으므로 세션을 따로 연다.
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+        query = select(
+            CryTable.id, CryTable.pet_id, CryTable.time, CryTable.state, CryTable.audioId,
+            CryTable.intensity, CryTable.duration,
+            *[getattr(CryTable, column) for column in PREDICT_COLUMNS.values()]
+        ).where(CryTable.pet_id.in_(pet_ids))
+        if start_time is not None:
+            query = query.where(CryTable.time >= start_time)
+        if end_time is not None:
+            query = query.where(CryTable.time <= end_time)
+        query = query.order_by(CryTable.pet_id, CryTable.time, CryTable.id)
+
+        def generate() -> Iterator[bytes]:
+            sink = _ChunkSink()
+            if export_format == 'parquet':
+                writer = pq.ParquetWriter(sink, CRY_EXPORT_SCHEMA)
+            else:
+                writer = pa.ipc.new_stream(sink, CRY_EXPORT_SCHEMA)
+
+            db = SessionLocal()
+            try:
+                rows = self._iter_rows(db, query, pet_ids, start_time, end_time)
+                while batch := list(islice(rows, self.batch_rows)):
+                    writer.write_batch(self._to_record_batch(batch))
+                    yield sink.drain()
+                writer.close()
+                yield sink.drain()
+            except Exception as e:
+                logger.error(f"Cry export failed: {e}", exc_info=True)
+                raise
+            finally:
+                db.close()
+
+        return generate()
+
+
+cry_export_service = CryExportService()
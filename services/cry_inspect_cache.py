@@ -0,0 +1,167 @@
+# services/cry_inspect_cache.py
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from core.env import env
+from constants.path import CRY_INSPECT_LOG_DIR
+from log import logger
+
+
+class CryInspectCache:
+    """
+    울음 분석 결과 캐시. 메모리 LRU 캐시와 디스크 캐시 2단으로 구성된다.
+    항목은 (반려동물, 분석 기간) 별로 하나씩이며 cry_version 테이블의 버전을 함께 저장해
+    울음이 추가/수정/삭제되어 버전이 바뀌면 무효가 된다.
+    디스크 캐시는 기간(TTL)과 전체 크기 상한으로 정리한다.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.max_entries = int(env.get("CRY_INSPECT_CACHE_SIZE", 1024))
+        self.ttl = float(env.get("CRY_INSPECT_CACHE_TTL_HOURS", 24 * 2)) * 3600
+        self.max_disk_bytes = int(float(env.get("CRY_INSPECT_CACHE_MAX_MB", 64)) * 1024 * 1024)
+        # 이 횟수만큼 디스크에 쓸 때마다 한 번씩 정리한다.
+        self.evict_interval = int(env.get("CRY_INSPECT_CACHE_EVICT_INTERVAL", 256))
+        self._memory: OrderedDict[Tuple[int, str], Tuple[int, float, dict]] = OrderedDict()
+        # 동기 엔드포인트는 스레드 풀에서 실행되므로 메모리 캐시 접근을 잠근다.
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evicted = 0
+
+    def _disk_path(self, pet_id: int, window: str) -> str:
+        # 한 디렉토리에 파일이 몰리지 않도록 반려동물 id로 나눈다.
+        return os.path.join(self.cache_dir, f"{pet_id % 256:02x}", f"{pet_id}_{window}.json")
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return time.time() - stored_at > self.ttl
+
+    def _remember(self, key: Tuple[int, str], version: int, stored_at: float, result: dict) -> None:
+        with self._lock:
+            self._memory[key] = (version, stored_at, result)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, pet_id: int, window: str, version: int) -> Optional[dict]:
+        key = (pet_id, window)
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_version, stored_at, result = entry
+                if stored_version == version and not self._is_expired(stored_at):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return result
+                del self._memory[key]
+
+        try:
+            with open(self._disk_path(pet_id, window), 'r') as f:
+                entry = json.loads(f.read())
+        except (OSError, ValueError):
+            entry = None
+
+        if entry is not None:
+            if entry.get('version') == version and not self._is_expired(entry['stored_at']):
+                self._remember(key, version, entry['stored_at'], entry['result'])
+                self.disk_hits += 1
+                return entry['result']
+            self.stale += 1
+
+        self.misses += 1
+        return None
+
+    def set(self, pet_id: int, window: str, version: int, result: dict) -> None:
+        stored_at = time.time()
+        self._remember((pet_id, window), version, stored_at, result)
+
+        # 같은 (반려동물, 기간)의 이전 버전 파일은 덮어쓴다.
+        file_path = self._disk_path(pet_id, window)
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            tmp_path = f"{file_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(json.dumps({'version': version, 'stored_at': stored_at, 'result': result},
+                                   ensure_ascii=False, separators=(',', ':')))
+            os.replace(tmp_path, file_path)
+        except OSError as e:
+            logger.warning(f"Failed to persist inspect cache entry {pet_id}_{window}: {e}")
+
+        self._writes += 1
+        if self._writes % self.evict_interval == 0:
+            self.evict()
+
+    def invalidate_pet(self, pet_id: int) -> None:
+        """삭제된 반려동물의 모든 기간의 분석 결과를 지운다. (같은 id로 새로 만든 반려동물이 읽지 않도록)"""
+        with self._lock:
+            for key in [key for key in self._memory if key[0] == pet_id]:
+                del self._memory[key]
+
+        dir_path = os.path.dirname(self._disk_path(pet_id, ''))
+        try:
+            filenames = os.listdir(dir_path)
+        except OSError:
+            return
+        for filename in filenames:
+            if filename.startswith(f"{pet_id}_"):
+                self._remove_file(os.path.join(dir_path, filename))
+
+    def evict(self) -> int:
+        """
+        만료된 디스크 캐시 파일을 삭제하고, 남은 파일의 전체 크기가 상한을 넘으면 오래된 것부터 삭제한다.
+        삭제한 파일 개수를 반환한다.
+        """
+        files = []
+        for dir_path, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                file_path = os.path.join(dir_path, filename)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, file_path))
+
+        removed = 0
+        total_size = 0
+        # 최근 파일부터 크기를 더해 가며 만료되었거나 상한을 넘는 파일을 삭제한다.
+        for mtime, size, file_path in sorted(files, reverse=True):
+            if self._is_expired(mtime) or total_size + size > self.max_disk_bytes:
+                if self._remove_file(file_path):
+                    removed += 1
+                continue
+            total_size += size
+
+        self.evicted += removed
+        return removed
+
+    def _remove_file(self, file_path: str) -> bool:
+        try:
+            os.remove(file_path)
+            return True
+        except OSError:
+            return False
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            'memory_entries': len(self._memory),
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'evicted': self.evicted,
+            'hit_ratio': round(hits / total, 3) if total else 0.0,
+        }
+
+
+cry_inspect_cache = CryInspectCache(CRY_INSPECT_LOG_DIR)
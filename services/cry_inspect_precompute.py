@@ -0,0 +1,172 @@
+# services/cry_inspect_precompute.py
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from core.env import env
+from db import SessionLocal
+from log import logger
+from model.cry_rollup import CryRollupHourlyTable
+from enums.cry_inspect import CRY_INSPECT_WINDOW_DELTAS, CryInspectResolutionEnum
+from services.cry import cry_service
+from services.cry_rollup import select_resolution
+from services.scheduler_run import claim_scheduler_run
+
+
+class CryInspectPrecomputer:
+    """
+    한가한 시간대(CRY_INSPECT_PRECOMPUTE_HOUR 시)에 최근 활동한 반려동물의 분석 결과를 미리 계산해
+    cry_inspect_cache에 넣어 두는 스케줄러.
+    정해진 기간의 캐시 키는 날짜 단위이므로 자정 이후에 실행하면 그날 아침의 첫 요청부터 캐시를 사용한다.
+    시간 단위로 집계하는 기간(24h)은 키가 매시간 바뀌므로 미리 계산하지 않는다.
+    스케줄러는 uvicorn 워커마다 돌지만 예약 시각마다 한 프로세스만 실행한다. (scheduler_run 테이블)
+    """
+
+    def __init__(self):
+        # 음수이면 스케줄러를 실행하지 않는다.
+        self.hour = int(env.get("CRY_INSPECT_PRECOMPUTE_HOUR", 4))
+        self.windows = [window.strip() for window in
+                        env.get("CRY_INSPECT_PRECOMPUTE_WINDOWS", "7d,30d,90d").split(",") if window.strip()]
+        self.active_days = int(env.get("CRY_INSPECT_PRECOMPUTE_ACTIVE_DAYS", 14))
+        self.concurrency = max(1, int(env.get("CRY_INSPECT_PRECOMPUTE_CONCURRENCY", 2)))
+        # 한 번의 집계 쿼리로 처리할 반려동물 수
+        self.batch_size = max(1, int(env.get("CRY_INSPECT_PRECOMPUTE_BATCH", 64)))
+        self._task: Optional[asyncio.Task] = None
+
+        self.runs = 0
+        # 다른 프로세스가 먼저 실행해 건너뛴 횟수
+        self.runs_skipped = 0
+        self.running = False
+        self.next_run_at: Optional[datetime] = None
+        self.last_started_at: Optional[datetime] = None
+        self.last_duration = 0.0
+        self.pets_total = 0
+        self.batches_total = 0
+        self.batches_done = 0
+        self.batches_failed = 0
+        self.results_computed = 0
+
+    def _precompute_windows(self) -> List[str]:
+        windows = []
+        for window in self.windows:
+            delta = CRY_INSPECT_WINDOW_DELTAS.get(window)
+            if delta is None:
+                logger.warning(f"Unknown inspect precompute window: {window}")
+                continue
+            end = datetime.now()
+            if select_resolution(end - delta, end) == CryInspectResolutionEnum.HOUR.value:
+                continue
+            windows.append(window)
+        return windows
+
+    async def start(self) -> None:
+        if self.hour < 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._schedule())
+        logger.info(f"Scheduled inspect precompute at {self.hour:02d}:00 for windows {', '.join(self.windows)}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def _next_run(self, now: datetime) -> datetime:
+        next_run = now.replace(hour=self.hour % 24, minute=0, second=0, microsecond=0)
+        return next_run if next_run > now else next_run + timedelta(days=1)
+
+    async def _schedule(self) -> None:
+        while True:
+            self.next_run_at = self._next_run(datetime.now())
+            await asyncio.sleep((self.next_run_at - datetime.now()).total_seconds())
+            try:
+                if not await asyncio.to_thread(claim_scheduler_run, "cry_inspect_precompute", self.next_run_at):
+                    self.runs_skipped += 1
+                    continue
+                await self.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Inspect precompute failed: {e}", exc_info=True)
+
+    def _get_active_pet_ids(self) -> List[int]:
+        since = (datetime.now() - timedelta(days=self.active_days)).date()
+        db = SessionLocal()
+        try:
+            return list(db.execute(
+                select(CryRollupHourlyTable.pet_id).where(
+                    CryRollupHourlyTable.day >= since).distinct().order_by(CryRollupHourlyTable.pet_id)
+            ).scalars())
+        finally:
+            db.close()
+
+    def _compute(self, pet_ids: List[int], window: str) -> int:
+        db = SessionLocal()
+        try:
+            results = cry_service._inspect_pets(db, pet_ids, window, None, None, None)
+            return sum(result is not None for result in results.values())
+        finally:
+            db.close()
+
+    async def run(self) -> None:
+        """최근 활동한 반려동물의 분석 결과를 기간별로 계산해 캐시에 저장한다."""
+        if self.running:
+            return
+        self.running = True
+        started = time.perf_counter()
+        self.last_started_at = datetime.now()
+        try:
+            pet_ids = await asyncio.to_thread(self._get_active_pet_ids)
+            windows = self._precompute_windows()
+            batches = [(pet_ids[i:i + self.batch_size], window)
+                       for window in windows for i in range(0, len(pet_ids), self.batch_size)]
+            self.pets_total = len(pet_ids)
+            self.batches_total = len(batches)
+            self.batches_done = 0
+            self.batches_failed = 0
+            self.results_computed = 0
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def compute(batch: List[int], window: str) -> None:
+                async with semaphore:
+                    try:
+                        self.results_computed += await asyncio.to_thread(self._compute, batch, window)
+                    except Exception as e:
+                        self.batches_failed += 1
+                        logger.error(f"Inspect precompute for {window} failed: {e}")
+                    finally:
+                        self.batches_done += 1
+
+            await asyncio.gather(*(compute(batch, window) for batch, window in batches))
+        finally:
+            self.running = False
+            self.runs += 1
+            self.last_duration = time.perf_counter() - started
+
+        logger.info(f"Precomputed {self.results_computed} inspect results for {self.pets_total} pets "
+                    f"in {self.last_duration:.1f}s")
+
+    def stats(self) -> dict:
+        return {
+            'hour': self.hour,
+            'windows': self._precompute_windows(),
+            'runs': self.runs,
+            'runs_skipped': self.runs_skipped,
+            'running': self.running,
+            'next_run_at': self.next_run_at.isoformat() if self.next_run_at else None,
+            'last_started_at': self.last_started_at.isoformat() if self.last_started_at else None,
+            'last_duration_seconds': round(self.last_duration, 3),
+            'pets': self.pets_total,
+            'batches': self.batches_total,
+            'batches_done': self.batches_done,
+            'batches_failed': self.batches_failed,
+            'results_computed': self.results_computed,
+        }
+
+
+cry_inspect_precomputer = CryInspectPrecomputer()
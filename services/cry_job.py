@@ -0,0 +1,102 @@
+# services/cry_job.py
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import Optional
+import uuid
+
+from schemas.cry import CryJob
+from model.cry import CryTable
+from model.cry_job import CryJobTable
+from enums.cry_job_status import CryJobStatusEnum
+from error.exceptions import CryJobNotFoundError
+from utils.converters import cry_job_table_to_schema, cry_table_to_schema
+
+
+class CryJobService:
+    def enqueue(self, db: Session, pet_id: int, user_id: str, time: datetime, audio_id: str, digest: str) -> CryJob:
+        cry_job_table = CryJobTable(
+            id=uuid.uuid4().hex,
+            pet_id=pet_id,
+            user_id=user_id,
+            status=CryJobStatusEnum.PENDING.value,
+            time=time,
+            audioId=audio_id,
+            digest=digest,
+        )
+        db.add(cry_job_table)
+        db.commit()
+
+        return cry_job_table_to_schema(cry_job_table)
+
+    def get_job(self, db: Session, job_id: str, user_id: str) -> CryJob:
+        cry_job_table = db.query(CryJobTable).filter(
+            CryJobTable.id == job_id,
+            CryJobTable.user_id == user_id
+        ).first()
+        if not cry_job_table:
+            raise CryJobNotFoundError(f"Job with id {job_id} not found")
+
+        cry = None
+        if cry_job_table.cry_id is not None:
+            cry_table = db.get(CryTable, cry_job_table.cry_id)
+            if cry_table:
+                cry = cry_table_to_schema(cry_table).to_korean()
+        return cry_job_table_to_schema(cry_job_table, cry)
+
+    def claim_next(self, db: Session) -> Optional[CryJobTable]:
+        """
+        가장 오래된 대기 작업 하나를 running 상태로 바꾸고 반환한다.
+        한 번의 UPDATE로 상태를 바꾸므로 여러 워커 프로세스가 같은 작업을 가져가지 않는다.
+        """
+        next_job_id = select(CryJobTable.id).filter(
+            CryJobTable.status == CryJobStatusEnum.PENDING.value
+        ).order_by(CryJobTable.created_at).limit(1).scalar_subquery()
+
+        job_id = db.execute(
+            update(CryJobTable)
+            .where(CryJobTable.id == next_job_id,
+                   CryJobTable.status == CryJobStatusEnum.PENDING.value)
+            .values(status=CryJobStatusEnum.RUNNING.value,
+                    attempts=CryJobTable.attempts + 1,
+                    updated_at=datetime.now())
+            .returning(CryJobTable.id)
+        ).scalar()
+        db.commit()
+
+        if job_id is None:
+            return None
+        return db.get(CryJobTable, job_id)
+
+    def complete(self, db: Session, job_id: str, cry_id: int) -> None:
+        db.execute(
+            update(CryJobTable)
+            .where(CryJobTable.id == job_id)
+            .values(status=CryJobStatusEnum.DONE.value, cry_id=cry_id,
+                    error=None, updated_at=datetime.now())
+        )
+        db.commit()
+
+    def fail(self, db: Session, job_id: str, error: str, retry: bool) -> None:
+        status = CryJobStatusEnum.PENDING if retry else CryJobStatusEnum.FAILED
+        db.execute(
+            update(CryJobTable)
+            .where(CryJobTable.id == job_id)
+            .values(status=status.value, error=error, updated_at=datetime.now())
+        )
+        db.commit()
+
+    def requeue_stale(self, db: Session, stale_after: timedelta) -> int:
+        """워커가 비정상 종료되어 running 상태로 남은 작업을 다시 대기 상태로 돌린다."""
+        result = db.execute(
+            update(CryJobTable)
+            .where(CryJobTable.status == CryJobStatusEnum.RUNNING.value,
+                   CryJobTable.updated_at < datetime.now() - stale_after)
+            .values(status=CryJobStatusEnum.PENDING.value,
+                    updated_at=datetime.now())
+        )
+        db.commit()
+        return result.rowcount
+
+
+cry_job_service = CryJobService()
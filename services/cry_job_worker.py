@@ -0,0 +1,103 @@
+# services/cry_job_worker.py
+import asyncio
+from datetime import timedelta
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.env import env
+from db import AsyncSessionLocal
+from log import logger
+from model.cry_job import CryJobTable
+from error.exceptions import AiServerError
+from services.cry import cry_service
+from services.cry_job import cry_job_service
+from services.cry_storage import cry_audio_storage
+
+
+class CryJobWorkerPool:
+    """
+    DB에 저장된 울음 분석 작업을 처리하는 워커 풀.
+    웹 서버 안에서 실행하거나 cry_worker.py로 별도 프로세스에서 실행할 수 있다.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.poll_interval = float(env.get("CRY_JOB_POLL_INTERVAL", 1.0))
+        self.max_attempts = int(env.get("CRY_JOB_MAX_ATTEMPTS", 3))
+        self.stale_after = timedelta(
+            seconds=float(env.get("CRY_JOB_STALE_SECONDS", 300)))
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    async def start(self) -> None:
+        if self.size <= 0 or self._tasks:
+            return
+
+        async with AsyncSessionLocal() as db:
+            requeued = await db.run_sync(cry_job_service.requeue_stale, self.stale_after)
+        if requeued:
+            logger.info(f"Requeued {requeued} stale cry jobs")
+
+        self._tasks = [asyncio.create_task(self._work(index))
+                       for index in range(self.size)]
+        logger.info(f"Started {self.size} cry job workers")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """새 작업이 등록되었음을 같은 프로세스의 워커에게 알린다."""
+        self._wakeup.set()
+
+    async def _work(self, index: int) -> None:
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    cry_job_table = await db.run_sync(cry_job_service.claim_next)
+                    if cry_job_table is not None:
+                        # 실패 시 rollback이 작업 객체를 만료시켜 다시 읽지 않도록 세션에서 분리한다.
+                        db.expunge(cry_job_table)
+                        await self._process(db, cry_job_table)
+                        continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cry job worker {index} failed: {e}", exc_info=True)
+
+            # 대기 작업이 없으면 알림이 오거나 poll_interval이 지날 때까지 쉰다.
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _process(self, db: AsyncSession, cry_job_table: CryJobTable) -> None:
+        try:
+            pet = await db.run_sync(
+                cry_service._get_user_pet, cry_job_table.pet_id, cry_job_table.user_id)
+            if not pet:
+                raise ValueError(
+                    f"Pet {cry_job_table.pet_id} is no longer owned by the user")
+
+            cry = await cry_service.process_prediction(
+                db, pet, cry_job_table.time, cry_job_table.audioId,
+                cry_job_table.digest, cry_job_table.user_id)
+        except Exception as e:
+            await db.rollback()
+            # AI 서버 오류는 최대 시도 횟수까지 다시 대기열에 넣는다.
+            retry = isinstance(e, AiServerError) and \
+                cry_job_table.attempts < self.max_attempts
+            await db.run_sync(cry_job_service.fail, cry_job_table.id, str(e), retry)
+            if not retry:
+                cry_audio_storage.discard(cry_job_table.audioId)
+            logger.error(
+                f"Cry job {cry_job_table.id} failed (attempt {cry_job_table.attempts}): {e}")
+            return
+
+        await db.run_sync(cry_job_service.complete, cry_job_table.id, cry.id)
+
+
+cry_job_workers = CryJobWorkerPool(int(env.get("CRY_JOB_WORKERS", 1)))
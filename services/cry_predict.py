@@ -1,12 +1,48 @@
-import os
-from typing import Dict
-import requests
+import asyncio
+import random
+import time
+from contextlib import ExitStack
+from typing import Dict, List, Optional
+import httpx
 
-from constants.path import ASSET_DIR
 from enums.cry_state import allowed_cry_state_en, allowed_cat_cry_state_en, allowed_dog_cry_state_en
+from error.exceptions import AiServerError
+from services.ai_router import Replica, ReplicaRouter, ai_routers
 from core.env import env
+from log import logger
+
+# AI 서버 응답 중 재시도할 상태 코드
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
 
 class CryPredictService:
+    def __init__(self):
+        self.client: Optional[httpx.AsyncClient] = None
+        self.max_connections = int(env.get("AI_SERVER_MAX_CONNECTIONS", 20))
+        self.max_keepalive = int(env.get("AI_SERVER_MAX_KEEPALIVE", 10))
+        self.connect_timeout = float(env.get("AI_SERVER_CONNECT_TIMEOUT", 3.0))
+        self.read_timeout = float(env.get("AI_SERVER_READ_TIMEOUT", 30.0))
+        self.max_retries = int(env.get("AI_SERVER_MAX_RETRIES", 2))
+        self.backoff = float(env.get("AI_SERVER_RETRY_BACKOFF", 0.2))
+
+    async def startup(self) -> None:
+        """앱 시작 시 AI 서버와의 커넥션 풀을 생성한다."""
+        if self.client is not None:
+            return
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive),
+            timeout=httpx.Timeout(
+                self.read_timeout, connect=self.connect_timeout),
+        )
+
+    async def shutdown(self) -> None:
+        """앱 종료 시 커넥션 풀을 정리한다."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
     def get_cry_classes(self, species):
         if species == 'dog':
             return allowed_dog_cry_state_en
@@ -15,18 +51,140 @@ class CryPredictService:
         else:
             return allowed_cry_state_en
 
-    async def __call__(self, bytes: bytes, species: str, user_id: str) -> Dict[str, float]:
-        url = env.get("AI_SERVER_API")
+    async def _send(self, router: ReplicaRouter, replica: Replica, open_files, data: dict) -> httpx.Response:
+        replica.outstanding += 1
+        started = time.perf_counter()
+        try:
+            # hedge 요청이 같은 파일 객체를 함께 읽지 않도록 요청마다 파일을 새로 연다.
+            with ExitStack() as stack:
+                response = await self.client.post(
+                    replica.url, files=open_files(stack), data=data)
+        except httpx.TransportError:
+            router.record_failure(replica)
+            raise
+        finally:
+            replica.outstanding -= 1
 
-        files = {'file': ('file.wav', bytes, 'audio/wav')}
-        data = {'user_id': user_id if user_id != "yTKx5CWGvLbjKVCRgve6K5Ne8cv2" else "owner", 'species': species}
+        if response.status_code >= 500 or response.status_code in RETRY_STATUS_CODES:
+            router.record_failure(replica)
+        else:
+            router.record_success(replica, time.perf_counter() - started)
+        return response
 
-        response = requests.post(url, files=files, data=data)
-        response_json = response.json()
+    async def _send_hedged(self, router: ReplicaRouter, open_files, data: dict) -> httpx.Response:
+        """
+        처리 중인 요청이 가장 적은 서버로 보내고, hedge 지연 안에 응답이 없으면 다른 서버로 한 번 더 보낸다.
+        먼저 정상 응답한 쪽을 사용하고 나머지 요청은 취소한다.
+        """
+        primary = router.pick()
+        tasks = [asyncio.create_task(self._send(router, primary, open_files, data))]
+
+        delay = router.hedge_delay()
+        if delay is not None:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            secondary = None if done else router.pick(exclude=[primary])
+            if secondary is not None:
+                router.hedged += 1
+                tasks.append(asyncio.create_task(
+                    self._send(router, secondary, open_files, data)))
+
+        response, error = None, None
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        response = task.result()
+                    except httpx.TransportError as e:
+                        error = e
+                        continue
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        if task is not tasks[0]:
+                            router.hedge_wins += 1
+                        return response
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if response is not None:
+            return response
+        raise error
+
+    async def _post(self, router: Optional[ReplicaRouter], open_files, data: dict) -> httpx.Response:
+        if router is None:
+            raise AiServerError("AI server is not configured")
+        if self.client is None:
+            await self.startup()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self._send_hedged(router, open_files, data)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response
+                error = f"AI server responded with {response.status_code}"
+            except httpx.TransportError as e:
+                error = f"AI server request failed: {e!r}"
+            except httpx.HTTPStatusError as e:
+                raise AiServerError(
+                    f"AI server responded with {e.response.status_code}")
+
+            if attempt < self.max_retries:
+                # 지수 백오프 + jitter
+                delay = self.backoff * (2 ** attempt)
+                delay += random.uniform(0, delay)
+                logger.warning(
+                    f"{error}, retrying in {delay:.2f}s ({attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(delay)
+
+        raise AiServerError(error)
+
+    def has_batch_api(self, species: str) -> bool:
+        return ai_routers.get("AI_SERVER_BATCH_API", species) is not None
+
+    def stats(self) -> List[dict]:
+        return ai_routers.stats()
+
+    def _get_request_user_id(self, user_id: str) -> str:
+        return user_id if user_id != "yTKx5CWGvLbjKVCRgve6K5Ne8cv2" else "owner"
+
+    def _rename_classes(self, response_json: dict) -> Dict[str, float]:
         response_json['sad'] = response_json.pop('whining')
         response_json['happy'] = response_json.pop('relax')
         response_json['anger'] = response_json.pop('hostile')
-
         return response_json
 
-cry_predict = CryPredictService()
\ No newline at end of file
+    async def __call__(self, file_path: str, species: str, user_id: str) -> Dict[str, float]:
+        router = ai_routers.get("AI_SERVER_API", species)
+        data = {'user_id': self._get_request_user_id(user_id), 'species': species}
+
+        # 파일 객체를 넘기면 httpx가 디스크에서 chunk 단위로 읽어 전송한다.
+        def open_files(stack: ExitStack):
+            return {'file': ('file.wav', stack.enter_context(open(file_path, 'rb')), 'audio/wav')}
+
+        response = await self._post(router, open_files, data)
+        return self._rename_classes(response.json())
+
+    async def predict_batch(self, file_paths: List[str], species: str, user_ids: List[str]) -> List[Dict[str, float]]:
+        """
+        같은 종의 여러 울음을 AI 서버의 배치 API로 한 번에 분석한다.
+        응답은 요청한 파일 순서대로 predictMap 리스트여야 한다.
+        """
+        router = ai_routers.get("AI_SERVER_BATCH_API", species)
+        data = {'user_id': [self._get_request_user_id(user_id) for user_id in user_ids],
+                'species': species}
+
+        def open_files(stack: ExitStack):
+            return [('files', (f'file{i}.wav', stack.enter_context(open(file_path, 'rb')), 'audio/wav'))
+                    for i, file_path in enumerate(file_paths)]
+
+        response = await self._post(router, open_files, data)
+        response_json = response.json()
+        if not isinstance(response_json, list) or len(response_json) != len(file_paths):
+            raise AiServerError(
+                f"AI server returned an unexpected result for a batch of {len(file_paths)}")
+
+        return [self._rename_classes(result) for result in response_json]
+
+cry_predict = CryPredictService()
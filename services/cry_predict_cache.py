@@ -0,0 +1,141 @@
+# services/cry_predict_cache.py
+import os
+import json
+import time
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from core.env import env
+from constants.path import CRY_PREDICT_CACHE_DIR
+from log import logger
+
+TMP_SUFFIX = '.tmp'
+# 이보다 오래된 임시 파일은 쓰던 프로세스가 죽어 남은 것으로 보고 지운다.
+TMP_MAX_AGE_SECONDS = 3600
+
+
+class CryPredictCache:
+    """
+    wav 내용의 해시와 종(species)을 키로 하는 predictMap 캐시.
+    메모리 LRU 캐시와 디스크 캐시 2단으로 구성되며, 두 단계 모두 TTL이 지나면 만료된다.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.max_entries = int(env.get("CRY_PREDICT_CACHE_SIZE", 1024))
+        self.ttl = float(env.get("CRY_PREDICT_CACHE_TTL_HOURS", 24 * 7)) * 3600
+        self._memory: OrderedDict[str, Tuple[float, Dict[str, float]]] = OrderedDict()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _make_key(self, digest: str, species: str) -> str:
+        return f"{species}_{digest}"
+
+    def _disk_path(self, digest: str, key: str) -> str:
+        # 한 디렉토리에 파일이 몰리지 않도록 해시 앞 두 글자로 나눈다.
+        return os.path.join(self.cache_dir, digest[:2], f"{key}.json")
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return time.time() - stored_at > self.ttl
+
+    def _remember(self, key: str, stored_at: float, predict_map: Dict[str, float]) -> None:
+        self._memory[key] = (stored_at, predict_map)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, digest: str, species: str) -> Optional[Dict[str, float]]:
+        key = self._make_key(digest, species)
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            stored_at, predict_map = entry
+            if not self._is_expired(stored_at):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return dict(predict_map)
+            del self._memory[key]
+
+        file_path = self._disk_path(digest, key)
+        try:
+            with open(file_path, 'r') as f:
+                entry = json.loads(f.read())
+        except (OSError, ValueError):
+            entry = None
+
+        if entry is not None:
+            if not self._is_expired(entry['stored_at']):
+                self._remember(key, entry['stored_at'], entry['predictMap'])
+                self.disk_hits += 1
+                return dict(entry['predictMap'])
+            self._remove_file(file_path)
+
+        self.misses += 1
+        return None
+
+    def set(self, digest: str, species: str, predict_map: Dict[str, float]) -> None:
+        key = self._make_key(digest, species)
+        stored_at = time.time()
+        self._remember(key, stored_at, dict(predict_map))
+
+        file_path = self._disk_path(digest, key)
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            # 같은 wav를 여러 스레드/프로세스가 동시에 저장해도 섞이지 않도록 쓰는 쪽마다 임시 파일을 따로 만든다.
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(file_path), prefix=f"{key}.", suffix=TMP_SUFFIX)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(json.dumps(
+                        {'stored_at': stored_at, 'predictMap': predict_map}))
+                os.replace(tmp_path, file_path)
+            except OSError:
+                self._remove_file(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to persist predict cache entry {key}: {e}")
+
+    def evict_expired(self) -> int:
+        """
+        만료된 디스크 캐시 파일을 삭제하고 삭제한 개수를 반환한다.
+        임시 파일은 다른 프로세스가 쓰는 중일 수 있으므로 TMP_MAX_AGE_SECONDS가 지난 것만 지운다.
+        """
+        removed = 0
+        for dir_path, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                file_path = os.path.join(dir_path, filename)
+                try:
+                    mtime = os.path.getmtime(file_path)
+                except OSError:
+                    continue
+                if filename.endswith(TMP_SUFFIX):
+                    expired = time.time() - mtime > TMP_MAX_AGE_SECONDS
+                else:
+                    expired = self._is_expired(mtime)
+                if expired and self._remove_file(file_path):
+                    removed += 1
+        return removed
+
+    def _remove_file(self, file_path: str) -> bool:
+        try:
+            os.remove(file_path)
+            return True
+        except OSError:
+            return False
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            'memory_entries': len(self._memory),
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_ratio': round(hits / total, 3) if total else 0.0,
+        }
+
+
+cry_predict_cache = CryPredictCache(CRY_PREDICT_CACHE_DIR)
@@ -0,0 +1,168 @@
+# services/cry_rollup.py
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List
+from sqlalchemy import Integer, String, cast, delete, func, select, tuple_, type_coerce, union_all
+from sqlalchemy.orm import Session
+
+from model.cry import CryTable
+from model.cry_rollup import CryRollupHourlyTable, CryRollupWeeklyTable
+from model.cry_version import CryVersionTable
+from enums.cry_inspect import CryInspectResolutionEnum
+
+# 분석 기간이 이 값 이하이면 시간 단위, 다음 값 이하이면 일 단위, 그보다 길면 주 단위로 나눈다.
+HOUR_RESOLUTION_MAX_SPAN = timedelta(days=2)
+DAY_RESOLUTION_MAX_SPAN = timedelta(days=92)
+
+
+@dataclass
+class CrySummary:
+    """기간 내 울음의 시간대/날짜/원인별 집계. 날짜별 빈도는 resolution 단위로 나눈다."""
+    resolution: str = CryInspectResolutionEnum.DAY.value
+    total: int = 0
+    hour_counts: Counter = field(default_factory=Counter)
+    date_counts: Counter = field(default_factory=Counter)
+    state_counts: Counter = field(default_factory=Counter)
+    state_duration_sum: Dict[str, float] = field(default_factory=dict)
+    state_duration_count: Counter = field(default_factory=Counter)
+
+    def add(self, day: date, hour: int, state: str, count: int, duration_sum: float, duration_count: int) -> None:
+        self.total += count
+        self.hour_counts[hour] += count
+        self.date_counts[self._bucket(day, hour)] += count
+        self.state_counts[state] += count
+        self.state_duration_sum[state] = self.state_duration_sum.get(state, 0.0) + duration_sum
+        self.state_duration_count[state] += duration_count
+
+    def _bucket(self, day: date, hour: int) -> date:
+        if self.resolution == CryInspectResolutionEnum.HOUR.value:
+            return datetime.combine(day, time(hour))
+        if self.resolution == CryInspectResolutionEnum.WEEK.value:
+            return day - timedelta(days=day.weekday())
+        return day
+
+    def mean_durations(self) -> Dict[str, float]:
+        return {state: self.state_duration_sum[state] / count
+                for state, count in self.state_duration_count.items() if count > 0}
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floor = _floor_hour(value)
+    return floor if floor == value else floor + timedelta(hours=1)
+
+
+def _floor_week(value: datetime) -> datetime:
+    return datetime.combine(value.date() - timedelta(days=value.weekday()), time())
+
+
+def _ceil_week(value: datetime) -> datetime:
+    floor = _floor_week(value)
+    return floor if floor == value else floor + timedelta(weeks=1)
+
+
+def select_resolution(start: datetime, end: datetime) -> str:
+    span = end - start
+    if span <= HOUR_RESOLUTION_MAX_SPAN:
+        return CryInspectResolutionEnum.HOUR.value
+    if span <= DAY_RESOLUTION_MAX_SPAN:
+        return CryInspectResolutionEnum.DAY.value
+    return CryInspectResolutionEnum.WEEK.value
+
+
+class CryRollupService:
+    def remove_pet(self, db: Session, pet_id: int) -> None:
+        """
+        삭제할 반려동물의 롤업과 버전을 지운다. (commit은 호출한 쪽에서 한다)
+        보관된 울음의 롤업과 버전은 cry 삭제 트리거로 지워지지 않고, 반려동물 id는 다시 쓰일 수 있으므로
+        남겨 두면 같은 id로 새로 만든 반려동물의 분석 결과에 섞인다.
+        """
+        for table in (CryRollupHourlyTable, CryRollupWeeklyTable, CryVersionTable):
+            db.execute(delete(table).where(table.pet_id == pet_id))
+
+    def summarize(self, db: Session, pet_ids: List[int], start: datetime, end: datetime,
+                  resolution: str = CryInspectResolutionEnum.DAY.value) -> Dict[int, CrySummary]:
+        """
+        반려동물별로 start <= time <= end 인 울음을 집계한다.
+        온전히 포함되는 주는 cry_rollup_weekly(주 단위 집계일 때만), 온전히 포함되는 시간대는
+        cry_rollup_hourly에서 읽고, 앞뒤의 걸친 시간대만 cry 테이블에서 읽는다.
+        모든 반려동물과 구간을 UNION ALL로 묶어 한 번의 쿼리로 가져온다.
+        """
+        summaries = {pet_id: CrySummary(resolution=resolution) for pet_id in pet_ids}
+        if not pet_ids:
+            return summaries
+
+        parts = self._plan(pet_ids, start, end, resolution)
+        query = parts[0] if len(parts) == 1 else union_all(*parts)
+        for pet_id, day, hour, state, count, duration_sum, duration_count in db.execute(query):
+            summaries[pet_id].add(date.fromisoformat(day), hour, state,
+                                  count, duration_sum, duration_count)
+        return summaries
+
+    def _plan(self, pet_ids: List[int], start: datetime, end: datetime, resolution: str) -> list:
+        first_hour = _ceil_hour(start)
+        last_hour = _floor_hour(end)
+        if first_hour >= last_hour:
+            return [self._raw_part(pet_ids, start, end)]
+
+        parts = [self._raw_part(pet_ids, start, first_hour, include_end=False),
+                 self._raw_part(pet_ids, last_hour, end)]
+
+        if resolution == CryInspectResolutionEnum.WEEK.value:
+            first_week = _ceil_week(first_hour)
+            last_week = _floor_week(last_hour)
+            if first_week < last_week:
+                parts.append(self._weekly_part(pet_ids, first_week, last_week))
+                parts.append(self._hourly_part(pet_ids, first_hour, first_week))
+                parts.append(self._hourly_part(pet_ids, last_week, last_hour))
+                return parts
+
+        parts.append(self._hourly_part(pet_ids, first_hour, last_hour))
+        return parts
+
+    def _weekly_part(self, pet_ids: List[int], start: datetime, end: datetime):
+        """[start, end) 의 주 단위 롤업. start, end는 월요일 0시"""
+        return select(
+            CryRollupWeeklyTable.pet_id, type_coerce(CryRollupWeeklyTable.week, String),
+            CryRollupWeeklyTable.hour, CryRollupWeeklyTable.state, CryRollupWeeklyTable.count,
+            CryRollupWeeklyTable.duration_sum, CryRollupWeeklyTable.duration_count
+        ).where(
+            CryRollupWeeklyTable.pet_id.in_(pet_ids),
+            CryRollupWeeklyTable.week >= start.date(),
+            CryRollupWeeklyTable.week < end.date()
+        )
+
+    def _hourly_part(self, pet_ids: List[int], start: datetime, end: datetime):
+        """[start, end) 의 시간 단위 롤업. start, end는 정각"""
+        return select(
+            CryRollupHourlyTable.pet_id, type_coerce(CryRollupHourlyTable.day, String),
+            CryRollupHourlyTable.hour, CryRollupHourlyTable.state, CryRollupHourlyTable.count,
+            CryRollupHourlyTable.duration_sum, CryRollupHourlyTable.duration_count
+        ).where(
+            CryRollupHourlyTable.pet_id.in_(pet_ids),
+            tuple_(CryRollupHourlyTable.day, CryRollupHourlyTable.hour) >= (
+                start.date(), start.hour),
+            tuple_(CryRollupHourlyTable.day, CryRollupHourlyTable.hour) < (
+                end.date(), end.hour)
+        )
+
+    def _raw_part(self, pet_ids: List[int], start: datetime, end: datetime, include_end: bool = True):
+        """롤업에 온전히 들어가지 않는 구간은 cry 테이블에서 같은 형태로 집계한다."""
+        day = func.date(CryTable.time)
+        hour = cast(func.strftime('%H', CryTable.time), Integer)
+        return select(
+            CryTable.pet_id, day, hour, CryTable.state,
+            func.count(), func.coalesce(func.sum(CryTable.duration), 0.0),
+            func.count(CryTable.duration)
+        ).where(
+            CryTable.pet_id.in_(pet_ids),
+            CryTable.time >= start,
+            CryTable.time <= end if include_end else CryTable.time < end
+        ).group_by(CryTable.pet_id, day, hour, CryTable.state)
+
+
+cry_rollup_service = CryRollupService()
@@ -0,0 +1,101 @@
+# services/cry_storage.py
+import os
+import asyncio
+import hashlib
+import uuid
+from datetime import datetime
+import soundfile as sf
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from model.cry_audio import CryAudioTable
+from constants.path import CRY_DATASET_DIR, CRY_SPOOL_DIR
+from utils.upload import UPLOAD_CHUNK_SIZE
+
+# wav subtype -> 무손실로 저장할 수 있는 FLAC subtype
+FLAC_SUBTYPES = {
+    'PCM_U8': 'PCM_S8',
+    'PCM_S8': 'PCM_S8',
+    'PCM_16': 'PCM_16',
+    'PCM_24': 'PCM_24',
+}
+
+
+class CryAudioStorage:
+    """
+    울음 오디오 저장소.
+    업로드는 spool 디렉토리에 wav로 저장되고, 분석이 끝나면 FLAC으로 무손실 압축되어
+    audioId 해시로 나눈 하위 디렉토리에 저장된다. 위치는 cry_audio 테이블에 기록한다.
+    """
+
+    def __init__(self, root_dir: str, spool_dir: str):
+        self.root_dir = root_dir
+        self.spool_dir = spool_dir
+
+    def new_audio_id(self, pet_id: int, curtime: datetime) -> str:
+        # 같은 초에 들어온 업로드도 겹치지 않도록 임의의 suffix를 붙인다.
+        timestamp = curtime.strftime("%Y%m%d-%H%M%S")
+        return f'{pet_id}_{timestamp}_{uuid.uuid4().hex[:8]}'
+
+    def spool_path(self, audio_id: str) -> str:
+        return os.path.join(self.spool_dir, f"{audio_id}.wav")
+
+    def _shard_path(self, audio_id: str, extension: str) -> str:
+        digest = hashlib.sha1(audio_id.encode()).hexdigest()
+        return os.path.join(digest[:2], digest[2:4], f"{audio_id}.{extension}")
+
+    def _compress(self, spool_path: str, file_path: str, subtype: str) -> None:
+        info = sf.info(spool_path)
+        tmp_path = f"{file_path}.tmp"
+        # int32로 읽고 쓰면 libsndfile이 비트 깊이만 맞추므로 샘플 값이 그대로 보존된다.
+        with sf.SoundFile(tmp_path, 'w', samplerate=info.samplerate, channels=info.channels,
+                          subtype=subtype, format='FLAC') as out:
+            for block in sf.blocks(spool_path, blocksize=UPLOAD_CHUNK_SIZE, dtype='int32', always_2d=True):
+                out.write(block)
+        os.replace(tmp_path, file_path)
+
+    def _move_to_shard(self, audio_id: str):
+        spool_path = self.spool_path(audio_id)
+        subtype = FLAC_SUBTYPES.get(sf.info(spool_path).subtype)
+        codec = 'flac' if subtype else 'wav'
+
+        relative_path = self._shard_path(audio_id, codec)
+        file_path = os.path.join(self.root_dir, relative_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        if subtype:
+            self._compress(spool_path, file_path, subtype)
+            os.remove(spool_path)
+        else:
+            os.replace(spool_path, file_path)
+        return relative_path, codec, os.path.getsize(file_path)
+
+    async def store(self, db: AsyncSession, audio_id: str, pet_id: int, digest: str) -> CryAudioTable:
+        """
+        spool 된 wav를 샤드 디렉토리로 옮기고 인덱스를 추가한다. (commit은 호출한 쪽에서 수행)
+        FLAC으로 무손실 표현할 수 없는 형식(32bit, float)은 wav 그대로 옮긴다.
+        """
+        relative_path, codec, size = await asyncio.to_thread(self._move_to_shard, audio_id)
+
+        cry_audio_table = CryAudioTable(
+            audioId=audio_id,
+            pet_id=pet_id,
+            path=relative_path,
+            codec=codec,
+            size=size,
+            sha256=digest,
+        )
+        db.add(cry_audio_table)
+        return cry_audio_table
+
+    def discard(self, audio_id: str) -> None:
+        """분석에 실패한 업로드의 spool 파일과 이미 옮겨진 파일을 삭제한다."""
+        spool_path = self.spool_path(audio_id)
+        if os.path.exists(spool_path):
+            os.remove(spool_path)
+        for codec in ('flac', 'wav'):
+            file_path = os.path.join(
+                self.root_dir, self._shard_path(audio_id, codec))
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+
+cry_audio_storage = CryAudioStorage(CRY_DATASET_DIR, CRY_SPOOL_DIR)
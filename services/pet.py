@@ -1,17 +1,26 @@
 # services/pet.py
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 from fastapi import UploadFile
 from PIL import Image
 import os
+import asyncio
 
 from schemas.pet import *
 from model.pet import PetTable
+from model.cry import CryTable
 from enums.species import SpeciesEnum, SPECIES_KR_TO_EN
 from error.exceptions import (
     NegativeAgeError, PetNotFoundError, WrongFileTypeError)
 from utils.converters import pet_table_to_schema
 from constants.path import PET_PROFILE_DIR
+from db import async_variant
+from services.pet_ownership import PetOwner, pet_ownership_cache
+from services.cry_archive import cry_archive_service
+from services.cry_inspect_cache import cry_inspect_cache
+from services.cry_rollup import cry_rollup_service
 
 
 class PetService:
@@ -22,13 +31,14 @@ class PetService:
         if create_pet_input.age < 0:
             raise NegativeAgeError("Age cannot be negative")
 
-        pet_table = PetTable.create(
-            user_id, create_pet_input.model_dump(exclude={'user_id'}))
-        db.add(pet_table)
+        # INSERT ... RETURNING으로 저장된 행을 바로 받는다. (commit 후 refresh로 다시 조회하지 않는다)
+        pet_table = db.scalar(insert(PetTable).values(**PetTable.create_values(
+            user_id, create_pet_input.model_dump(exclude={'user_id'}))).returning(PetTable))
+        pet = pet_table_to_schema(pet_table)
         db.commit()
-        db.refresh(pet_table)
+        pet_ownership_cache.remember(PetOwner(pet.id, pet.user_id, pet.species))
 
-        return pet_table_to_schema(pet_table)
+        return pet
 
     def get_pet_by_id(self, db: Session, pet_id: int, user_id: str) -> Pet:
         pet_table = self._get_pet_by_id(db, pet_id, user_id)
@@ -42,32 +52,50 @@ class PetService:
         return [pet_table_to_schema(pet) for pet in pet_tables]
 
     def update_pet(self, db: Session, pet_id: int, update_pet_input: UpdatePetInput, user_id: str) -> Pet:
-        pet_table = self._get_pet_by_id(db, pet_id, user_id)
-        if not pet_table:
-            raise PetNotFoundError(f"Pet with id {pet_id} not found")
-
         if update_pet_input.age is not None and update_pet_input.age < 0:
             raise NegativeAgeError("Age cannot be negative")
 
-        pet_table.update(**update_pet_input.model_dump(exclude_unset=True))
+        values = PetTable.update_values(update_pet_input.model_dump(exclude_unset=True))
+        if not values:
+            return self.get_pet_by_id(db, pet_id, user_id)
+
+        # 소유권 확인과 수정을 UPDATE ... RETURNING 한 문장으로 처리한다.
+        pet_table = db.scalar(
+            update(PetTable).where(PetTable.id == pet_id, PetTable.user_id == user_id)
+            .values(**values).returning(PetTable))
+        if not pet_table:
+            raise PetNotFoundError(f"Pet with id {pet_id} not found")
+        pet = pet_table_to_schema(pet_table)
         db.commit()
-        db.refresh(pet_table)
+        # 종이 바뀌었을 수 있으므로 RETURNING으로 받은 값으로 소유권 캐시를 갱신한다.
+        pet_ownership_cache.remember(PetOwner(pet.id, pet.user_id, pet.species))
 
-        return pet_table_to_schema(pet_table)
+        return pet
 
     def delete_pet(self, db: Session, pet_id: int, user_id: str) -> None:
         pet_table = self._get_pet_by_id(db, pet_id, user_id)
         if not pet_table:
             raise PetNotFoundError(f"Pet with id {pet_id} not found")
 
+        # 울음, 보관 목록, 롤업과 버전, 반려동물을 한 트랜잭션에서 지운다.
+        # 울음을 먼저 지워야 외래 키에 걸리지 않는다. (삭제 트리거가 롤업과 버전도 갱신한다)
+        db.execute(delete(CryTable).where(CryTable.pet_id == pet_id))
+        archive_paths = cry_archive_service.remove_pet(db, pet_id)
+        cry_rollup_service.remove_pet(db, pet_id)
         db.delete(pet_table)
         db.commit()
+        pet_ownership_cache.invalidate(pet_id)
+        cry_inspect_cache.invalidate_pet(pet_id)
+        cry_archive_service.remove_files(archive_paths)
 
     def uploadProfileImage(self, file: UploadFile, db: Session, pet_id: int, user_id: str):
         pet_table = self._get_pet_by_id(db, pet_id, user_id)
         if not pet_table:
             raise PetNotFoundError(f"Pet with id {pet_id} not found")
 
+        return self._save_profile_image(file, pet_id)
+
+    def _save_profile_image(self, file: UploadFile, pet_id: int) -> bool:
         # 파일 확장자를 file.filename에서 추출
         filename = file.filename
         if "." in filename:
@@ -94,5 +122,20 @@ class PetService:
 
         return True
 
+    # async 엔드포인트용 (AsyncSession을 받는다)
+    create_pet_async = async_variant(create_pet)
+    get_pet_by_id_async = async_variant(get_pet_by_id)
+    get_all_pets_by_user_async = async_variant(get_all_pets_by_user)
+    update_pet_async = async_variant(update_pet)
+    delete_pet_async = async_variant(delete_pet)
+
+    async def upload_profile_image_async(self, file: UploadFile, db: AsyncSession, pet_id: int, user_id: str) -> bool:
+        pet_table = await db.run_sync(self._get_pet_by_id, pet_id, user_id)
+        if not pet_table:
+            raise PetNotFoundError(f"Pet with id {pet_id} not found")
+
+        # 이미지 변환은 이벤트 루프 밖에서 수행
+        return await asyncio.to_thread(self._save_profile_image, file, pet_id)
+
 
 pet_service = PetService()
@@ -0,0 +1,101 @@
+# services/pet_ownership.py
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from model.pet import PetTable
+from core.env import env
+
+
+@dataclass(frozen=True)
+class PetOwner:
+    """권한 확인과 울음 원인 검사에 필요한 반려동물 정보"""
+    id: int
+    user_id: str
+    species: str
+
+
+class PetOwnershipCache:
+    """
+    반려동물 id -> (소유자, 종) 캐시. 울음 API마다 권한이 없는 요청을 거르고 종을 확인하기 위해 pet 테이블을 다시 조회하지 않도록 한다.
+    같은 프로세스의 반려동물 수정/삭제는 바로 무효화하고, 다른 프로세스에서의 변경은 TTL이 지나면 반영된다.
+    따라서 캐시 적중만으로 권한을 허용하지 않는다. 울음을 읽고 쓰는 쿼리는 SQL 조건(pet.user_id)으로 소유권을 다시 확인하므로
+    다른 프로세스에서 삭제되거나 다른 유저에게 옮겨진 반려동물이 캐시에 남아 있어도 그 울음에 접근할 수 없다.
+    존재하지 않는 반려동물은 나중에 만들어질 수 있으므로 캐시하지 않는다.
+    """
+
+    def __init__(self):
+        self.max_entries = int(env.get("PET_OWNERSHIP_CACHE_SIZE", 100000))
+        # 0이면 캐시를 사용하지 않는다.
+        self.ttl = float(env.get("PET_OWNERSHIP_CACHE_TTL_SECONDS", 300))
+        self._entries: OrderedDict[int, Tuple[float, PetOwner]] = OrderedDict()
+        # 동기 엔드포인트는 스레드 풀에서 실행되므로 접근을 잠근다.
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, pet_id: int) -> Optional[PetOwner]:
+        with self._lock:
+            entry = self._entries.get(pet_id)
+            if entry is None:
+                return None
+            stored_at, owner = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[pet_id]
+                return None
+            self._entries.move_to_end(pet_id)
+            return owner
+
+    def remember(self, owner: PetOwner) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[owner.id] = (time.monotonic(), owner)
+            self._entries.move_to_end(owner.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_user_pet(self, db: Session, pet_id: int, user_id: str) -> Optional[PetOwner]:
+        """유저의 반려동물이면 PetOwner, 아니면 None을 반환한다."""
+        owner = self._lookup(pet_id)
+        if owner is not None and owner.user_id == user_id:
+            self.hits += 1
+            return owner
+
+        # 캐시에 없거나 다른 유저의 반려동물로 기억하고 있으면 (다른 프로세스에서 옮겨졌을 수 있다) 다시 읽는다.
+        self.misses += 1
+        row = db.execute(
+            select(PetTable.id, PetTable.user_id, PetTable.species).where(PetTable.id == pet_id)
+        ).first()
+        if row is None:
+            self.invalidate(pet_id)
+            return None
+        owner = PetOwner(*row)
+        self.remember(owner)
+        return owner if owner.user_id == user_id else None
+
+    def invalidate(self, pet_id: int) -> None:
+        with self._lock:
+            self._entries.pop(pet_id, None)
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            for pet_id in [pet_id for pet_id, (_, owner) in self._entries.items() if owner.user_id == user_id]:
+                del self._entries[pet_id]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+pet_ownership_cache = PetOwnershipCache()
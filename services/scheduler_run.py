@@ -0,0 +1,35 @@
+# services/scheduler_run.py
+import os
+import socket
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert
+
+from db import SessionLocal
+from model.scheduler_run import SchedulerRunTable
+
+# 이보다 오래된 실행 기록은 지운다.
+SCHEDULER_RUN_RETENTION = timedelta(days=30)
+
+PROCESS_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_scheduler_run(name: str, slot: datetime) -> bool:
+    """
+    예약 시각 slot의 name 작업을 이 프로세스가 실행할지 정한다.
+    여러 프로세스가 같은 slot을 동시에 요청해도 기본 키 때문에 한 프로세스의 INSERT만 성공한다.
+    """
+    db = SessionLocal()
+    try:
+        claimed = db.execute(
+            insert(SchedulerRunTable)
+            .values(name=name, slot=slot, owner=PROCESS_OWNER, started_at=datetime.now())
+            .on_conflict_do_nothing()
+        ).rowcount == 1
+        db.execute(delete(SchedulerRunTable).where(
+            SchedulerRunTable.name == name, SchedulerRunTable.slot < slot - SCHEDULER_RUN_RETENTION))
+        db.commit()
+        return claimed
+    finally:
+        db.close()
@@ -0,0 +1,275 @@
+# services/sql_metrics.py
+import re
+import time
+import heapq
+import threading
+from datetime import datetime
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.env import env
+from log import logger
+
+# 요청 밖(작업 워커, 사전 계산 스케줄러 등)에서 실행된 쿼리를 모으는 route 이름
+BACKGROUND_ROUTE = "(background)"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_VALUES_LIST = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    리터럴을 ?로 바꾸고 IN (?, ?, ...)이나 VALUES (...), (...)처럼 개수만 다른 목록을 하나로 줄여
+    같은 쿼리가 같은 문자열이 되도록 한다.
+    """
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PARAMETER_LIST.sub("?", statement)
+    statement = _VALUES_LIST.sub("(?)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+@dataclass
+class _RequestQueries:
+    """요청 하나에서 실행된 쿼리 기록"""
+    method: str
+    path: str
+    started_at: datetime = field(default_factory=datetime.now)
+    statements: int = 0
+    db_time: float = 0.0
+    slow_statements: int = 0
+    counts: Counter = field(default_factory=Counter)
+    # (소요 시간, SQL) 중 가장 느린 top_statements개 (min-heap)
+    slowest: List[Tuple[float, str]] = field(default_factory=list)
+
+
+@dataclass
+class _StatementStats:
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_time * 1000, 3),
+            'avg_ms': round(self.total_time * 1000 / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_time * 1000, 3),
+        }
+
+
+@dataclass
+class _RouteStats:
+    requests: int = 0
+    statements: int = 0
+    max_statements: int = 0
+    db_time: float = 0.0
+    max_db_time: float = 0.0
+    slow_statements: int = 0
+    n_plus_one_requests: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            'requests': self.requests,
+            'statements': self.statements,
+            'avg_statements': round(self.statements / self.requests, 2) if self.requests else 0.0,
+            'max_statements': self.max_statements,
+            'db_total_ms': round(self.db_time * 1000, 3),
+            'avg_db_ms': round(self.db_time * 1000 / self.requests, 3) if self.requests else 0.0,
+            'max_db_ms': round(self.max_db_time * 1000, 3),
+            'slow_statements': self.slow_statements,
+            'n_plus_one_requests': self.n_plus_one_requests,
+        }
+
+
+class SqlMetrics:
+    """
+    엔진의 cursor 실행 이벤트로 SQL 문마다 실행 시간을 재고, 요청별/route별/쿼리별로 모은다.
+    - 요청별: SQL 개수, DB 시간 합계, 가장 느린 쿼리 (최근 요청 몇 개만 보관)
+    - route별: 요청 수, SQL 개수와 DB 시간 합계/최댓값, 느린 쿼리 수, N+1 의심 요청 수
+    - 쿼리별(정규화한 SQL): 실행 횟수와 시간 합계/최댓값
+    같은 요청에서 같은 SQL이 n_plus_one_threshold번 이상 실행되면 N+1로 보고 경고를 남기고,
+    slow_query_ms보다 오래 걸린 쿼리는 바로 로그에 남긴다.
+    """
+
+    def __init__(self):
+        self.enabled = env.get("SQL_METRICS_ENABLED", "1") != "0"
+        # 0 이하이면 느린 쿼리 로그를 남기지 않는다.
+        self.slow_query_ms = float(env.get("SQL_SLOW_QUERY_MS", 100))
+        self.n_plus_one_threshold = int(env.get("SQL_N_PLUS_ONE_THRESHOLD", 5))
+        self.top_statements = int(env.get("SQL_METRICS_TOP_STATEMENTS", 5))
+        self.recent_requests = int(env.get("SQL_METRICS_RECENT_REQUESTS", 100))
+        # 정규화한 SQL 종류가 이보다 많아지면 새 SQL은 '(other)'로 합친다.
+        self.max_statement_kinds = int(env.get("SQL_METRICS_MAX_STATEMENTS", 1000))
+
+        self._current: ContextVar[Optional[_RequestQueries]] = ContextVar("sql_metrics_request", default=None)
+        # 동기 엔드포인트와 작업 워커가 여러 스레드에서 동시에 기록하므로 집계를 잠근다.
+        self._lock = threading.Lock()
+        self._routes: Dict[str, _RouteStats] = {}
+        self._statements: Dict[str, _StatementStats] = {}
+        self._recent: deque = deque(maxlen=self.recent_requests)
+        self._normalized: Dict[str, str] = {}
+
+        self.statements_total = 0
+        self.db_time_total = 0.0
+        self.slow_total = 0
+
+    def instrument(self, engine: Engine) -> None:
+        if not self.enabled:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _normalize(self, statement: str) -> str:
+        # 서비스 쿼리는 같은 문자열이 반복되므로 정규화 결과를 기억한다.
+        normalized = self._normalized.get(statement)
+        if normalized is None:
+            normalized = normalize_sql(statement)
+            if len(self._normalized) < self.max_statement_kinds * 4:
+                self._normalized[statement] = normalized
+        return normalized
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sql_metrics_started", []).append(time.perf_counter())
+
+    def _handle_error(self, exception_context):
+        started = exception_context.connection.info.get("sql_metrics_started") \
+            if exception_context.connection is not None else None
+        if started:
+            started.pop()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("sql_metrics_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        self.record(statement, elapsed)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        normalized = self._normalize(statement)
+        request = self._current.get()
+        route = f"{request.method} {request.path}" if request is not None else BACKGROUND_ROUTE
+        slow = 0 < self.slow_query_ms <= elapsed * 1000
+
+        if request is not None:
+            request.statements += 1
+            request.db_time += elapsed
+            request.slow_statements += slow
+            request.counts[normalized] += 1
+            if len(request.slowest) < self.top_statements:
+                heapq.heappush(request.slowest, (elapsed, normalized))
+            elif self.top_statements > 0 and elapsed > request.slowest[0][0]:
+                heapq.heapreplace(request.slowest, (elapsed, normalized))
+
+        with self._lock:
+            self.statements_total += 1
+            self.db_time_total += elapsed
+            if normalized not in self._statements and len(self._statements) >= self.max_statement_kinds:
+                normalized = "(other)"
+            self._statements.setdefault(normalized, _StatementStats()).add(elapsed)
+            self.slow_total += slow
+            if request is None:
+                route_stats = self._routes.setdefault(BACKGROUND_ROUTE, _RouteStats())
+                route_stats.statements += 1
+                route_stats.db_time += elapsed
+                route_stats.slow_statements += slow
+
+        if slow:
+            logger.warning(f"Slow query ({elapsed * 1000:.1f} ms) on {route}: {normalized}")
+
+    def begin_request(self, method: str, path: str):
+        return self._current.set(_RequestQueries(method=method, path=path))
+
+    def end_request(self, token, route_path: Optional[str]) -> None:
+        """
+        요청이 끝나면 (응답 본문을 모두 보낸 뒤) route별 집계에 더한다.
+        route_path는 /cry/{cry_id} 같은 경로 템플릿이며, 일치하는 route가 없던 요청은 한데 묶는다.
+        """
+        request = self._current.get()
+        self._current.reset(token)
+        if request is None:
+            return
+        route = f"{request.method} {route_path or '(unmatched)'}"
+
+        repeated = [(normalized, count) for normalized, count in request.counts.most_common()
+                    if count >= self.n_plus_one_threshold]
+        for normalized, count in repeated:
+            logger.warning(f"Possible N+1 on {route}: {count} x {normalized}")
+
+        with self._lock:
+            route_stats = self._routes.setdefault(route, _RouteStats())
+            route_stats.requests += 1
+            route_stats.statements += request.statements
+            route_stats.max_statements = max(route_stats.max_statements, request.statements)
+            route_stats.db_time += request.db_time
+            route_stats.max_db_time = max(route_stats.max_db_time, request.db_time)
+            route_stats.slow_statements += request.slow_statements
+            if repeated:
+                route_stats.n_plus_one_requests += 1
+            self._recent.append({
+                'route': route,
+                'started_at': request.started_at.isoformat(),
+                'statements': request.statements,
+                'db_ms': round(request.db_time * 1000, 3),
+                'slowest': [{'ms': round(elapsed * 1000, 3), 'sql': normalized}
+                            for elapsed, normalized in sorted(request.slowest, reverse=True)],
+                'repeated': [{'count': count, 'sql': normalized} for normalized, count in repeated],
+            })
+
+    def stats(self, limit: int = 20) -> dict:
+        with self._lock:
+            routes = {route: route_stats.to_dict() for route, route_stats in
+                      sorted(self._routes.items(), key=lambda item: item[1].db_time, reverse=True)}
+            statements = [{'sql': normalized, **statement_stats.to_dict()} for normalized, statement_stats in
+                          heapq.nlargest(limit, self._statements.items(), key=lambda item: item[1].total_time)]
+            recent = list(self._recent)[-limit:]
+        return {
+            'enabled': self.enabled,
+            'slow_query_ms': self.slow_query_ms,
+            'n_plus_one_threshold': self.n_plus_one_threshold,
+            'statements': self.statements_total,
+            'db_total_ms': round(self.db_time_total * 1000, 3),
+            'slow_statements': self.slow_total,
+            'routes': routes,
+            'top_statements': statements,
+            'recent_requests': recent,
+        }
+
+
+class SqlMetricsMiddleware:
+    """
+    요청마다 sql_metrics에 기록을 시작하고, 스트리밍 응답까지 모두 보낸 뒤 route별 집계에 더하는 ASGI 미들웨어.
+    route는 FastAPI가 scope에 남긴 경로 템플릿(/cry/{cry_id})으로 묶는다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not sql_metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        token = sql_metrics.begin_request(scope["method"], scope["path"])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            sql_metrics.end_request(token, getattr(route, "path", None))
+
+
+sql_metrics = SqlMetrics()
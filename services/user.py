@@ -1,3 +1,5 @@
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import Optional
 
@@ -8,6 +10,8 @@ from error.exceptions import (
     DuplicateEmailError, DuplicateUidError
 )
 from utils.converters import user_table_to_schema
+from db import async_variant
+from services.pet_ownership import pet_ownership_cache
 
 
 class UserService:
@@ -17,21 +21,26 @@ class UserService:
     def _get_user_by_email(self, db: Session, email: str) -> Optional[UserTable]:
         return db.query(UserTable).filter(UserTable.email == email).first()
 
-    def _validate_unique_user(self, db: Session, create_user_input: CreateUserInput):
-        if self._get_user_by_uid(db, create_user_input.uid):
-            raise DuplicateUidError("User already exists")
-        if self._get_user_by_email(db, create_user_input.email):
-            raise DuplicateEmailError("Email already exists")
+    def _raise_if_duplicate_user(self, e: IntegrityError) -> None:
+        # 미리 조회하지 않고 UNIQUE 제약 위반 메시지(예: "UNIQUE constraint failed: user.email")로 구분한다.
+        message = str(e.orig)
+        if 'user.uid' in message:
+            raise DuplicateUidError("User already exists") from e
+        if 'user.email' in message:
+            raise DuplicateEmailError("Email already exists") from e
 
     def create_user(self, db: Session, create_user_input: CreateUserInput) -> User:
-        self._validate_unique_user(db, create_user_input)
-
-        user_table = UserTable(**create_user_input.model_dump())
-        db.add(user_table)
-        db.commit()
-        db.refresh(user_table)
-
-        return user_table_to_schema(user_table)
+        try:
+            user_table = db.scalar(
+                insert(UserTable).values(**create_user_input.model_dump()).returning(UserTable))
+            user = user_table_to_schema(user_table)
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            self._raise_if_duplicate_user(e)
+            raise
+
+        return user
 
     def get_user_by_id(self, db: Session, user_id: str) -> User:
         user_table = self._get_user_by_uid(db, user_id)
@@ -40,14 +49,19 @@ class UserService:
         return user_table_to_schema(user_table)
 
     def update_user(self, db: Session, user_id: str, update_user_input: UpdateUserInput) -> User:
-        user_table = self._get_user_by_uid(db, user_id)
+        values = update_user_input.model_dump(exclude_unset=True)
+        if not values:
+            return self.get_user_by_id(db, user_id)
+
+        # 존재 확인과 수정을 UPDATE ... RETURNING 한 문장으로 처리한다.
+        user_table = db.scalar(
+            update(UserTable).where(UserTable.uid == user_id).values(**values).returning(UserTable))
         if not user_table:
             raise UserNotFoundError(f"User with id {user_id} not found")
-        user_table.update(**update_user_input.model_dump(exclude_unset=True))
+        user = user_table_to_schema(user_table)
         db.commit()
-        db.refresh(user_table)
 
-        return user_table_to_schema(user_table)
+        return user
 
     def delete_user(self, db: Session, user_id: str) -> None:
         user_table = self._get_user_by_uid(db, user_id)
@@ -55,6 +69,7 @@ class UserService:
             raise UserNotFoundError(f"User with id {user_id} not found")
         db.delete(user_table)
         db.commit()
+        pet_ownership_cache.invalidate_user(user_id)
 
     def login(self, db: Session, login_user_input: LoginUserInput) -> User:
         user_table = self._get_user_by_email(db, login_user_input.email)
@@ -66,5 +81,12 @@ class UserService:
 
         return user_table_to_schema(user_table)
 
+    # async 엔드포인트용 (AsyncSession을 받는다)
+    create_user_async = async_variant(create_user)
+    get_user_by_id_async = async_variant(get_user_by_id)
+    update_user_async = async_variant(update_user)
+    delete_user_async = async_variant(delete_user)
+    login_async = async_variant(login)
+
 
 user_service = UserService()
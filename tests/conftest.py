@@ -0,0 +1,77 @@
+# tests/conftest.py
+"""
+테스트는 실제 Database.db가 아닌 임시 디렉토리의 DB를 쓴다.
+db 모듈은 import 할 때 DB_PATH로 엔진을 만들므로, 서비스를 import 하기 전에 환경 변수를 먼저 바꾼다.
+"""
+import os
+import random
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+TMP_DIR = tempfile.mkdtemp(prefix='furemotion-test-')
+os.environ['DB_PATH'] = os.path.join(TMP_DIR, 'test.db')
+
+from db import SessionLocal, engine, init_db
+from model.cry import CryTable
+from schemas.pet import CreatePetInput
+from schemas.user import CreateUserInput
+from services.cry_archive import cry_archive_service
+from services.cry_inspect_cache import cry_inspect_cache
+from services.pet import pet_service
+from services.pet_ownership import pet_ownership_cache
+from services.user import user_service
+
+USER_IDS = ('plan_user_a', 'plan_user_b')
+
+
+def seed(db) -> None:
+    # 예제 데이터: 유저 2명, 반려동물 3마리, 1년 남짓한 기간의 울음 기록
+    for uid in USER_IDS:
+        user_service.create_user(db, CreateUserInput(
+            uid=uid, email=f'{uid}@example.com', nickname=uid))
+    for user_id in ('plan_user_a', 'plan_user_a', 'plan_user_b'):
+        pet_service.create_pet(db, CreatePetInput(
+            user_id=user_id, name='pet', gender='수컷', age=1, species='개', sub_species='x'), user_id)
+
+    now = datetime.now()
+    rng = random.Random(0)
+    for pet_id in (1, 2, 3):
+        for _ in range(400):
+            db.add(CryTable(pet_id=pet_id, time=now - timedelta(minutes=rng.randint(1, 60 * 24 * 400)),
+                            state=rng.choice(['anger', 'play', 'happy', 'sad']), audioId='audio',
+                            predictMap={'happy': 0.5, 'sad': 0.5}, intensity='high', duration=1.5))
+    db.commit()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _cleanup_tmp_dir():
+    yield
+    engine.dispose()
+    shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope='module')
+def seeded_db():
+    """모듈마다 빈 DB를 새로 만들고(create_all + migration) 예제 데이터를 넣은 세션"""
+    engine.dispose()
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        if os.path.exists(os.environ['DB_PATH'] + suffix):
+            os.remove(os.environ['DB_PATH'] + suffix)
+    init_db()
+
+    # 이전 모듈이나 실제 서버의 캐시/보관 파일을 읽지 않도록 모듈마다 새 디렉토리를 쓴다.
+    module_dir = tempfile.mkdtemp(dir=TMP_DIR)
+    cry_inspect_cache.cache_dir = os.path.join(module_dir, 'inspect_cache')
+    cry_archive_service.archive_dir = os.path.join(module_dir, 'cry_archive')
+    for user_id in USER_IDS:
+        pet_ownership_cache.invalidate_user(user_id)
+
+    db = SessionLocal()
+    try:
+        seed(db)
+        yield db
+    finally:
+        db.close()
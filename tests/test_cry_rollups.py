@@ -0,0 +1,135 @@
+# tests/test_cry_rollups.py
+"""
+cry_rollup_hourly/cry_rollup_weekly가 cry 테이블(과 보관된 울음)을 GROUP BY로 집계한 결과와 같은지 확인한다.
+롤업은 트리거(db_migration.py)로 유지되므로 울음을 추가/수정/삭제하는 모든 경로 뒤에 다시 비교한다.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, text
+
+from db import engine
+from db_migration import _add_cry_rollup_hourly, _add_cry_rollup_weekly
+from model.cry import CryTable
+from model.cry_archive import CryArchiveTable
+from schemas.cry import CreateCryInput, UpdateCryInput
+from services.cry import cry_service
+from services.cry_archive import CryArchiveRange, cry_archive_service
+from services.pet import pet_service
+
+USER_ID = 'plan_user_a'
+ARCHIVE_MONTH = (datetime.now() - timedelta(days=300)).strftime('%Y-%m')
+
+
+def _cry_rows(db):
+    """롤업에 반영되어야 하는 (pet_id, time, state, duration): cry 테이블의 울음과 보관된 울음"""
+    rows = [tuple(row) for row in db.execute(
+        select(CryTable.pet_id, CryTable.time, CryTable.state, CryTable.duration))]
+    for pet_id, path in db.execute(select(CryArchiveTable.pet_id, CryArchiveTable.path)):
+        rows += [(row['pet_id'], row['time'], row['state'], row['duration'])
+                 for row in cry_archive_service.iter_rows(db, CryArchiveRange(pet_id), paths=[path])]
+    return rows
+
+
+def _group(rows, period_of):
+    groups = defaultdict(lambda: [0, 0.0, 0])
+    for pet_id, time, state, duration in rows:
+        group = groups[(pet_id, period_of(time).isoformat(), time.hour, state)]
+        group[0] += 1
+        group[1] += duration or 0
+        group[2] += duration is not None
+    return {key: (count, round(duration_sum, 6), duration_count)
+            for key, (count, duration_sum, duration_count) in groups.items()}
+
+
+def _rollup(db, table: str, period: str):
+    return {(pet_id, day, hour, state): (count, round(duration_sum, 6), duration_count)
+            for pet_id, day, hour, state, count, duration_sum, duration_count in db.execute(text(
+                f"SELECT pet_id, {period}, hour, state, count, duration_sum, duration_count FROM {table}"))}
+
+
+def assert_rollups_match(db):
+    rows = _cry_rows(db)
+    assert _rollup(db, 'cry_rollup_hourly', 'day') == _group(rows, lambda time: time.date())
+    assert _rollup(db, 'cry_rollup_weekly', 'week') == _group(
+        rows, lambda time: time.date() - timedelta(days=time.weekday()))
+
+
+def _cry_version(db, pet_id: int) -> int:
+    return db.execute(text("SELECT version FROM cry_version WHERE pet_id = :pet_id"),
+                      {'pet_id': pet_id}).scalar() or 0
+
+
+def test_seeded_rollups_match(seeded_db):
+    assert_rollups_match(seeded_db)
+
+
+def test_backfill_matches_triggers(seeded_db):
+    # migration 1, 3은 기존 cry 테이블로부터 롤업을 다시 채운다.
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DELETE FROM cry_rollup_hourly")
+        connection.exec_driver_sql("DELETE FROM cry_rollup_weekly")
+        _add_cry_rollup_hourly(connection)
+        _add_cry_rollup_weekly(connection)
+    assert_rollups_match(seeded_db)
+
+
+def test_create_update_delete_cry(seeded_db):
+    db = seeded_db
+    versions = [_cry_version(db, 1)]
+
+    cry = cry_service.create_cry(db, CreateCryInput(
+        pet_id=1, time=datetime.now() - timedelta(days=3), state='happy', audioId='audio',
+        predictMap={'happy': 1.0}, duration=2.5), USER_ID)
+    assert_rollups_match(db)
+    versions.append(_cry_version(db, 1))
+
+    # 원인과 시각이 바뀌면 이전 칸에서 빼고 새 칸에 더한다.
+    cry_service.update_cry(db, cry.id, UpdateCryInput(
+        state='sad', time=datetime.now() - timedelta(days=40), duration=4.0), USER_ID)
+    assert_rollups_match(db)
+    versions.append(_cry_version(db, 1))
+
+    cry_service.delete_cry(db, cry.id, USER_ID)
+    assert_rollups_match(db)
+    versions.append(_cry_version(db, 1))
+    # 분석 결과 캐시가 무효가 되도록 변경마다 버전이 올라간다.
+    assert versions == sorted(set(versions))
+
+
+def test_create_cries(seeded_db):
+    db = seeded_db
+    now = datetime.now()
+    results = cry_service.create_cries(db, [CreateCryInput(
+        pet_id=pet_id, time=now - timedelta(hours=hours), state='play', audioId='audio',
+        predictMap={'play': 1.0}, duration=1.0) for pet_id in (1, 2) for hours in range(0, 48, 5)], USER_ID)
+    assert all(result.success for result in results)
+    assert_rollups_match(db)
+
+
+def test_archive_keeps_rollups(seeded_db):
+    db = seeded_db
+    version = _cry_version(db, 1)
+    hourly = _rollup(db, 'cry_rollup_hourly', 'day')
+
+    assert cry_archive_service.archive_month(db, 1, ARCHIVE_MONTH) > 0
+    # 보관으로 cry에서 지운 울음은 롤업과 버전에 그대로 남는다.
+    assert _rollup(db, 'cry_rollup_hourly', 'day') == hourly
+    assert _cry_version(db, 1) == version
+    assert_rollups_match(db)
+
+    # 보관이 끝난 뒤의 삭제는 다시 롤업에 반영된다.
+    cry_id = db.scalar(select(CryTable.id).where(CryTable.pet_id == 1).limit(1))
+    cry_service.delete_cry(db, cry_id, USER_ID)
+    assert_rollups_match(db)
+
+
+def test_delete_pet_removes_rollups(seeded_db):
+    db = seeded_db
+    # 반려동물 1은 보관된 울음과 cry 테이블의 울음이 모두 있고, 2는 cry 테이블에만 있다.
+    for pet_id in (1, 2):
+        pet_service.delete_pet(db, pet_id, USER_ID)
+        for table in ('cry_rollup_hourly', 'cry_rollup_weekly', 'cry_version', 'cry_archive', 'cry'):
+            assert db.execute(text(f"SELECT COUNT(*) FROM {table} WHERE pet_id = :pet_id"),
+                              {'pet_id': pet_id}).scalar() == 0, table
+    assert_rollups_match(db)
@@ -0,0 +1,115 @@
+# tests/test_query_count.py
+"""
+엔드포인트가 호출하는 서비스 메서드별로 실행되는 SQL 문 개수가 QUERY_BUDGETS를 넘지 않는지 확인한다.
+각 경로를 여러 번 실행해 첫 호출과 이후 호출(캐시가 채워진 상태) 모두를 센다.
+서비스 쿼리를 바꿔 엔드포인트의 SQL 개수가 늘어나면 이 테스트가 실패한다.
+"""
+import itertools
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from db import engine
+from schemas.cry import CreateCryInput, UpdateCryInput
+from schemas.pet import CreatePetInput, UpdatePetInput
+from schemas.user import CreateUserInput, UpdateUserInput
+from services.cry import cry_service
+from services.pet import pet_service
+from services.user import user_service
+
+USER_ID = 'plan_user_a'
+REPEAT = 10
+
+# 엔드포인트별 SQL 문 개수 상한 (모든 호출 중 최댓값 기준, 첫 호출 포함)
+QUERY_BUDGETS = {
+    'POST /user': 1,
+    'PUT /user': 1,
+    'POST /pet': 1,
+    'PUT /pet/{pet_id}': 1,
+    'POST /cry/create': 1,
+    # 소유권과 종을 캐시가 아닌 pet 테이블에서 한 번에 확인한 뒤 INSERT 한다.
+    'POST /cry/bulk': 2,
+    'GET /cry/cry/{cry_id}': 1,
+    # 보관 파일 목록(cry_archive)은 목록 쿼리에 컬럼으로 함께 읽는다.
+    'GET /cry/pet/{pet_id}?limit=50': 1,
+    'GET /cry/search/state': 1,
+    'GET /cry/search/time': 1,
+    'PUT /cry/{cry_id}': 1,
+    'DELETE /cry/{cry_id}': 2,
+    'GET /cry/inspect': 2,
+    'GET /cry/inspect/all': 3,
+}
+
+
+def endpoints(db):
+    """(엔드포인트, 서비스 호출) 목록. 매번 같은 결과가 나오도록 읽기 위주로 구성한다."""
+    now = datetime.now()
+    created = []
+    # 매번 실제로 INSERT/UPDATE가 실행되도록 값을 바꾼다.
+    counter = itertools.count(start=1)
+
+    def create_cry():
+        created.append(cry_service.create_cry(db, CreateCryInput(
+            pet_id=1, time=now, state='happy', audioId='audio', predictMap={'happy': 1.0}), USER_ID).id)
+
+    def create_cries():
+        cry_service.create_cries(db, [CreateCryInput(
+            pet_id=pet_id, time=now, state='happy', audioId='audio', predictMap={'happy': 1.0})
+            for pet_id in (1, 2) for _ in range(10)], USER_ID)
+
+    def create_user():
+        uid = f'bench_user_{next(counter)}'
+        user_service.create_user(db, CreateUserInput(uid=uid, email=f'{uid}@example.com', nickname=uid))
+
+    def delete_cry():
+        cry_service.delete_cry(db, created.pop(), USER_ID)
+
+    return [
+        ('POST /user', create_user),
+        ('PUT /user', lambda: user_service.update_user(db, USER_ID, UpdateUserInput(nickname=f'a{next(counter)}'))),
+        ('POST /pet', lambda: pet_service.create_pet(db, CreatePetInput(
+            user_id=USER_ID, name='pet', gender='수컷', age=1, species='개', sub_species='x'), USER_ID)),
+        ('PUT /pet/{pet_id}', lambda: pet_service.update_pet(db, 1, UpdatePetInput(age=next(counter)), USER_ID)),
+        ('POST /cry/create', create_cry),
+        ('POST /cry/bulk', create_cries),
+        ('GET /cry/cry/{cry_id}', lambda: cry_service.get_cry_by_id(db, 1, USER_ID)),
+        ('GET /cry/pet/{pet_id}?limit=50', lambda: cry_service.get_all_cries_by_pet(db, 1, USER_ID, limit=50)),
+        ('GET /cry/search/state', lambda: cry_service.get_pets_with_state(db, 1, 'happy', USER_ID, limit=50)),
+        ('GET /cry/search/time', lambda: cry_service.get_pets_between_time(
+            db, 1, now - timedelta(days=30), now, USER_ID, limit=50)),
+        ('PUT /cry/{cry_id}', lambda: cry_service.update_cry(
+            db, 1, UpdateCryInput(state='sad', duration=next(counter)), USER_ID)),
+        ('DELETE /cry/{cry_id}', delete_cry),
+        ('GET /cry/inspect', lambda: cry_service.inspect_cry(db, 1, USER_ID, '365d')),
+        ('GET /cry/inspect/all', lambda: cry_service.inspect_all_cries(db, USER_ID, '365d')),
+    ]
+
+
+def test_query_budgets(seeded_db):
+    db = seeded_db
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    calls = endpoints(db)
+    assert {name for name, _ in calls} == set(QUERY_BUDGETS)
+
+    over_budget = []
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for name, call in calls:
+            counts = []
+            for _ in range(REPEAT):
+                # 요청마다 세션이 새로 열리는 것처럼 identity map을 비운다.
+                db.expunge_all()
+                statements.clear()
+                call()
+                db.commit()
+                counts.append(len(statements))
+            if max(counts) > QUERY_BUDGETS[name]:
+                over_budget.append(f"{name}: {counts} > {QUERY_BUDGETS[name]}")
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert not over_budget, "over budget:\n" + '\n'.join(over_budget)
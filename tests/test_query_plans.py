@@ -0,0 +1,105 @@
+# tests/test_query_plans.py
+"""
+UserService, PetService, CryService가 실행하는 모든 쿼리의 EXPLAIN QUERY PLAN을 확인한다.
+각 서비스 메서드를 호출하며 실행된 SQL을 모은 뒤, 테이블 전체를 읽는(SCAN <table>) 쿼리가 없어야 한다.
+인덱스나 서비스 쿼리를 바꾸면 전체 테이블 스캔이 생기지 않았는지 이 테스트로 확인한다.
+"""
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from db import engine
+from db_base import DB_Base
+from schemas.cry import CreateCryInput, UpdateCryInput
+from schemas.pet import CreatePetInput, UpdatePetInput
+from schemas.user import CreateUserInput, LoginUserInput, UpdateUserInput
+from services.cry import cry_service
+from services.cry_archive import cry_archive_service
+from services.pet import pet_service
+from services.user import user_service
+
+SCAN_PATTERN = re.compile(r'^SCAN (\w+)')
+
+
+def exercise(db) -> None:
+    """서비스의 조회/수정/삭제 경로를 한 번씩 실행한다."""
+    user_id = 'plan_user_a'
+    now = datetime.now()
+
+    user_service.get_user_by_id(db, user_id)
+    user_service.update_user(db, user_id, UpdateUserInput(nickname='renamed'))
+    user_service.login(db, LoginUserInput(uid=user_id, email=f'{user_id}@example.com'))
+    user_service.create_user(db, CreateUserInput(uid='plan_user_c', email='plan_user_c@example.com', nickname='c'))
+    user_service.delete_user(db, 'plan_user_c')
+
+    pet_service.get_pet_by_id(db, 1, user_id)
+    pet_service.get_all_pets_by_user(db, user_id)
+    pet_service.update_pet(db, 1, UpdatePetInput(age=2), user_id)
+    pet = pet_service.create_pet(db, CreatePetInput(
+        user_id=user_id, name='tmp', gender='수컷', age=1, species='개', sub_species='x'), user_id)
+    pet_service.delete_pet(db, pet.id, user_id)
+
+    cry_service.create_cry(db, CreateCryInput(
+        pet_id=1, time=now, state='happy', audioId='audio', predictMap={'happy': 1.0}), user_id)
+    cry_service.create_cries(db, [CreateCryInput(
+        pet_id=pet_id, time=now, state='happy', audioId='audio', predictMap={'happy': 1.0})
+        for pet_id in (1, 2)], user_id)
+    cry_service.get_cry_by_id(db, 1, user_id)
+    for order in ('asc', 'desc'):
+        _, cursor = cry_service.get_all_cries_by_pet(db, 1, user_id, limit=50, order=order)
+        cry_service.get_all_cries_by_pet(db, 1, user_id, limit=50, cursor=cursor, order=order)
+        _, cursor = cry_service.get_pets_with_state(db, 1, 'happy', user_id, limit=20, order=order)
+        cry_service.get_pets_with_state(db, 1, 'happy', user_id, limit=20, cursor=cursor, order=order)
+        _, cursor = cry_service.get_pets_between_time(
+            db, 1, now - timedelta(days=30), now, user_id, limit=20, order=order)
+        cry_service.get_pets_between_time(
+            db, 1, now - timedelta(days=30), now, user_id, limit=20, cursor=cursor, order=order)
+    cry_service.update_cry(db, 1, UpdateCryInput(state='sad', duration=3.0), user_id)
+    cry_service.delete_cry(db, 2, user_id)
+
+    for window in ('24h', '7d', '30d', '365d'):
+        cry_service.inspect_cry(db, 1, user_id, window)
+        cry_service.inspect_all_cries(db, user_id, window)
+    cry_service.inspect_cry(db, 1, user_id, 'custom', start_time=now - timedelta(days=200, minutes=7))
+
+    # 보관 작업과 보관된 울음을 합쳐 읽는 목록 조회 (hot 페이지가 빈 경우 포함)
+    cry_archive_service.archive_month(db, 1, (now - timedelta(days=300)).strftime('%Y-%m'))
+    for order in ('asc', 'desc'):
+        _, cursor = cry_service.get_all_cries_by_pet(db, 1, user_id, limit=50, order=order)
+        cry_service.get_all_cries_by_pet(db, 1, user_id, limit=50, cursor=cursor, order=order)
+    cry_service.get_pets_between_time(db, 1, now - timedelta(days=330), now - timedelta(days=270), user_id)
+
+
+def test_no_full_table_scan(seeded_db):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        exercise(seeded_db)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    tables = set(DB_Base.metadata.tables)
+    seen = set()
+    failures = []
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for statement, parameters in statements:
+            if statement in seen or not statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'WITH')):
+                continue
+            seen.add(statement)
+            plan = [row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+            scans = [detail for detail in plan
+                     if (match := SCAN_PATTERN.match(detail)) and match.group(1) in tables]
+            if scans:
+                failures.append(f"{' '.join(statement.split())}\n    " + '\n    '.join(plan))
+    finally:
+        raw.close()
+
+    assert seen
+    assert not failures, f"{len(failures)} of {len(seen)} queries scan a whole table:\n" + '\n'.join(failures)
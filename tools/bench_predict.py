@@ -0,0 +1,110 @@
+# tools/bench_predict.py
+"""
+/cry/predict 부하 테스트.
+동시에 여러 요청을 보내 처리량과 p50/p95/p99 지연 시간을 측정한다.
+
+    python -m tools.fake_ai_server --port 7702 &
+    AI_SERVER_API=http://127.0.0.1:7702/predict uvicorn main:app --port 7701 &
+    python -m tools.bench_predict --pet-id 1 --user-id <uid> --concurrency 32 --requests 1000
+
+--user-id를 주면 .env의 JWT 설정으로 토큰을 직접 만들고, 아니면 --token을 사용한다.
+"""
+import argparse
+import asyncio
+import io
+import time
+import wave
+from collections import Counter
+
+import httpx
+import numpy as np
+
+
+def make_wav(seconds: float, sample_rate: int = 22050) -> bytes:
+    # 무음 - 울음(톤 + 잡음) - 무음 형태의 테스트용 16bit 모노 wav
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    signal = 0.3 * np.sin(2 * np.pi * 600 * t) + 0.05 * np.random.randn(len(t))
+    signal[(t < seconds * 0.2) | (t > seconds * 0.8)] = 0.0
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes((np.clip(signal, -1, 1) * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+async def run(args) -> None:
+    if args.token:
+        token = args.token
+    else:
+        from auth.auth_handler import signJWT
+        token = signJWT(args.user_id)['access_token']
+
+    # 기본값은 요청마다 다른 wav를 미리 만들어 둔다. (같은 wav는 predictMap 캐시에 적중한다)
+    distinct_clips = args.distinct_clips or args.requests
+    wavs = [make_wav(args.seconds) for _ in range(min(args.requests, distinct_clips))]
+    params = {'pet_id': args.pet_id}
+    if args.async_job:
+        params['async_job'] = 'true'
+
+    # 각 wav의 첫 요청(캐시 미스)과 반복 요청(캐시 적중)의 지연 시간을 따로 모은다.
+    latencies = {'miss': [], 'hit': []}
+    statuses = Counter()
+    next_request = 0
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal next_request
+        while next_request < args.requests:
+            index = next_request
+            next_request += 1
+            files = {'file': ('cry.wav', wavs[index % len(wavs)], 'audio/wav')}
+            started = time.perf_counter()
+            try:
+                response = await client.post('/cry/predict', params=params, files=files)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies['miss' if index < len(wavs) else 'hit'].append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout,
+                                 headers={'Authorization': f'Bearer {token}'}) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(client) for _ in range(args.concurrency)])
+        elapsed = time.perf_counter() - started
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"requests     : {total} in {elapsed:.2f}s (concurrency {args.concurrency})")
+    print(f"throughput   : {total / elapsed:.1f} req/s")
+    for kind, values in latencies.items():
+        if not values:
+            continue
+        latencies_ms = np.array(values) * 1000
+        p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+        print(f"cache {kind:<5}(ms): p50 {p50:.1f} / p95 {p95:.1f} / p99 {p99:.1f} / max {latencies_ms.max():.1f}"
+              f" ({len(values)} requests)")
+    print(f"status codes : {dict(statuses)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load benchmark for /cry/predict")
+    parser.add_argument("--url", default="http://127.0.0.1:7701")
+    parser.add_argument("--pet-id", type=int, required=True)
+    parser.add_argument("--user-id", help="owner of the pet, used to sign a JWT")
+    parser.add_argument("--token", help="JWT access token (instead of --user-id)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=3.0,
+                        help="length of each generated clip")
+    parser.add_argument("--distinct-clips", type=int, default=None,
+                        help="number of different clips to cycle through (default: one per request)")
+    parser.add_argument("--async-job", action="store_true",
+                        help="use the 202 job mode of /cry/predict")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+    if not args.token and not args.user_id:
+        parser.error("either --user-id or --token is required")
+
+    asyncio.run(run(args))
@@ -0,0 +1,111 @@
+# tools/fake_ai_server.py
+"""
+부하 테스트용 AI 추론 서버 대역.
+실제 추론 서버와 같은 형태(whining/relax/hostile 키)의 응답을 설정한 지연 분포와 에러율로 돌려준다.
+
+    python -m tools.fake_ai_server --port 7702 --latency-ms 150 --latency-sigma 0.6 --error-rate 0.01
+
+백엔드는 다음 환경 변수로 이 서버를 바라보게 한다.
+
+    AI_SERVER_API=http://127.0.0.1:7702/predict
+    AI_SERVER_BATCH_API=http://127.0.0.1:7702/predict/batch
+
+여러 포트로 띄운 뒤 쉼표로 나열하면 복수 서버 라우팅과 hedge 요청을 확인할 수 있다.
+
+    AI_SERVER_API=http://127.0.0.1:7702/predict,http://127.0.0.1:7703/predict
+"""
+import argparse
+import asyncio
+import math
+import random
+from typing import List
+
+import uvicorn
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+
+# 실제 서버가 돌려주는 클래스 이름 (백엔드에서 whining->sad, relax->happy, hostile->anger 로 바꾼다)
+SPECIES_CLASSES = {
+    'dog': ('whining', 'relax', 'hostile', 'play'),
+    'cat': ('relax', 'hunger', 'lonely'),
+}
+COMMON_CLASSES = ('whining', 'relax', 'hostile')
+
+config = {
+    'latency_ms': 150.0,
+    'latency_sigma': 0.5,
+    'batch_cost': 0.1,
+    'error_rate': 0.0,
+}
+stats = {'requests': 0, 'clips': 0, 'errors': 0}
+
+app = FastAPI()
+
+
+def _sample_latency(clips: int) -> float:
+    # 중앙값이 latency_ms인 로그 정규 분포, 배치는 clip 하나당 batch_cost 만큼 느려진다.
+    latency = random.lognormvariate(
+        math.log(config['latency_ms']), config['latency_sigma'])
+    return latency * (1 + config['batch_cost'] * (clips - 1)) / 1000
+
+
+def _predict_map(species: str) -> dict:
+    classes = SPECIES_CLASSES.get(species, COMMON_CLASSES)
+    weights = [random.random() for _ in classes]
+    total = sum(weights)
+    predict_map = {name: 0.0 for name in COMMON_CLASSES}
+    predict_map.update({name: round(weight / total, 3)
+                        for name, weight in zip(classes, weights)})
+    return predict_map
+
+
+async def _simulate(clips: int) -> None:
+    stats['requests'] += 1
+    stats['clips'] += clips
+    await asyncio.sleep(_sample_latency(clips))
+    if random.random() < config['error_rate']:
+        stats['errors'] += 1
+        raise HTTPException(status_code=503, detail="Simulated inference failure")
+
+
+@app.post("/predict")
+async def predict(
+        file: UploadFile = File(...),
+        user_id: str = Form(...),
+        species: str = Form(...)):
+    while await file.read(64 * 1024):
+        pass
+    await _simulate(1)
+    return _predict_map(species)
+
+
+@app.post("/predict/batch")
+async def predict_batch(
+        files: List[UploadFile] = File(...),
+        user_id: List[str] = Form(...),
+        species: str = Form(...)):
+    await _simulate(len(files))
+    return [_predict_map(species) for _ in files]
+
+
+@app.get("/stats")
+async def get_stats():
+    return {'config': config, 'stats': stats}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake AI inference server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7702)
+    parser.add_argument("--latency-ms", type=float, default=config['latency_ms'],
+                        help="median inference latency in milliseconds")
+    parser.add_argument("--latency-sigma", type=float, default=config['latency_sigma'],
+                        help="sigma of the log-normal latency distribution")
+    parser.add_argument("--batch-cost", type=float, default=config['batch_cost'],
+                        help="extra latency per additional clip in a batch (fraction of one clip)")
+    parser.add_argument("--error-rate", type=float, default=config['error_rate'],
+                        help="fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    config.update(latency_ms=args.latency_ms, latency_sigma=args.latency_sigma,
+                  batch_cost=args.batch_cost, error_rate=args.error_rate)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,259 @@
+# utils/audio.py
+import struct
+import wave
+from dataclasses import dataclass
+
+import numpy as np
+
+from enums.cry_intensity import CryIntensityEnum
+from error.exceptions import InvalidWavFileError
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# 메모리 사용량을 일정하게 유지하기 위해 이 프레임 수 단위로 나눠 계산한다.
+BLOCK_FRAMES = 1 << 16
+
+# 이 값(dBFS)보다 작은 프레임은 무음으로 보고 앞뒤를 잘라낸다.
+SILENCE_THRESHOLD_DB = -40.0
+
+# 울음 구간 RMS(dBFS)에 따른 세기 구간: LOW < -30 <= MEDIUM < -18 <= HIGH
+INTENSITY_THRESHOLDS_DB = (-30.0, -18.0)
+
+# 다운샘플링 전 anti-aliasing 필터의 한쪽 길이 (새 샘플레이트 기준 샘플 수)
+LOWPASS_ZERO_CROSSINGS = 16
+
+
+@dataclass
+class WavInfo:
+    format_tag: int
+    channels: int
+    sample_rate: int
+    sample_width: int
+    data_offset: int
+    n_frames: int
+
+
+@dataclass
+class WavFeatures:
+    info: WavInfo
+    duration: float
+    trim_start: float
+    trim_end: float
+    rms_db: float
+    peak_db: float
+    intensity: str
+
+    @property
+    def cry_duration(self) -> float:
+        """앞뒤 무음을 제외한 울음 구간의 길이(초)"""
+        return self.trim_end - self.trim_start
+
+
+def read_wav_info(file_path: str) -> WavInfo:
+    """RIFF 헤더를 읽어 fmt/data chunk 정보를 반환한다. 샘플 데이터는 읽지 않는다."""
+    with open(file_path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b'RIFF' or header[8:] != b'WAVE':
+            raise InvalidWavFileError("File is not a RIFF/WAVE file")
+
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise InvalidWavFileError("WAV data chunk not found")
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+
+            if chunk_id == b'fmt ':
+                body = f.read(chunk_size)
+                format_tag, channels, sample_rate, _, block_align, bits = struct.unpack(
+                    '<HHIIHH', body[:16])
+                if format_tag == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    format_tag = struct.unpack('<H', body[24:26])[0]
+                fmt = (format_tag, channels, sample_rate, block_align, bits)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    raise InvalidWavFileError("WAV fmt chunk not found")
+                format_tag, channels, sample_rate, block_align, bits = fmt
+                if channels == 0 or sample_rate == 0 or block_align != channels * ((bits + 7) // 8):
+                    raise InvalidWavFileError("Unsupported WAV format")
+                # 녹음이 중단된 파일은 헤더의 크기보다 데이터가 짧을 수 있다.
+                data_offset = f.tell()
+                data_size = min(chunk_size, f.seek(0, 2) - data_offset)
+                return WavInfo(format_tag, channels, sample_rate, block_align // channels,
+                               data_offset, data_size // block_align)
+            else:
+                f.seek(chunk_size + (chunk_size & 1), 1)
+                continue
+
+            if chunk_size & 1:
+                f.seek(1, 1)
+
+
+def _sample_dtype(info: WavInfo) -> np.dtype:
+    if info.format_tag == WAVE_FORMAT_IEEE_FLOAT and info.sample_width in (4, 8):
+        return np.dtype(f'<f{info.sample_width}')
+    if info.format_tag == WAVE_FORMAT_PCM and info.sample_width in (1, 2, 3, 4):
+        # 24bit 샘플은 바이트 단위로 읽은 뒤 _to_float에서 변환한다.
+        return np.dtype('u1') if info.sample_width in (1, 3) else np.dtype(f'<i{info.sample_width}')
+    raise InvalidWavFileError(
+        f"Unsupported WAV encoding (format={info.format_tag}, width={info.sample_width})")
+
+
+def open_wav_frames(file_path: str, info: WavInfo) -> np.memmap:
+    """샘플 데이터를 복사하지 않고 (프레임, 채널[, 바이트]) 형태로 memory-map 한다."""
+    shape = (info.n_frames, info.channels)
+    if info.format_tag == WAVE_FORMAT_PCM and info.sample_width == 3:
+        shape += (3,)
+    return np.memmap(file_path, dtype=_sample_dtype(info), mode='r',
+                     offset=info.data_offset, shape=shape)
+
+
+def _to_mono_float(block: np.ndarray, info: WavInfo) -> np.ndarray:
+    """샘플 블록을 [-1, 1] 범위의 float32 모노 신호로 변환한다."""
+    if info.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        samples = block.astype(np.float32)
+    elif info.sample_width == 1:
+        samples = (block.astype(np.float32) - 128.0) / 128.0
+    elif info.sample_width == 3:
+        # little-endian 24bit -> 상위 바이트에 맞춰 int32로 만든 뒤 부호를 유지하며 shift
+        as_int = (block[..., 0].astype(np.int32) << 8 | block[..., 1].astype(np.int32) << 16
+                  | block[..., 2].astype(np.int32) << 24) >> 8
+        samples = as_int.astype(np.float32) / float(1 << 23)
+    else:
+        samples = block.astype(np.float32) / float(1 << (8 * info.sample_width - 1))
+    return samples.mean(axis=1)
+
+
+def _to_db(value: float) -> float:
+    return float(20 * np.log10(max(value, 1e-10)))
+
+
+def _get_intensity(rms_db: float) -> str:
+    low, high = INTENSITY_THRESHOLDS_DB
+    if rms_db < low:
+        return CryIntensityEnum.LOW.value
+    if rms_db < high:
+        return CryIntensityEnum.MEDIUM.value
+    return CryIntensityEnum.HIGH.value
+
+
+def extract_wav_features(file_path: str) -> WavFeatures:
+    """
+    wav 파일의 길이, 무음을 제외한 울음 구간, RMS/peak 세기를 계산한다.
+    파일은 memory-map 한 뒤 BLOCK_FRAMES 단위로 벡터 연산하므로 길이와 관계없이 메모리 사용량이 일정하다.
+    """
+    info = read_wav_info(file_path)
+    if info.n_frames == 0:
+        raise InvalidWavFileError("WAV file has no audio frames")
+    frames = open_wav_frames(file_path, info)
+    threshold = 10 ** (SILENCE_THRESHOLD_DB / 20)
+
+    # 1. peak와 무음이 아닌 첫/마지막 프레임
+    peak = 0.0
+    first, last = None, None
+    for start in range(0, info.n_frames, BLOCK_FRAMES):
+        amplitude = np.abs(_to_mono_float(
+            frames[start:start + BLOCK_FRAMES], info))
+        peak = max(peak, float(amplitude.max()))
+        voiced = np.flatnonzero(amplitude > threshold)
+        if len(voiced):
+            if first is None:
+                first = start + int(voiced[0])
+            last = start + int(voiced[-1])
+
+    if first is None:
+        first, last = 0, info.n_frames - 1
+
+    # 2. 울음 구간의 RMS
+    square_sum = 0.0
+    for start in range(first, last + 1, BLOCK_FRAMES):
+        samples = _to_mono_float(
+            frames[start:min(start + BLOCK_FRAMES, last + 1)], info)
+        square_sum += float(np.dot(samples, samples))
+    rms = np.sqrt(square_sum / (last - first + 1))
+
+    rms_db = _to_db(rms)
+    return WavFeatures(
+        info=info,
+        duration=info.n_frames / info.sample_rate,
+        trim_start=first / info.sample_rate,
+        trim_end=(last + 1) / info.sample_rate,
+        rms_db=round(rms_db, 2),
+        peak_db=round(_to_db(peak), 2),
+        intensity=_get_intensity(rms_db),
+    )
+
+
+def _lowpass_taps(step: float) -> np.ndarray:
+    """
+    step배로 다운샘플링하기 전에 새 Nyquist 주파수 이상의 성분을 걸러내는 windowed-sinc FIR 필터 계수.
+    차단 주파수는 새 Nyquist의 90%이고, 탭 수는 step에 비례한다. (홀수여서 지연이 정수 프레임)
+    """
+    half = int(np.ceil(LOWPASS_ZERO_CROSSINGS * step))
+    cutoff = 0.45 / step  # 원본 샘플레이트 기준 cycles/sample
+    n = np.arange(-half, half + 1)
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.blackman(2 * half + 1)
+    return (taps / taps.sum()).astype(np.float32)
+
+
+def write_forward_wav(file_path: str, features: WavFeatures, out_path: str, sample_rate: int) -> None:
+    """
+    울음 구간만 잘라 모노로 다운믹스하고 sample_rate로 리샘플링한 16bit wav를 out_path에 저장한다.
+    다운샘플링할 때는 먼저 low-pass FIR 필터로 새 Nyquist 이상의 성분을 걸러 aliasing을 막고,
+    필터를 거친 신호를 블록 경계마다 한 프레임을 겹쳐 읽으며 선형 보간한다.
+    울음 구간 밖은 0으로 보고 필터링하므로 블록 단위로 나눠 계산해도 결과가 같다.
+    """
+    info = features.info
+    if sample_rate <= 0 or sample_rate > info.sample_rate:
+        sample_rate = info.sample_rate
+    frames = open_wav_frames(file_path, info)
+    first = int(round(features.trim_start * info.sample_rate))
+    n_src = int(round(features.trim_end * info.sample_rate)) - first
+    step = info.sample_rate / sample_rate
+    taps = _lowpass_taps(step) if step > 1 else None
+    half = len(taps) // 2 if taps is not None else 0
+
+    with wave.open(out_path, 'wb') as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(sample_rate)
+
+        next_index = 0
+        for block_start in range(0, n_src, BLOCK_FRAMES):
+            block_end = min(block_start + BLOCK_FRAMES + 1, n_src)
+            if taps is None:
+                samples = _to_mono_float(
+                    frames[first + block_start:first + block_end], info)
+            else:
+                # 필터 길이의 절반만큼 앞뒤 프레임을 더 읽는다. (울음 구간 밖은 0)
+                read_start = max(block_start - half, 0)
+                read_end = min(block_end + half, n_src)
+                padded = np.pad(
+                    _to_mono_float(frames[first + read_start:first + read_end], info),
+                    (read_start - (block_start - half), (block_end + half) - read_end))
+                samples = np.convolve(padded, taps, mode='valid')
+
+            # 이 블록이 담당하는 출력 샘플: 마지막 블록은 끝 프레임까지 포함
+            if block_end == n_src:
+                end_index = int(np.floor((n_src - 1) / step)) + 1
+            else:
+                end_index = int(np.ceil((block_start + BLOCK_FRAMES) / step))
+            positions = np.arange(next_index, end_index) * step - block_start
+            resampled = np.interp(
+                positions, np.arange(len(samples)), samples)
+            next_index = end_index
+
+            out.writeframes(
+                (np.clip(resampled, -1.0, 1.0) * 32767).astype('<i2').tobytes())
+
+
+def needs_forward_conversion(features: WavFeatures, sample_rate: int) -> bool:
+    """원본을 그대로 보내도 되는지(모노, 16bit PCM, 목표 샘플레이트 이하, 잘라낼 무음 없음) 판단한다."""
+    info = features.info
+    return not (info.channels == 1
+                and info.format_tag == WAVE_FORMAT_PCM and info.sample_width == 2
+                and (sample_rate <= 0 or info.sample_rate <= sample_rate)
+                and features.trim_start == 0
+                and features.trim_end == features.duration)
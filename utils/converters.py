@@ -1,11 +1,14 @@
 # utils/converters.py
+from typing import Optional
+
 from model.user import UserTable
 from model.pet import PetTable
-from model.cry import CryTable
+from model.cry import CryTable, PREDICT_COLUMNS
+from model.cry_job import CryJobTable
 
 from schemas.user import User
 from schemas.pet import Pet
-from schemas.cry import Cry
+from schemas.cry import Cry, CryJob
 
 
 def user_table_to_schema(user_table: UserTable) -> User:
@@ -47,3 +50,32 @@ def cry_table_to_schema(cry_table: CryTable) -> Cry:
         intensity=cry_table.intensity,
         duration=cry_table.duration
     )
+
+
+def cry_archive_row_to_schema(row: dict) -> Cry:
+    """보관 파일(Parquet)에서 읽은 한 행을 Cry로 바꾼다. (컬럼은 CRY_ARCHIVE_SCHEMA와 같다)"""
+    return Cry(
+        id=row['id'],
+        pet_id=row['pet_id'],
+        time=row['time'],
+        state=row['state'],
+        audioId=row['audioId'],
+        predictMap={state: row[column] for state, column in PREDICT_COLUMNS.items()
+                    if row[column] is not None},
+        intensity=row['intensity'],
+        duration=row['duration']
+    )
+
+
+def cry_job_table_to_schema(cry_job_table: CryJobTable, cry: Optional[Cry] = None) -> CryJob:
+    return CryJob(
+        id=cry_job_table.id,
+        pet_id=cry_job_table.pet_id,
+        status=cry_job_table.status,
+        audioId=cry_job_table.audioId,
+        attempts=cry_job_table.attempts,
+        cry=cry,
+        error=cry_job_table.error,
+        created_at=cry_job_table.created_at,
+        updated_at=cry_job_table.updated_at
+    )
@@ -0,0 +1,26 @@
+# utils/cursor.py
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+from error.exceptions import InvalidCursorError
+
+
+def encode_cursor(time: datetime, id: int, order: str) -> str:
+    """마지막 행의 (time, id)와 정렬 방향을 클라이언트가 그대로 돌려줄 불투명한 문자열로 만든다."""
+    payload = json.dumps([time.isoformat(), id, order], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, order: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        time, id, cursor_order = json.loads(base64.urlsafe_b64decode(padded))
+        time, id = datetime.fromisoformat(time), int(id)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("cursor is malformed")
+    if cursor_order != order:
+        raise InvalidCursorError(
+            f"cursor was issued for order={cursor_order}")
+    return time, id
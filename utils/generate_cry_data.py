@@ -1,5 +1,4 @@
 import os
-import json
 import random
 from datetime import datetime, timedelta
 import sqlite3
@@ -81,7 +80,10 @@ def save_pet_cry_sample_data_to_file(start_date, end_date, pet_id, pet_type, tot
             if predict_map[selected_state] == 1.0 or sum(1 for p in predict_map.values() if p > 0) < 2:
                 continue  # Skip this iteration if condition is not met
             # Create the SQL INSERT statement
-            insert_statement = f"INSERT INTO cry (pet_id, time, state, audioId, predictMap, intensity, duration) VALUES ({pet_id}, '{cry_time.strftime('%Y-%m-%d %H:%M:%S')}', '{selected_state}', 'audioId{audio_id_counter}', '{json.dumps(predict_map)}', '{intensity}', {duration});\n"
+            # predictMap은 울음 원인별 p_<state> 컬럼에 저장한다.
+            predict_columns = ', '.join(f"p_{state}" for state in predict_map)
+            predict_values = ', '.join(str(prob) for prob in predict_map.values())
+            insert_statement = f"INSERT INTO cry (pet_id, time, state, audioId, intensity, duration, {predict_columns}) VALUES ({pet_id}, '{cry_time.strftime('%Y-%m-%d %H:%M:%S.%f')}', '{selected_state}', 'audioId{audio_id_counter}', '{intensity}', {duration}, {predict_values});\n"
             file.write(insert_statement)
             audio_id_counter += 1
 
@@ -0,0 +1,22 @@
+# utils/upload.py
+import hashlib
+from fastapi import UploadFile
+
+# 업로드 파일을 한 번에 메모리에 올리지 않고 이 크기 단위로 나눠 처리한다.
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def spool_upload(file: UploadFile, file_path: str, chunk_size: int = UPLOAD_CHUNK_SIZE) -> str:
+    """
+    업로드 파일을 chunk 단위로 file_path에 저장하고, 저장한 내용의 sha256 해시를 반환한다.
+    요청당 메모리 사용량은 파일 길이와 관계없이 chunk_size로 고정된다.
+    """
+    sha256 = hashlib.sha256()
+    with open(file_path, 'wb') as f:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            sha256.update(chunk)
+            f.write(chunk)
+    return sha256.hexdigest()
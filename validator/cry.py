@@ -12,6 +12,19 @@ def validate_state(v: str) -> str:
     return CRY_STATE_KR_TO_EN.get(v, v)
 
 
+def validate_predict_map(v: dict) -> dict:
+    """울음 원인(영어 또는 한국어) -> 확률. 한국어 원인은 영어로 바꾸고, 알 수 없는 원인은 거부한다."""
+    unknown = [state for state in v if state not in allowed_cry_state_en and state not in allowed_cry_state_kr]
+    if unknown:
+        raise ValueError(
+            f"predictMap keys must be one of {allowed_cry_state_en} or their Korean equivalents {allowed_cry_state_kr} (got {unknown})"
+        )
+    for probability in v.values():
+        if probability is not None and (isinstance(probability, bool) or not isinstance(probability, (int, float))):
+            raise ValueError("predictMap values must be numbers")
+    return {CRY_STATE_KR_TO_EN.get(state, state): probability for state, probability in v.items()}
+
+
 def validate_intensity(v: str) -> str:
     if v not in allowed_cry_intensity_en and v not in allowed_cry_intensity_kr:
         raise ValueError(